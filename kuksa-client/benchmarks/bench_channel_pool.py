@@ -0,0 +1,112 @@
+# /********************************************************************************
+# * Copyright (c) 2025 Contributors to the Eclipse Foundation
+# *
+# * See the NOTICE file(s) distributed with this work for additional
+# * information regarding copyright ownership.
+# *
+# * This program and the accompanying materials are made available under the
+# * terms of the Apache License 2.0 which is available at
+# * http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************/
+
+"""
+Benchmark for the throughput of concurrent GetValues calls with large responses over a pool
+of 1, 2 and 4 channels, against a local fake databroker running in its own process.
+
+Run with kuksa_client installed:
+    python benchmarks/bench_channel_pool.py
+"""
+
+import asyncio
+from concurrent import futures
+import multiprocessing
+import socket
+import time
+
+import grpc
+import grpc.aio
+
+from kuksa.val.v2 import types_pb2 as types_v2
+from kuksa.val.v2 import val_pb2 as val_v2
+from kuksa.val.v2 import val_pb2_grpc as val_grpc_v2
+
+from kuksa_client.grpc import OutputMode
+from kuksa_client.grpc.aio import VSSClient
+
+SIGNALS = 200
+# Bytes of each string value, so that a response holds about 200 KiB
+VALUE_SIZE = 1024
+CONCURRENT_CALLS = 32
+CALLS = 2000
+POOL_SIZES = (1, 2, 4)
+
+
+class FakeDatabroker(val_grpc_v2.VALServicer):
+    def __init__(self):
+        self.metadata = val_v2.ListMetadataResponse(metadata=[
+            types_v2.Metadata(path=f"Vehicle.Cabin.Signal{i}", id=i, data_type=types_v2.DATA_TYPE_STRING)
+            for i in range(SIGNALS)
+        ])
+        self.values = val_v2.GetValuesResponse(data_points=[
+            types_v2.Datapoint(value=types_v2.Value(string="x" * VALUE_SIZE)) for _ in range(SIGNALS)
+        ])
+
+    def ListMetadata(self, request, context):
+        return self.metadata
+
+    def GetValues(self, request, context):
+        return self.values
+
+
+def serve(port: int, started: multiprocessing.Event, stop: multiprocessing.Event):
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=CONCURRENT_CALLS))
+    val_grpc_v2.add_VALServicer_to_server(FakeDatabroker(), server)
+    server.add_insecure_port(f"127.0.0.1:{port}")
+    server.start()
+    started.set()
+    stop.wait()
+    server.stop(grace=0)
+
+
+async def run(port: int, pool_size: int) -> float:
+    paths = [f"Vehicle.Cabin.Signal{i}" for i in range(SIGNALS)]
+    async with VSSClient(
+        "127.0.0.1", port, ensure_startup_connection=False, channel_pool_size=pool_size,
+    ) as client:
+        await client.ensure_id_mapping(paths)
+        remaining = CALLS
+
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                await client.get_current_values(paths, output_mode=OutputMode.RAW)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(CONCURRENT_CALLS)))
+        return time.perf_counter() - start
+
+
+def main():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    started, stop = multiprocessing.Event(), multiprocessing.Event()
+    server = multiprocessing.Process(target=serve, args=(port, started, stop))
+    server.start()
+    started.wait()
+    response_size = FakeDatabroker().values.ByteSize()
+    try:
+        for pool_size in POOL_SIZES:
+            duration = asyncio.run(run(port, pool_size))
+            print(f"{pool_size} channel(s): {CALLS / duration:8.0f} calls/s, "
+                  f"{CALLS * response_size / duration / 2**20:8.1f} MiB/s")
+    finally:
+        stop.set()
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
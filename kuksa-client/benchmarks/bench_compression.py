@@ -0,0 +1,97 @@
+# /********************************************************************************
+# * Copyright (c) 2025 Contributors to the Eclipse Foundation
+# *
+# * See the NOTICE file(s) distributed with this work for additional
+# * information regarding copyright ownership.
+# *
+# * This program and the accompanying materials are made available under the
+# * terms of the Apache License 2.0 which is available at
+# * http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************/
+
+"""
+Benchmark for resolving the ids of 20000 signals with one large ListMetadata response,
+with and without gzip compression, against a local fake databroker.
+Over loopback compression only adds CPU time, the printed payload sizes show how much
+less has to be transferred on a real link.
+
+Run with kuksa_client installed:
+    python benchmarks/bench_compression.py
+"""
+
+import asyncio
+import gzip
+import socket
+import time
+
+import grpc
+import grpc.aio
+
+from kuksa.val.v2 import types_pb2 as types_v2
+from kuksa.val.v2 import val_pb2 as val_v2
+from kuksa.val.v2 import val_pb2_grpc as val_grpc_v2
+
+from kuksa_client.grpc import ChannelOptions
+from kuksa_client.grpc.aio import VSSClient
+
+SIGNALS = 20000
+CALLS = 10
+
+
+class FakeDatabroker(val_grpc_v2.VALServicer):
+    def __init__(self):
+        self.response = val_v2.ListMetadataResponse(metadata=[
+            types_v2.Metadata(
+                path=f"Vehicle.Cabin.Signal{i}",
+                id=i,
+                data_type=types_v2.DATA_TYPE_FLOAT,
+                entry_type=types_v2.ENTRY_TYPE_SENSOR,
+                description=f"Signal {i} of the cabin, measured by the cabin sensors.",
+                unit="km/h",
+            )
+            for i in range(SIGNALS)
+        ])
+
+    async def ListMetadata(self, request, context):
+        return self.response
+
+
+async def run(compression: grpc.Compression, port: int) -> float:
+    server = grpc.aio.server(compression=compression)
+    val_grpc_v2.add_VALServicer_to_server(FakeDatabroker(), server)
+    server.add_insecure_port(f"127.0.0.1:{port}")
+    await server.start()
+    paths = [f"Vehicle.Cabin.Signal{i}" for i in range(SIGNALS)]
+    channel_options = ChannelOptions(compression=compression, max_receive_message_length=-1)
+    try:
+        async with VSSClient(
+            "127.0.0.1", port, ensure_startup_connection=False, channel_options=channel_options,
+        ) as client:
+            best = float("inf")
+            for _ in range(CALLS):
+                client.path_to_id_mapping.clear()
+                start = time.perf_counter()
+                await client.ensure_id_mapping(paths)
+                best = min(best, time.perf_counter() - start)
+            return best
+    finally:
+        await server.stop(grace=0)
+
+
+def main():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    payload = FakeDatabroker().response.SerializeToString()
+    print(f"ListMetadata response: {len(payload) / 1024:.0f} KiB, "
+          f"{len(gzip.compress(payload)) / 1024:.0f} KiB with gzip")
+    for compression in (grpc.Compression.NoCompression, grpc.Compression.Gzip):
+        best = asyncio.run(run(compression, port))
+        print(f"{compression.name:>13}: {best * 1000:8.1f} ms per call, "
+              f"{SIGNALS / best:10.0f} signals/s")
+
+
+if __name__ == "__main__":
+    main()
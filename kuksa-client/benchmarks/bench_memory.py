@@ -0,0 +1,71 @@
+# /********************************************************************************
+# * Copyright (c) 2025 Contributors to the Eclipse Foundation
+# *
+# * See the NOTICE file(s) distributed with this work for additional
+# * information regarding copyright ownership.
+# *
+# * This program and the accompanying materials are made available under the
+# * terms of the Apache License 2.0 which is available at
+# * http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************/
+
+"""
+Memory benchmark reporting the bytes allocated per 10k entries for the client data classes.
+
+Run with kuksa_client installed:
+    python benchmarks/bench_memory.py
+"""
+
+import datetime
+import tracemalloc
+
+from kuksa_client.grpc import DataEntry
+from kuksa_client.grpc import Datapoint
+from kuksa_client.grpc import DataType
+from kuksa_client.grpc import EntryType
+from kuksa_client.grpc import EntryUpdate
+from kuksa_client.grpc import Field
+from kuksa_client.grpc import Metadata
+from kuksa_client.grpc import ValueRestriction
+
+ENTRIES = 10_000
+TIMESTAMP = datetime.datetime(2022, 11, 7, tzinfo=datetime.timezone.utc)
+FIELDS = (Field.VALUE,)
+
+
+def updates():
+    # Values and paths are shared so that only the data classes themselves are measured
+    return [EntryUpdate(DataEntry("Vehicle.Speed", value=Datapoint(42.0, TIMESTAMP)), FIELDS) for _ in range(ENTRIES)]
+
+
+def metadata_snapshot():
+    return [
+        DataEntry("Vehicle.Speed", metadata=Metadata(
+            data_type=DataType.FLOAT,
+            entry_type=EntryType.SENSOR,
+            description="Vehicle speed.",
+            unit="km/h",
+            value_restriction=ValueRestriction(min=0.0, max=250.0),
+        ))
+        for _ in range(ENTRIES)
+    ]
+
+
+def measure(factory):
+    tracemalloc.start()
+    objects = factory()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size
+
+
+def main():
+    for factory in (updates, metadata_snapshot):
+        print(f"{factory.__name__}: {measure(factory) / 1024:.0f} KiB per {ENTRIES} entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# /********************************************************************************
+# * Copyright (c) 2025 Contributors to the Eclipse Foundation
+# *
+# * See the NOTICE file(s) distributed with this work for additional
+# * information regarding copyright ownership.
+# *
+# * This program and the accompanying materials are made available under the
+# * terms of the Apache License 2.0 which is available at
+# * http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************/
+
+"""
+Benchmark for 2000 small GetValues calls of the sync client, one after the other and pipelined
+with get_many, compared to concurrent calls of the async client. A local fake databroker runs
+in its own process.
+
+Run with kuksa_client installed:
+    python benchmarks/bench_pipelining.py
+"""
+
+import asyncio
+from concurrent import futures
+import multiprocessing
+import socket
+import time
+
+import grpc
+
+from kuksa.val.v2 import types_pb2 as types_v2
+from kuksa.val.v2 import val_pb2 as val_v2
+from kuksa.val.v2 import val_pb2_grpc as val_grpc_v2
+
+from kuksa_client.grpc import VSSClient
+from kuksa_client.grpc.aio import VSSClient as AsyncVSSClient
+
+SIGNALS = 100
+CALLS = 2000
+MAX_IN_FLIGHT = 32
+
+
+class FakeDatabroker(val_grpc_v2.VALServicer):
+    def __init__(self):
+        self.metadata = val_v2.ListMetadataResponse(metadata=[
+            types_v2.Metadata(path=f"Vehicle.Cabin.Signal{i}", id=i, data_type=types_v2.DATA_TYPE_FLOAT)
+            for i in range(SIGNALS)
+        ])
+
+    def ListMetadata(self, request, context):
+        return self.metadata
+
+    def GetValues(self, request, context):
+        return val_v2.GetValuesResponse(data_points=[
+            types_v2.Datapoint(value=types_v2.Value(float=signal_id.id)) for signal_id in request.signal_ids
+        ])
+
+
+def serve(port: int, started: multiprocessing.Event, stop: multiprocessing.Event):
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=MAX_IN_FLIGHT))
+    val_grpc_v2.add_VALServicer_to_server(FakeDatabroker(), server)
+    server.add_insecure_port(f"127.0.0.1:{port}")
+    server.start()
+    started.set()
+    stop.wait()
+    server.stop(grace=0)
+
+
+def path_groups():
+    return [[f"Vehicle.Cabin.Signal{i % SIGNALS}"] for i in range(CALLS)]
+
+
+def run_sequential(port: int) -> float:
+    with VSSClient("127.0.0.1", port, ensure_startup_connection=False) as client:
+        groups = path_groups()
+        client.ensure_id_mapping(path for paths in groups for path in paths)
+        start = time.perf_counter()
+        for paths in groups:
+            client.get_current_values(paths)
+        return time.perf_counter() - start
+
+
+def run_pipelined(port: int) -> float:
+    with VSSClient("127.0.0.1", port, ensure_startup_connection=False) as client:
+        groups = path_groups()
+        client.ensure_id_mapping(path for paths in groups for path in paths)
+        start = time.perf_counter()
+        client.get_many(groups, max_in_flight=MAX_IN_FLIGHT)
+        return time.perf_counter() - start
+
+
+async def run_async(port: int) -> float:
+    async with AsyncVSSClient("127.0.0.1", port, ensure_startup_connection=False) as client:
+        groups = path_groups()
+        await client.ensure_id_mapping(path for paths in groups for path in paths)
+        semaphore = asyncio.Semaphore(MAX_IN_FLIGHT)
+
+        async def get(paths):
+            async with semaphore:
+                return await client.get_current_values(paths)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(get(paths) for paths in groups))
+        return time.perf_counter() - start
+
+
+def main():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    started, stop = multiprocessing.Event(), multiprocessing.Event()
+    server = multiprocessing.Process(target=serve, args=(port, started, stop))
+    server.start()
+    started.wait()
+    try:
+        for name, run in (
+            ("sync, sequential", run_sequential),
+            ("sync, get_many", run_pipelined),
+            ("async, gather", lambda port: asyncio.run(run_async(port))),
+        ):
+            duration = run(port)
+            print(f"{name:>16}: {CALLS / duration:8.0f} calls/s")
+    finally:
+        stop.set()
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# /********************************************************************************
+# * Copyright (c) 2025 Contributors to the Eclipse Foundation
+# *
+# * See the NOTICE file(s) distributed with this work for additional
+# * information regarding copyright ownership.
+# *
+# * This program and the accompanying materials are made available under the
+# * terms of the Apache License 2.0 which is available at
+# * http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************/
+
+"""
+Benchmark for the time to resync a subscription of 1000 signals after a databroker restart.
+A local fake databroker is stopped and started again on the same port while the client is subscribed.
+The time after the restart is dominated by the reconnect backoff of the gRPC channel (1 s by default),
+resubscribe attempts before the channel is ready again fail immediately with UNAVAILABLE. It is
+measured with the default backoff and with the backoff shortened by ChannelOptions.
+
+Run with kuksa_client installed:
+    python benchmarks/bench_resync.py
+"""
+
+import asyncio
+import socket
+import statistics
+import time
+
+import grpc.aio
+
+from kuksa.val.v2 import val_pb2 as val_v2
+from kuksa.val.v2 import val_pb2_grpc as val_grpc_v2
+
+from kuksa_client.grpc import ChannelOptions
+from kuksa_client.grpc import ReconnectPolicy
+from kuksa_client.grpc import SubscriptionGap
+from kuksa_client.grpc.aio import VSSClient
+
+SIGNALS = 1000
+RESTARTS = 10
+# Seconds the fake databroker is down for each restart
+DOWNTIME = 0.2
+
+
+class FakeDatabroker(val_grpc_v2.VALServicer):
+    async def Subscribe(self, request, context):
+        response = val_v2.SubscribeResponse()
+        for path in request.signal_paths:
+            response.entries[path].value.float = 1.0
+        yield response
+        # Keep the stream open until the server is stopped
+        await asyncio.Event().wait()
+
+
+async def start_server(port: int) -> grpc.aio.Server:
+    server = grpc.aio.server()
+    val_grpc_v2.add_VALServicer_to_server(FakeDatabroker(), server)
+    server.add_insecure_port(f"127.0.0.1:{port}")
+    await server.start()
+    return server
+
+
+async def run(name: str, channel_options: ChannelOptions):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    paths = [f"Vehicle.Signal{i}" for i in range(SIGNALS)]
+    policy = ReconnectPolicy(initial_delay=0.01, max_delay=0.05, jitter=0.0)
+    server = await start_server(port)
+    resync_times = []
+    gaps = []
+    async with VSSClient(
+        "127.0.0.1", port, ensure_startup_connection=False, channel_options=channel_options,
+    ) as client:
+        updates = client.subscribe_current_values(paths, reconnect=policy).__aiter__()
+        await updates.__anext__()
+        for _ in range(RESTARTS):
+            # Keep consuming while the databroker is down, as an application would
+            next_update = asyncio.ensure_future(updates.__anext__())
+            await server.stop(grace=0)
+            await asyncio.sleep(DOWNTIME)
+            server = await start_server(port)
+            restarted_at = time.perf_counter()
+            gap = await next_update
+            catch_up = await updates.__anext__()
+            resync_times.append(time.perf_counter() - restarted_at)
+            assert isinstance(gap, SubscriptionGap) and len(catch_up) == SIGNALS
+            gaps.append(gap)
+        await updates.aclose()
+    await server.stop(grace=0)
+
+    print(f"{name}:")
+    print(f"  Resync after restart: median {statistics.median(resync_times) * 1000:.1f} ms, "
+          f"max {max(resync_times) * 1000:.1f} ms")
+    print(f"  Gap duration: median {statistics.median(gap.duration for gap in gaps) * 1000:.1f} ms "
+          f"(downtime {DOWNTIME * 1000:.0f} ms), "
+          f"attempts median {statistics.median(gap.attempts for gap in gaps)}")
+
+
+def main():
+    asyncio.run(run("Default channel reconnect backoff", ChannelOptions()))
+    asyncio.run(run("Channel reconnect backoff 20-100 ms", ChannelOptions(
+        initial_reconnect_backoff_ms=20, min_reconnect_backoff_ms=20, max_reconnect_backoff_ms=100,
+    )))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# /********************************************************************************
+# * Copyright (c) 2025 Contributors to the Eclipse Foundation
+# *
+# * See the NOTICE file(s) distributed with this work for additional
+# * information regarding copyright ownership.
+# *
+# * This program and the accompanying materials are made available under the
+# * terms of the Apache License 2.0 which is available at
+# * http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************/
+
+"""
+Microbenchmark for encoding a batch of 1000 updates as sent by set().
+
+Run with kuksa_client installed:
+    python benchmarks/bench_set_encoding.py
+"""
+
+import timeit
+
+from kuksa_client.grpc import BaseVSSClient
+from kuksa_client.grpc import DataEntry
+from kuksa_client.grpc import Datapoint
+from kuksa_client.grpc import DataType
+from kuksa_client.grpc import EntryUpdate
+from kuksa_client.grpc import Field
+
+BATCH_SIZE = 1000
+VALUES = (
+    (DataType.FLOAT, 42.0),
+    (DataType.UINT8, 7),
+    (DataType.BOOLEAN, True),
+    (DataType.STRING, "abc"),
+    (DataType.INT32_ARRAY, "[1, 2, 3]"),
+)
+
+
+def main():
+    client = BaseVSSClient("127.0.0.1", 55555)
+    updates = []
+    value_types = {}
+    path_to_id_mapping = {}
+    for i in range(BATCH_SIZE):
+        path = f"Vehicle.Signal{i}"
+        value_types[path], value = VALUES[i % len(VALUES)]
+        path_to_id_mapping[path] = i
+        updates.append(EntryUpdate(DataEntry(path, value=Datapoint(value)), (Field.VALUE,)))
+
+    def v1_set_request():
+        client._prepare_set_request(updates, value_types)
+
+    def v2_publish_values_request():
+        for update in updates:
+            client._check_v2_update(update, value_types)
+        client._prepare_v2_publish_values_request(
+            {update.entry.path: update for update in updates}, path_to_id_mapping
+        )
+
+    for benchmark in (v1_set_request, v2_publish_values_request):
+        number = 20
+        best = min(timeit.repeat(benchmark, number=number, repeat=5)) / number
+        print(f"{benchmark.__name__}: {best * 1000:.2f} ms per {BATCH_SIZE} updates")
+
+
+if __name__ == "__main__":
+    main()
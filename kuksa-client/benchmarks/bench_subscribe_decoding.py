@@ -0,0 +1,65 @@
+# /********************************************************************************
+# * Copyright (c) 2025 Contributors to the Eclipse Foundation
+# *
+# * See the NOTICE file(s) distributed with this work for additional
+# * information regarding copyright ownership.
+# *
+# * This program and the accompanying materials are made available under the
+# * terms of the Apache License 2.0 which is available at
+# * http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************/
+
+"""
+Microbenchmark for decoding a v2 SubscribeResponse with 5000 entries.
+
+Run with kuksa_client installed:
+    python benchmarks/bench_subscribe_decoding.py
+"""
+
+import timeit
+
+from kuksa.val.v2 import val_pb2 as val_v2
+
+from kuksa_client.grpc import EntryUpdate
+from kuksa_client.grpc import LazyDatapoints
+
+ENTRIES = 5000
+
+
+def main():
+    response = val_v2.SubscribeResponse()
+    for i in range(ENTRIES):
+        data_point = response.entries[f"Vehicle.Signal{i}"]
+        data_point.timestamp.seconds = 1667837915 + i
+        data_point.timestamp.nanos = 247307674
+        if i % 2:
+            data_point.value.float = i / 2
+        else:
+            data_point.value.uint32 = i
+    response = val_v2.SubscribeResponse.FromString(response.SerializeToString())
+
+    def decode():
+        return [EntryUpdate.from_tuple(path, dp) for path, dp in response.entries.items()]
+
+    def decode_deferred_timestamps():
+        return [
+            EntryUpdate.from_tuple(path, dp, defer_timestamp=True)
+            for path, dp in response.entries.items()
+        ]
+
+    def lazy_read_one_path():
+        return LazyDatapoints(response.entries)["Vehicle.Signal42"].value
+
+    def lazy_read_all_paths():
+        return [dp.value for dp in LazyDatapoints(response.entries).values()]
+
+    for benchmark in (decode, decode_deferred_timestamps, lazy_read_one_path, lazy_read_all_paths):
+        number = 10
+        best = min(timeit.repeat(benchmark, number=number, repeat=5)) / number
+        print(f"{benchmark.__name__}: {best * 1000:.3f} ms per {ENTRIES} entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -76,9 +76,21 @@ class Backend(cli_backend.Backend):
         else:
             self.token = ""
         self.grpc_connection_established = False
+        # Run subscription callbacks on that many worker threads instead of the event loop, 0 to disable
+        self.callback_workers = int(config.get('callback_workers', 0))
+        # Requests of all threads run concurrently up to this limit, 1 to run them one after another
+        self.max_concurrent_requests = int(config.get('max_concurrent_requests', 10))
+        # Resubscribe current value subscriptions when their stream fails, e.g. on a databroker restart
+        try:
+            self.resubscribe = config.getboolean('resubscribe', False)
+        except AttributeError:
+            self.resubscribe = config.get('resubscribe', False)
 
         self.sendMsgQueue = queue.Queue()
         self.run = False
+        # Set by _grpcHandler, so that other threads can wake it up when they queue a request
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.request_event: Optional[asyncio.Event] = None
 
         self.AttrDict = {
             "value": (
@@ -105,6 +117,7 @@ class Backend(cli_backend.Backend):
     def stop(self):
         self.disconnect()
         self.run = False
+        self._wakeup()
         logger.info("gRPC channel disconnected.")
 
     # Function to implement fetching of metadata
@@ -225,7 +238,8 @@ class Backend(cli_backend.Backend):
     def _sendReceiveMsg(self, req, timeout):
         (call, requestArgs) = req
         recvQueue = queue.Queue(maxsize=1)
-        self.sendMsgQueue.put((call, requestArgs, recvQueue))
+        self.sendMsgQueue.put((call, requestArgs, recvQueue, timeout))
+        self._wakeup()
         try:
             resp, error = recvQueue.get(timeout=timeout)
             if error:
@@ -238,49 +252,121 @@ class Backend(cli_backend.Backend):
             respJson = json.dumps({"error": "Timeout"})
         return respJson
 
+    def _wakeup(self):
+        loop = self.loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self.request_event.set)
+            except RuntimeError:
+                # The loop has been closed in between, nobody is waiting for requests anymore
+                pass
+
+    async def _runRequest(
+        self,
+        vss_client: kuksa_client.grpc.aio.VSSClient,
+        subscriber_manager: kuksa_client.grpc.aio.SubscriberManager,
+        semaphore: asyncio.Semaphore,
+        call: str,
+        requestArgs: Dict[str, Any],
+        responseQueue: queue.Queue,
+        timeout: Optional[float],
+    ):
+        async def limited():
+            async with semaphore:
+                return await self._callRequest(vss_client, subscriber_manager, call, requestArgs)
+
+        try:
+            # The timeout also covers waiting for a free slot, the caller stops waiting after it anyway
+            resp = await asyncio.wait_for(limited(), timeout)
+            responseQueue.put((resp, None))
+        except asyncio.TimeoutError:
+            responseQueue.put((None, {"error": "Timeout"}))
+        except kuksa_client.grpc.VSSClientError as exc:
+            responseQueue.put((None, exc.to_dict()))
+        except ValueError:
+            responseQueue.put(
+                (None, {"error": "ValueError in casting the value."}))
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.exception("Request %s failed", call)
+            responseQueue.put((None, {"error": str(exc)}))
+
+    async def _callRequest(
+        self,
+        vss_client: kuksa_client.grpc.aio.VSSClient,
+        subscriber_manager: kuksa_client.grpc.aio.SubscriberManager,
+        call: str,
+        requestArgs: Dict[str, Any],
+    ) -> Any:
+        if call == "get":
+            resp = await vss_client.get(**requestArgs)
+            if resp is not None:
+                resp = [entry.to_dict() for entry in resp]
+                resp = resp[0] if len(resp) == 1 else resp
+        elif call == "set":
+            resp = await vss_client.set(**requestArgs)
+        elif call == "authorize":
+            resp = await vss_client.authorize(str(requestArgs["token"]))
+        elif call == "subscribe":
+            callback = requestArgs.pop('callback')
+            entries = requestArgs["entries"]
+            if all(entry.view is kuksa_client.grpc.View.CURRENT_VALUE for entry in entries):
+                # Current value subscriptions of all callers share their streams
+                resp = await subscriber_manager.add_shared_subscriber(
+                    [entry.path for entry in entries], callback
+                )
+            else:
+                subscriber_response_stream = vss_client.subscribe(
+                    **requestArgs)
+                resp = await subscriber_manager.add_subscriber(subscriber_response_stream, callback)
+            resp = {"subscriptionId": str(resp)}
+        elif call == "unsubscribe":
+            resp = await subscriber_manager.remove_subscriber(**requestArgs)
+        elif call == "connect":
+            resp = await vss_client.connect()
+        elif call == "disconnect":
+            resp = await vss_client.disconnect()
+        else:
+            raise Exception("Not Implemented.")
+        return resp
+
     # Async function to handle the gRPC calls
     async def _grpcHandler(self, vss_client: kuksa_client.grpc.aio.VSSClient):
         self.run = True
-        subscriber_manager = kuksa_client.grpc.aio.SubscriberManager(vss_client)
+        self.request_event = asyncio.Event()
+        self.loop = asyncio.get_running_loop()
+        dispatcher = None
+        if self.callback_workers > 0:
+            dispatcher = kuksa_client.grpc.aio.CallbackDispatcher(self.callback_workers)
+        reconnect = kuksa_client.grpc.ReconnectPolicy() if self.resubscribe else None
+        subscriber_manager = kuksa_client.grpc.aio.SubscriberManager(
+            vss_client, dispatcher=dispatcher, reconnect=reconnect
+        )
+        # Every request runs as its own task, at most max_concurrent_requests of them at a time
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        tasks = set()
         self.grpc_connection_established = True
         while self.run:
             try:
-                (call, requestArgs, responseQueue) = self.sendMsgQueue.get_nowait()
+                (call, requestArgs, responseQueue, timeout) = self.sendMsgQueue.get_nowait()
             except queue.Empty:
-                await asyncio.sleep(0.01)
+                # Sleep until _wakeup() is called for a new request or stop(), the event is cleared
+                # before checking the queue again so that no request queued in between is missed
+                self.request_event.clear()
+                if self.sendMsgQueue.empty() and self.run:
+                    await self.request_event.wait()
                 continue
-            try:
-                if call == "get":
-                    resp = await vss_client.get(**requestArgs)
-                    if resp is not None:
-                        resp = [entry.to_dict() for entry in resp]
-                        resp = resp[0] if len(resp) == 1 else resp
-                elif call == "set":
-                    resp = await vss_client.set(**requestArgs)
-                elif call == "authorize":
-                    resp = await vss_client.authorize(str(requestArgs["token"]))
-                elif call == "subscribe":
-                    callback = requestArgs.pop('callback')
-                    subscriber_response_stream = vss_client.subscribe(
-                        **requestArgs)
-                    resp = await subscriber_manager.add_subscriber(subscriber_response_stream, callback)
-                    resp = {"subscriptionId": str(resp)}
-                elif call == "unsubscribe":
-                    resp = await subscriber_manager.remove_subscriber(**requestArgs)
-                elif call == "connect":
-                    resp = await vss_client.connect()
-                elif call == "disconnect":
-                    resp = await vss_client.disconnect()
-                else:
-                    raise Exception("Not Implemented.")
-
-                responseQueue.put((resp, None))
-            except kuksa_client.grpc.VSSClientError as exc:
-                responseQueue.put((None, exc.to_dict()))
-            except ValueError:
-                responseQueue.put(
-                    (None, {"error": "ValueError in casting the value."}))
-
+            task = asyncio.create_task(self._runRequest(
+                vss_client, subscriber_manager, semaphore, call, requestArgs, responseQueue, timeout
+            ))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if dispatcher is not None:
+            await dispatcher.close()
+        self.loop = None
         self.grpc_connection_established = False
 
     # Update VSS Tree Entry
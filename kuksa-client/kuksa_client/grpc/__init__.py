@@ -17,19 +17,34 @@
 ########################################################################
 
 from __future__ import absolute_import
+import collections
 import contextlib
 import dataclasses
 import datetime
 import enum
+import fnmatch
+import functools
+import itertools
 import logging
+import operator
+import queue
+import random
 import re
+import threading
+import time
 from typing import Any
+from typing import Callable
 from typing import Collection
+from typing import Deque
 from typing import Dict
 from typing import Iterable
 from typing import Iterator
 from typing import List
+from typing import Mapping
 from typing import Optional
+from typing import Tuple
+from typing import TYPE_CHECKING
+from typing import Union
 from pathlib import Path
 
 from google.protobuf import json_format
@@ -43,6 +58,9 @@ from kuksa.val.v2 import types_pb2 as types_v2
 from kuksa.val.v2 import val_pb2 as val_v2
 from kuksa.val.v2 import val_pb2_grpc as val_grpc_v2
 
+if TYPE_CHECKING:
+    from .columnar import ColumnarBatch
+
 logger = logging.getLogger(__name__)
 
 
@@ -124,6 +142,37 @@ class MetadataField(enum.Enum):
     ATTRIBUTE = Field.METADATA_ATTRIBUTE
 
 
+class OutputMode(enum.Enum):
+    """
+    Representation of values returned by get_current_values, subscribe_current_values
+    and subscribe_target_values.
+    """
+    # Dict of path -> Datapoint
+    DATAPOINTS = "datapoints"
+    # List of (path, value, timestamp in nanoseconds since epoch or None) tuples
+    TUPLES = "tuples"
+    # Protobuf response messages as received from the server
+    RAW = "raw"
+
+
+class QueuePolicy(enum.Enum):
+    """
+    Behavior of a full subscriber queue of the SubscriberManager.
+    """
+    # Wait for the callback to catch up, holding back the subscription stream
+    BLOCK = "block"
+    # Drop the oldest queued updates
+    DROP_OLDEST = "drop_oldest"
+    # Keep only the latest queued update per path
+    CONFLATE = "conflate"
+
+
+ValueTuple = Tuple[str, Any, Optional[int]]
+
+# Setting for all paths or per path, keys may be glob patterns like 'Vehicle.Cabin.*'
+PathSetting = Union[float, Mapping[str, float]]
+
+
 class VSSClientError(Exception):
     def __init__(self, error: Dict[str, Any], errors: List[Dict[str, Any]]):
         super().__init__(error, errors)
@@ -148,6 +197,23 @@ class VSSClientError(Exception):
         return {"error": self.error, "errors": self.errors}
 
 
+def _slotted(cls):
+    """
+    Recreate a dataclass with __slots__ for its fields so that instances carry no __dict__,
+    like dataclass(slots=True) which is only available from Python 3.10 on.
+    """
+    cls_dict = dict(cls.__dict__)
+    field_names = tuple(field.name for field in dataclasses.fields(cls))
+    for name in field_names:
+        # Defaults are part of the generated __init__ already
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    cls_dict["__slots__"] = field_names
+    return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
+
+@_slotted
 @dataclasses.dataclass
 class ValueRestriction:
     min: Optional[Any] = None
@@ -155,6 +221,7 @@ class ValueRestriction:
     allowed_values: Optional[List[Any]] = None
 
 
+@_slotted
 @dataclasses.dataclass
 class Metadata:
     data_type: DataType = DataType.UNSPECIFIED
@@ -196,7 +263,6 @@ class Metadata:
                     )
         return metadata
 
-    # pylint: disable=too-many-branches
     def to_message(
         self, value_type: DataType = DataType.UNSPECIFIED
     ) -> types_v1.Metadata:
@@ -204,9 +270,16 @@ class Metadata:
         to_message/from_message aligned to use None rather than empty list for
         representing allowed values in value restrictions
         """
-        message = types_v1.Metadata(
-            data_type=self.data_type.value, entry_type=self.entry_type.value
-        )
+        message = types_v1.Metadata()
+        self.encode_into(message, value_type)
+        return message
+
+    # pylint: disable=too-many-branches
+    def encode_into(
+        self, message: types_v1.Metadata, value_type: DataType = DataType.UNSPECIFIED
+    ) -> None:
+        message.data_type = self.data_type.value
+        message.entry_type = self.entry_type.value
         for field in ("description", "comment", "deprecation", "unit"):
             field_value = getattr(self, field, None)
             if field_value is not None:
@@ -289,7 +362,6 @@ class Metadata:
                 raise ValueError(
                     f"Cannot set value_restriction from data type {value_type.name}"
                 )
-        return message
 
     # pylint: enable=too-many-branches
 
@@ -337,21 +409,26 @@ class Metadata:
         return out_dict
 
 
+@_slotted
 @dataclasses.dataclass
 class Datapoint:
+    # datetime or, for clients in timestamp_ns mode, integer nanoseconds since the epoch
     value: Optional[Any] = None
-    timestamp: Optional[datetime.datetime] = None
+    timestamp: Optional[Union[datetime.datetime, int]] = None
 
     @classmethod
-    def from_message(cls, message: types_v1.Datapoint):
+    def from_message(cls, message: types_v1.Datapoint, timestamp_ns: bool = False):
         """
         Return internal Datapoint representation or None on error
+        With timestamp_ns the timestamp is kept as integer nanoseconds since the epoch.
         """
         if message.WhichOneof("value") is None:
             logger.warning("No value provided in datapoint!")
             return None
 
-        if message.HasField("timestamp"):
+        if timestamp_ns:
+            timestamp = _timestamp_ns(message.timestamp)
+        elif message.HasField("timestamp"):
             # gRPC timestamp supports date up to including year 9999
             # If timestamp by any reason contains a larger number for seconds than supported
             # you may get an overflow error
@@ -374,6 +451,27 @@ class Datapoint:
             timestamp=timestamp,
         )
 
+    @classmethod
+    def from_v2_message(
+        cls, message: types_v2.Datapoint, defer_timestamp: bool = False, timestamp_ns: bool = False
+    ):
+        """
+        Return internal Datapoint representation of a v2 Datapoint.
+        If no value is set the value is currently unknown/not available -> value is None.
+        With defer_timestamp the timestamp is converted to a datetime on first access only,
+        with timestamp_ns it is kept as integer nanoseconds since the epoch.
+        """
+        value = _decode_v2_value(message.value)
+        timestamp = message.timestamp
+        seconds, nanos = timestamp.seconds, timestamp.nanos
+        if seconds == 0 and nanos == 0:
+            return cls(value=value)
+        if timestamp_ns:
+            return cls(value=value, timestamp=seconds * 1_000_000_000 + nanos)
+        if defer_timestamp:
+            return _DeferredTimestampDatapoint(value, seconds, nanos)
+        return cls(value=value, timestamp=_timestamp_to_datetime(seconds, nanos))
+
     def cast_array_values(cast, array):
         """
         Parses array input and cast individual values to wanted type.
@@ -424,205 +522,325 @@ class Datapoint:
         new_val = new_val.replace("\\'", "'")
         return new_val
 
+    def timestamp_as_datetime(self) -> Optional[datetime.datetime]:
+        """
+        Return the timestamp as timezone-aware datetime, converting integer nanoseconds if needed.
+        """
+        timestamp = self.timestamp
+        if isinstance(timestamp, int):
+            seconds, nanos = divmod(timestamp, 1_000_000_000)
+            return _timestamp_to_datetime(seconds, nanos)
+        return timestamp
+
+    def timestamp_as_ns(self) -> Optional[int]:
+        """
+        Return the timestamp as integer nanoseconds since the epoch, converting a datetime if needed.
+        """
+        timestamp = self.timestamp
+        if isinstance(timestamp, datetime.datetime):
+            return _datetime_to_ns(timestamp)
+        return timestamp
+
     def v1_to_message(self, value_type: DataType) -> types_v1.Datapoint:
         message = types_v1.Datapoint()
+        self.v1_encode_into(message, value_type)
+        return message
 
-        def set_array_attr(obj, attr, values):
-            array = getattr(obj, attr)
-            array.Clear()
-            array.values.extend(values)
-
-        field, set_field, cast_field = {
-            DataType.INT8: ("int32", setattr, int),
-            DataType.INT16: ("int32", setattr, int),
-            DataType.INT32: ("int32", setattr, int),
-            DataType.UINT8: ("uint32", setattr, int),
-            DataType.UINT16: ("uint32", setattr, int),
-            DataType.UINT32: ("uint32", setattr, int),
-            DataType.UINT64: ("uint64", setattr, int),
-            DataType.INT64: ("int64", setattr, int),
-            DataType.FLOAT: ("float", setattr, float),
-            DataType.DOUBLE: ("double", setattr, float),
-            DataType.BOOLEAN: ("bool", setattr, Datapoint.cast_bool),
-            DataType.STRING: ("string", setattr, Datapoint.cast_str),
-            DataType.INT8_ARRAY: (
-                "int32_array",
-                set_array_attr,
-                lambda array: Datapoint.cast_array_values(int, array),
-            ),
-            DataType.INT16_ARRAY: (
-                "int32_array",
-                set_array_attr,
-                lambda array: Datapoint.cast_array_values(int, array),
-            ),
-            DataType.INT32_ARRAY: (
-                "int32_array",
-                set_array_attr,
-                lambda array: Datapoint.cast_array_values(int, array),
-            ),
-            DataType.UINT8_ARRAY: (
-                "uint32_array",
-                set_array_attr,
-                lambda array: Datapoint.cast_array_values(int, array),
-            ),
-            DataType.UINT16_ARRAY: (
-                "uint32_array",
-                set_array_attr,
-                lambda array: Datapoint.cast_array_values(int, array),
-            ),
-            DataType.UINT32_ARRAY: (
-                "uint32_array",
-                set_array_attr,
-                lambda array: Datapoint.cast_array_values(int, array),
-            ),
-            DataType.UINT64_ARRAY: (
-                "uint64_array",
-                set_array_attr,
-                lambda array: Datapoint.cast_array_values(int, array),
-            ),
-            DataType.INT64_ARRAY: (
-                "int64_array",
-                set_array_attr,
-                lambda array: Datapoint.cast_array_values(int, array),
-            ),
-            DataType.FLOAT_ARRAY: (
-                "float_array",
-                set_array_attr,
-                lambda array: Datapoint.cast_array_values(float, array),
-            ),
-            DataType.DOUBLE_ARRAY: (
-                "double_array",
-                set_array_attr,
-                lambda array: Datapoint.cast_array_values(float, array),
-            ),
-            DataType.BOOLEAN_ARRAY: (
-                "bool_array",
-                set_array_attr,
-                lambda array: Datapoint.cast_array_values(Datapoint.cast_bool, array),
-            ),
-            DataType.STRING_ARRAY: (
-                "string_array",
-                set_array_attr,
-                lambda array: Datapoint.cast_array_values(Datapoint.cast_str, array),
-            ),
-        }.get(value_type, (None, None, None))
+    def v1_encode_into(self, message: types_v1.Datapoint, value_type: DataType) -> None:
+        """
+        Write value and timestamp straight into the given (empty) v1 Datapoint message.
+        """
         if self.value is not None:
-            if all((field, set_field, cast_field)):
-                set_field(message, field, cast_field(self.value))
-            else:
-                # Either DataType.TIMESTAMP, DataType.TIMESTAMP_ARRAY or DataType.UNSPECIFIED...
-                raise ValueError(
-                    f"Cannot determine which field to set with data type {value_type} from value {self.value}",
-                )
+            _encode_value(message, self.value, value_type)
         if self.timestamp is not None:
-            message.timestamp.FromDatetime(self.timestamp)
-        return message
+            _encode_timestamp(message.timestamp, self.timestamp)
 
     def v2_to_message(self, value_type: DataType) -> types_v2.Datapoint:
         message = types_v2.Datapoint()
-        value = types_v2.Value()
-
-        def set_array_attr(obj, attr, values):
-            array = getattr(obj, attr)
-            array.Clear()
-            array.values.extend(values)
-
-        field, set_field, cast_field = {
-            DataType.INT8: ("int32", setattr, int),
-            DataType.INT16: ("int32", setattr, int),
-            DataType.INT32: ("int32", setattr, int),
-            DataType.UINT8: ("uint32", setattr, int),
-            DataType.UINT16: ("uint32", setattr, int),
-            DataType.UINT32: ("uint32", setattr, int),
-            DataType.UINT64: ("uint64", setattr, int),
-            DataType.INT64: ("int64", setattr, int),
-            DataType.FLOAT: ("float", setattr, float),
-            DataType.DOUBLE: ("double", setattr, float),
-            DataType.BOOLEAN: ("bool", setattr, Datapoint.cast_bool),
-            DataType.STRING: ("string", setattr, Datapoint.cast_str),
-            DataType.INT8_ARRAY: (
-                "int32_array",
-                set_array_attr,
-                lambda array: Datapoint.cast_array_values(int, array),
-            ),
-            DataType.INT16_ARRAY: (
-                "int32_array",
-                set_array_attr,
-                lambda array: Datapoint.cast_array_values(int, array),
-            ),
-            DataType.INT32_ARRAY: (
-                "int32_array",
-                set_array_attr,
-                lambda array: Datapoint.cast_array_values(int, array),
-            ),
-            DataType.UINT8_ARRAY: (
-                "uint32_array",
-                set_array_attr,
-                lambda array: Datapoint.cast_array_values(int, array),
-            ),
-            DataType.UINT16_ARRAY: (
-                "uint32_array",
-                set_array_attr,
-                lambda array: Datapoint.cast_array_values(int, array),
-            ),
-            DataType.UINT32_ARRAY: (
-                "uint32_array",
-                set_array_attr,
-                lambda array: Datapoint.cast_array_values(int, array),
-            ),
-            DataType.UINT64_ARRAY: (
-                "uint64_array",
-                set_array_attr,
-                lambda array: Datapoint.cast_array_values(int, array),
-            ),
-            DataType.INT64_ARRAY: (
-                "int64_array",
-                set_array_attr,
-                lambda array: Datapoint.cast_array_values(int, array),
-            ),
-            DataType.FLOAT_ARRAY: (
-                "float_array",
-                set_array_attr,
-                lambda array: Datapoint.cast_array_values(float, array),
-            ),
-            DataType.DOUBLE_ARRAY: (
-                "double_array",
-                set_array_attr,
-                lambda array: Datapoint.cast_array_values(float, array),
-            ),
-            DataType.BOOLEAN_ARRAY: (
-                "bool_array",
-                set_array_attr,
-                lambda array: Datapoint.cast_array_values(Datapoint.cast_bool, array),
-            ),
-            DataType.STRING_ARRAY: (
-                "string_array",
-                set_array_attr,
-                lambda array: Datapoint.cast_array_values(Datapoint.cast_str, array),
-            ),
-        }.get(value_type, (None, None, None))
+        self.v2_encode_into(message, value_type)
+        return message
+
+    def v2_encode_into(self, message: types_v2.Datapoint, value_type: DataType) -> None:
+        """
+        Write value and timestamp straight into the given (empty) v2 Datapoint message.
+        """
         if self.value is not None:
-            if all((field, set_field, cast_field)):
-                set_field(value, field, cast_field(self.value))
-                message.value.CopyFrom(value)
-            else:
-                # Either DataType.TIMESTAMP, DataType.TIMESTAMP_ARRAY or DataType.UNSPECIFIED...
-                raise ValueError(
-                    f"Cannot determine which field to set with data type {value_type} from value {self.value}",
-                )
+            _encode_value(message.value, self.value, value_type)
         if self.timestamp is not None:
-            message.timestamp.FromDatetime(self.timestamp)
-        return message
+            _encode_timestamp(message.timestamp, self.timestamp)
 
     def to_dict(self) -> Dict[str, Any]:
         out_dict = {}
         if self.value is not None:
             out_dict["value"] = self.value
         if self.timestamp is not None:
-            out_dict["timestamp"] = self.timestamp.isoformat()
+            out_dict["timestamp"] = self.timestamp_as_datetime().isoformat()
         return out_dict
 
 
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _timestamp_to_datetime(seconds: int, nanos: int) -> datetime.datetime:
+    # Same result as Timestamp.ToDatetime(tzinfo=datetime.timezone.utc) without the extra message access
+    return _EPOCH + datetime.timedelta(seconds=seconds, microseconds=nanos // 1000)
+
+
+def _datetime_to_ns(timestamp: datetime.datetime) -> int:
+    if timestamp.tzinfo is None:
+        # Naive datetimes are taken as UTC like Timestamp.FromDatetime does
+        timestamp = timestamp.replace(tzinfo=datetime.timezone.utc)
+    delta = timestamp - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1000
+
+
+def _encode_timestamp(message, timestamp: Union[datetime.datetime, int]) -> None:
+    if isinstance(timestamp, int):
+        message.seconds, message.nanos = divmod(timestamp, 1_000_000_000)
+    else:
+        message.FromDatetime(timestamp)
+
+
+# Accessors of all fields of the typed_value oneof of a v2 Value
+_V2_VALUE_ACCESSORS: Dict[str, Callable[[types_v2.Value], Any]] = {
+    field.name: operator.attrgetter(field.name)
+    for field in types_v2.Value.DESCRIPTOR.oneofs_by_name["typed_value"].fields
+}
+
+
+def _decode_v2_value(message: types_v2.Value) -> Any:
+    field = message.WhichOneof("typed_value")
+    if field is None:
+        return None
+    return _V2_VALUE_ACCESSORS[field](message)
+
+
+def _timestamp_ns(timestamp) -> Optional[int]:
+    seconds, nanos = timestamp.seconds, timestamp.nanos
+    if seconds == 0 and nanos == 0:
+        return None
+    return seconds * 1_000_000_000 + nanos
+
+
+def _v1_value_tuple(path: str, message: types_v1.Datapoint) -> ValueTuple:
+    field = message.WhichOneof("value")
+    return path, None if field is None else getattr(message, field), _timestamp_ns(message.timestamp)
+
+
+def _v2_value_tuple(path: str, message: types_v2.Datapoint) -> ValueTuple:
+    return path, _decode_v2_value(message.value), _timestamp_ns(message.timestamp)
+
+
+class _DatapointView(Datapoint):
+    """
+    Base of Datapoint representations decoding their content on access.
+    Compares equal to a Datapoint with the same value and timestamp.
+    """
+
+    __slots__ = ()
+
+    def __eq__(self, other):
+        if isinstance(other, Datapoint):
+            return (self.value, self.timestamp) == (other.value, other.timestamp)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Datapoint(value={self.value!r}, timestamp={self.timestamp!r})"
+
+
+class _DeferredTimestampDatapoint(_DatapointView):
+    """
+    Datapoint converting its timestamp to a datetime on first access.
+    """
+
+    __slots__ = ("_seconds", "_nanos", "_timestamp")
+
+    def __init__(self, value: Any, seconds: int, nanos: int):
+        self.value = value
+        self._seconds = seconds
+        self._nanos = nanos
+        self._timestamp = None
+
+    @property
+    def timestamp(self) -> Optional[datetime.datetime]:
+        if self._timestamp is None and self._seconds is not None:
+            self._timestamp = _timestamp_to_datetime(self._seconds, self._nanos)
+            self._seconds = self._nanos = None
+        return self._timestamp
+
+    @timestamp.setter
+    def timestamp(self, timestamp: Optional[datetime.datetime]):
+        self._timestamp = timestamp
+        self._seconds = self._nanos = None
+
+
+_UNDECODED = object()
+
+
+class _LazyDatapoint(_DatapointView):
+    """
+    Datapoint backed by a v2 Datapoint message, value and timestamp are decoded on first access.
+    """
+
+    __slots__ = ("_message", "_value", "_timestamp")
+
+    def __init__(self, message: types_v2.Datapoint):
+        self._message = message
+        self._value = _UNDECODED
+        self._timestamp = _UNDECODED
+
+    @property
+    def value(self) -> Optional[Any]:
+        if self._value is _UNDECODED:
+            self._value = _decode_v2_value(self._message.value)
+        return self._value
+
+    @value.setter
+    def value(self, value: Optional[Any]):
+        self._value = value
+
+    @property
+    def timestamp(self) -> Optional[datetime.datetime]:
+        if self._timestamp is _UNDECODED:
+            timestamp = self._message.timestamp
+            seconds, nanos = timestamp.seconds, timestamp.nanos
+            if seconds == 0 and nanos == 0:
+                self._timestamp = None
+            else:
+                self._timestamp = _timestamp_to_datetime(seconds, nanos)
+        return self._timestamp
+
+    @timestamp.setter
+    def timestamp(self, timestamp: Optional[datetime.datetime]):
+        self._timestamp = timestamp
+
+
+class _LazyNsDatapoint(_LazyDatapoint):
+    """
+    _LazyDatapoint carrying its timestamp as integer nanoseconds since the epoch.
+    """
+
+    __slots__ = ()
+
+    @property
+    def timestamp(self) -> Optional[int]:
+        if self._timestamp is _UNDECODED:
+            self._timestamp = _timestamp_ns(self._message.timestamp)
+        return self._timestamp
+
+    @timestamp.setter
+    def timestamp(self, timestamp: Optional[int]):
+        self._timestamp = timestamp
+
+
+class LazyDatapoints(Mapping):
+    """
+    Read-only mapping over the entries of a v2 subscribe response.
+    Datapoints are only created and decoded for the keys being accessed.
+    If the response is keyed by signal id, path_to_id_mapping and id_to_path_mapping
+    translate the keys to paths. With timestamp_ns timestamps are integer nanoseconds.
+    """
+
+    def __init__(
+        self,
+        entries: Mapping[Any, types_v2.Datapoint],
+        path_to_id_mapping: Optional[Dict[str, int]] = None,
+        id_to_path_mapping: Optional[Dict[int, str]] = None,
+        timestamp_ns: bool = False,
+    ):
+        self._entries = entries
+        self._path_to_id_mapping = path_to_id_mapping
+        self._id_to_path_mapping = id_to_path_mapping
+        self._datapoint_type = _LazyNsDatapoint if timestamp_ns else _LazyDatapoint
+
+    def _key(self, key):
+        if self._path_to_id_mapping is None:
+            return key
+        return self._path_to_id_mapping.get(key)
+
+    def __getitem__(self, key) -> Datapoint:
+        entry_key = self._key(key)
+        # Indexing a protobuf map would insert missing keys
+        if entry_key is None or entry_key not in self._entries:
+            raise KeyError(key)
+        return self._datapoint_type(self._entries[entry_key])
+
+    def __contains__(self, key) -> bool:
+        entry_key = self._key(key)
+        return entry_key is not None and entry_key in self._entries
+
+    def __iter__(self):
+        if self._id_to_path_mapping is None:
+            return iter(self._entries)
+        return (self._id_to_path_mapping[signal_id] for signal_id in self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+def _scalar_encoder(field: str, cast: Callable[[Any], Any]) -> Callable[[Any, Any], None]:
+    def encode(message, value):
+        setattr(message, field, cast(value))
+    return encode
+
+
+def _array_encoder(field: str, cast: Callable[[Any], Any]) -> Callable[[Any, Any], None]:
+    def encode(message, value):
+        values = getattr(message, field).values
+        if isinstance(value, str):
+            # Arrays entered as text, e.g. on the command line
+            values.extend(Datapoint.cast_array_values(cast, value))
+        else:
+            # Lists, tuples, array.array, memoryview and NumPy arrays are passed as is,
+            # tolist() converts buffers to native Python values in a single call.
+            values.extend(value.tolist() if hasattr(value, "tolist") else value)
+    return encode
+
+
+# Encoders writing a value into a v1 Datapoint or a v2 Value message, both use the same field names.
+# Either DataType.TIMESTAMP, DataType.TIMESTAMP_ARRAY or DataType.UNSPECIFIED have no encoder.
+_VALUE_ENCODERS: Dict[DataType, Callable[[Any, Any], None]] = {
+    DataType.INT8: _scalar_encoder("int32", int),
+    DataType.INT16: _scalar_encoder("int32", int),
+    DataType.INT32: _scalar_encoder("int32", int),
+    DataType.UINT8: _scalar_encoder("uint32", int),
+    DataType.UINT16: _scalar_encoder("uint32", int),
+    DataType.UINT32: _scalar_encoder("uint32", int),
+    DataType.UINT64: _scalar_encoder("uint64", int),
+    DataType.INT64: _scalar_encoder("int64", int),
+    DataType.FLOAT: _scalar_encoder("float", float),
+    DataType.DOUBLE: _scalar_encoder("double", float),
+    DataType.BOOLEAN: _scalar_encoder("bool", Datapoint.cast_bool),
+    DataType.STRING: _scalar_encoder("string", Datapoint.cast_str),
+    DataType.INT8_ARRAY: _array_encoder("int32_array", int),
+    DataType.INT16_ARRAY: _array_encoder("int32_array", int),
+    DataType.INT32_ARRAY: _array_encoder("int32_array", int),
+    DataType.UINT8_ARRAY: _array_encoder("uint32_array", int),
+    DataType.UINT16_ARRAY: _array_encoder("uint32_array", int),
+    DataType.UINT32_ARRAY: _array_encoder("uint32_array", int),
+    DataType.UINT64_ARRAY: _array_encoder("uint64_array", int),
+    DataType.INT64_ARRAY: _array_encoder("int64_array", int),
+    DataType.FLOAT_ARRAY: _array_encoder("float_array", float),
+    DataType.DOUBLE_ARRAY: _array_encoder("double_array", float),
+    DataType.BOOLEAN_ARRAY: _array_encoder("bool_array", Datapoint.cast_bool),
+    DataType.STRING_ARRAY: _array_encoder("string_array", Datapoint.cast_str),
+}
+
+
+def _encode_value(message, value: Any, value_type: DataType) -> None:
+    try:
+        encode = _VALUE_ENCODERS[value_type]
+    except KeyError:
+        raise ValueError(
+            f"Cannot determine which field to set with data type {value_type} from value {value}",
+        ) from None
+    encode(message, value)
+
+
+@_slotted
 @dataclasses.dataclass
 class DataEntry:
     path: str
@@ -634,29 +852,31 @@ class DataEntry:
     value_type: DataType = DataType.UNSPECIFIED
 
     @classmethod
-    def from_message(cls, message: types_v1.DataEntry):
+    def from_message(cls, message: types_v1.DataEntry, timestamp_ns: bool = False):
         entry_kwargs = {"path": message.path}
         if message.HasField("value"):
-            entry_kwargs["value"] = Datapoint.from_message(message.value)
+            entry_kwargs["value"] = Datapoint.from_message(message.value, timestamp_ns)
         if message.HasField("actuator_target"):
             entry_kwargs["actuator_target"] = Datapoint.from_message(
-                message.actuator_target
+                message.actuator_target, timestamp_ns
             )
         if message.HasField("metadata"):
             entry_kwargs["metadata"] = Metadata.from_message(message.metadata)
         return cls(**entry_kwargs)
 
     def to_message(self) -> types_v1.DataEntry:
-        message = types_v1.DataEntry(path=self.path)
+        message = types_v1.DataEntry()
+        self.encode_into(message)
+        return message
+
+    def encode_into(self, message: types_v1.DataEntry) -> None:
+        message.path = self.path
         if self.value is not None:
-            message.value.MergeFrom(self.value.v1_to_message(self.value_type))
+            self.value.v1_encode_into(message.value, self.value_type)
         if self.actuator_target is not None:
-            message.actuator_target.MergeFrom(
-                self.actuator_target.v1_to_message(self.value_type)
-            )
+            self.actuator_target.v1_encode_into(message.actuator_target, self.value_type)
         if self.metadata is not None:
-            message.metadata.MergeFrom(self.metadata.to_message(self.value_type))
-        return message
+            self.metadata.encode_into(message.metadata, self.value_type)
 
     def to_dict(self) -> Dict[str, Any]:
         out_dict = {"path": self.path}
@@ -676,62 +896,45 @@ class EntryRequest:
     fields: Iterable[Field]
 
 
+@_slotted
 @dataclasses.dataclass
 class EntryUpdate:
     entry: DataEntry
     fields: Iterable[Field]
 
     @classmethod
-    def from_message(cls, message: val_v1.EntryUpdate):
+    def from_message(cls, message: val_v1.EntryUpdate, timestamp_ns: bool = False):
         return cls(
-            entry=DataEntry.from_message(message.entry),
+            entry=DataEntry.from_message(message.entry, timestamp_ns),
             fields=[Field(field) for field in message.fields],
         )
 
     @classmethod
-    def from_tuple(cls, path: str, dp: types_v2.Datapoint):
-        # we assume here that at max one field of Value is set -> we use the first entry.
-        # If no field is set the value is currently unknown/not avaialable -> set to None.
-        data = dp.value.ListFields()
-        if data:
-            field_descriptor, value = data[0]
-            field_name = field_descriptor.name
-            value = getattr(dp.value, field_name)
-        else:
-            value = None
-        if dp.timestamp is None or (dp.timestamp.seconds == 0 and dp.timestamp.nanos == 0):
-            timestamp = None
-        else:
-            timestamp = dp.timestamp.ToDatetime(
-                tzinfo=datetime.timezone.utc,
-            )
+    def from_tuple(
+        cls, path: str, dp: types_v2.Datapoint, defer_timestamp: bool = False, timestamp_ns: bool = False
+    ):
         return cls(
-            entry=DataEntry(
-                path=path, value=Datapoint(value=value, timestamp=timestamp)
-            ),
-            fields=[Field(value=types_v1.FIELD_VALUE)],
+            entry=DataEntry(path, Datapoint.from_v2_message(dp, defer_timestamp, timestamp_ns)),
+            fields=[Field.VALUE],
         )
 
     @classmethod
     def from_actuate_value(cls, path: str, value: types_v2.Value):
-        # we assume here that exactly one field of Value is set -> we use the first entry.
-        # This should always be the case.
-        data = value.ListFields()
-        field_descriptor, target_value = data[0]
-        field_name = field_descriptor.name
-        target_value = getattr(value, field_name)
+        # Exactly one field of Value is expected to be set.
         return cls(
-            entry=DataEntry(
-                path=path, actuator_target=Datapoint(value=target_value)
-            ),
-            fields=[Field(value=types_v1.FIELD_ACTUATOR_TARGET)],
+            entry=DataEntry(path, actuator_target=Datapoint(_decode_v2_value(value))),
+            fields=[Field.ACTUATOR_TARGET],
         )
 
     def to_message(self) -> val_v1.EntryUpdate:
-        message = val_v1.EntryUpdate(entry=self.entry.to_message())
-        message.fields.extend(field.value for field in self.fields)
+        message = val_v1.EntryUpdate()
+        self.encode_into(message)
         return message
 
+    def encode_into(self, message: val_v1.EntryUpdate) -> None:
+        self.entry.encode_into(message.entry)
+        message.fields.extend(field.value for field in self.fields)
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "entry": self.entry.to_dict(),
@@ -756,6 +959,431 @@ class ServerInfo:
         return cls(name=message.name, version=message.version)
 
 
+@dataclasses.dataclass
+class SubscriberStats:
+    # Queued updates, counted in batches or for QueuePolicy.CONFLATE in paths
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    # Updates dropped or replaced due to the queue policy
+    dropped: int = 0
+    # Updates held back by max_rate_hz or deadband
+    filtered: int = 0
+    # Batches of updates passed to the callback
+    dispatched: int = 0
+    # Seconds between queueing and dispatching of the last dispatched batch
+    dispatch_lag: float = 0.0
+    max_dispatch_lag: float = 0.0
+    # Catch-up updates received after the subscription stream was lost and resubscribed
+    resyncs: int = 0
+
+
+@dataclasses.dataclass
+class WorkerStats:
+    # Callback calls finished by the worker
+    calls: int = 0
+    # Batches of updates waiting for the worker
+    pending: int = 0
+    # Seconds spent in callbacks
+    busy_time: float = 0.0
+    # Share of the time since the worker was started spent in callbacks
+    utilization: float = 0.0
+
+
+@dataclasses.dataclass
+class ReconnectPolicy:
+    """
+    Jittered exponential backoff for resubscribing after a subscription stream failed.
+    """
+    # Seconds to wait before the first attempt, multiplied by multiplier after each attempt up to max_delay
+    initial_delay: float = 0.1
+    max_delay: float = 10.0
+    multiplier: float = 2.0
+    # Each delay is randomly shortened by up to this fraction, so clients do not reconnect in lockstep
+    jitter: float = 0.5
+    # Attempts before the error is raised, None to retry forever
+    max_attempts: Optional[int] = None
+    # Stream errors to reconnect on, others are raised
+    status_codes: Tuple[grpc.StatusCode, ...] = (grpc.StatusCode.UNAVAILABLE,)
+
+    def delays(self) -> Iterator[float]:
+        attempts = itertools.count() if self.max_attempts is None else range(self.max_attempts)
+        delay = self.initial_delay
+        for _ in attempts:
+            yield delay * (1.0 - self.jitter * random.random())
+            delay = min(delay * self.multiplier, self.max_delay)
+
+    def should_reconnect(self, error: VSSClientError) -> bool:
+        return any(error.error.get("code") == code.value[0] for code in self.status_codes)
+
+
+@dataclasses.dataclass
+class SubscriptionGap:
+    """
+    Yielded by subscriptions with a ReconnectPolicy after the stream was lost and resubscribed.
+    The next update is the catch-up update holding the current values of all subscribed signals.
+    """
+    error: VSSClientError
+    # Resubscribe attempts until the new stream delivered the catch-up update
+    attempts: int
+    # Seconds from losing the stream until the catch-up update was received
+    duration: float
+
+
+class _PathFilterState:
+    __slots__ = ("min_interval", "deadband", "last_time", "last_value", "pending")
+
+    def __init__(self, min_interval: float, deadband: Optional[float]):
+        self.min_interval = min_interval
+        self.deadband = deadband
+        self.last_time: Optional[float] = None
+        self.last_value: Any = None
+        # (value, update) of the latest update held back by the rate limit
+        self.pending: Optional[Tuple[Any, Any]] = None
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class _UpdateFilter:
+    """
+    Per-path rate limit and numeric deadband applied to subscription updates before they are passed on.
+    An update passes if at least 1 / max_rate_hz seconds have elapsed since the last update passed for
+    its path and, for int and float values, if it differs from the last value passed by at least deadband.
+    The latest update held back by the rate limit is passed on once the interval has expired, so the
+    last value of a burst is not lost. Use due_in() to learn when to filter again without new updates.
+    Exact paths of a PathSetting mapping take precedence over glob patterns, patterns are tried in order.
+    """
+
+    def __init__(self, max_rate_hz: Optional[PathSetting] = None, deadband: Optional[PathSetting] = None):
+        self.max_rate_hz = max_rate_hz
+        self.deadband = deadband
+        # Number of updates not passed on when they were filtered
+        self.held_back = 0
+        self._states: Dict[str, _PathFilterState] = {}
+        self._pending: Dict[str, _PathFilterState] = {}
+
+    @classmethod
+    def create(
+        cls, max_rate_hz: Optional[PathSetting], deadband: Optional[PathSetting]
+    ) -> Optional["_UpdateFilter"]:
+        if max_rate_hz is None and deadband is None:
+            return None
+        return cls(max_rate_hz, deadband)
+
+    @staticmethod
+    def _lookup(setting: Optional[PathSetting], path: str) -> Optional[float]:
+        if setting is None or not isinstance(setting, Mapping):
+            return setting
+        if path in setting:
+            return setting[path]
+        for pattern, value in setting.items():
+            if fnmatch.fnmatchcase(path, pattern):
+                return value
+        return None
+
+    def _state(self, path: str) -> _PathFilterState:
+        state = self._states.get(path)
+        if state is None:
+            max_rate_hz = self._lookup(self.max_rate_hz, path)
+            state = _PathFilterState(1.0 / max_rate_hz if max_rate_hz else 0.0, self._lookup(self.deadband, path))
+            self._states[path] = state
+        return state
+
+    def accept(self, path: str, value: Any, now: float, update: Any = None) -> bool:
+        """
+        Whether the update with value passes now. If it is held back by the rate limit only, update is
+        returned by a later filter call once the interval has expired, unless a newer update replaces it.
+        """
+        state = self._state(path)
+        if state.last_time is not None:
+            if (
+                state.deadband is not None
+                and _is_number(value)
+                and _is_number(state.last_value)
+                and abs(value - state.last_value) < state.deadband
+            ):
+                # The value passed last is still close enough, an earlier held back update is outdated
+                state.pending = None
+                self._pending.pop(path, None)
+                self.held_back += 1
+                return False
+            if now - state.last_time < state.min_interval:
+                state.pending = (value, update)
+                self._pending[path] = state
+                self.held_back += 1
+                return False
+        state.last_time = now
+        state.last_value = value
+        if state.pending is not None:
+            state.pending = None
+            del self._pending[path]
+        return True
+
+    def due_in(self) -> Optional[float]:
+        """
+        Seconds until the next held back update is due, None if there is none.
+        """
+        if not self._pending:
+            return None
+        due_at = min(state.last_time + state.min_interval for state in self._pending.values())
+        return max(0.0, due_at - time.monotonic())
+
+    def _pop_due(self, now: float) -> Dict[str, Any]:
+        due = {}
+        for path, state in list(self._pending.items()):
+            if now - state.last_time >= state.min_interval:
+                state.last_value, due[path] = state.pending
+                state.last_time = now
+                state.pending = None
+                del self._pending[path]
+        return due
+
+    def filter_datapoints(self, updates: Mapping[str, Datapoint]) -> Dict[str, Datapoint]:
+        now = time.monotonic()
+        passed = {
+            path: dp for path, dp in updates.items() if self.accept(path, None if dp is None else dp.value, now, dp)
+        }
+        if self._pending:
+            return {**self._pop_due(now), **passed}
+        return passed
+
+    def filter_tuples(self, updates: List[ValueTuple]) -> List[ValueTuple]:
+        now = time.monotonic()
+        passed = [update for update in updates if self.accept(update[0], update[1], now, update)]
+        if self._pending:
+            return list(self._pop_due(now).values()) + passed
+        return passed
+
+    def filter_entry_updates(self, updates: Iterable[EntryUpdate]) -> List[EntryUpdate]:
+        """
+        Filter updates by their current value, updates without one (e.g. of metadata) always pass.
+        """
+        now = time.monotonic()
+        passed = [
+            update for update in updates
+            if update.entry.value is None or self.accept(update.entry.path, update.entry.value.value, now, update)
+        ]
+        if self._pending:
+            return list(self._pop_due(now).values()) + passed
+        return passed
+
+
+_call_tracking = threading.local()
+
+
+def _track_call(call: grpc.Future) -> None:
+    """
+    Pass the call of a response stream to the tracker of the thread reading it, see _rate_limited_updates.
+    """
+    track = getattr(_call_tracking, "track", None)
+    if track is not None:
+        track(call)
+
+
+def _rate_limited_updates(
+    responses: Iterator[Any], update_filter: _UpdateFilter, filter_updates: Callable[[Any], Any]
+) -> Iterator[Any]:
+    """
+    Yield the updates of responses passed by filter_updates. Responses are read by a separate thread,
+    so that updates held back by the rate limit are yielded once due, also if no further response arrives.
+    The calls of the streams read are cancelled once the iteration is stopped, which ends the thread.
+    """
+    received: "queue.Queue[Any]" = queue.Queue()
+    stopped = threading.Event()
+    calls: List[grpc.Future] = []
+    lock = threading.Lock()
+
+    def track(call: grpc.Future) -> None:
+        with lock:
+            calls.append(call)
+            if stopped.is_set():
+                call.cancel()
+
+    def read():
+        _call_tracking.track = track
+        try:
+            for updates in responses:
+                if stopped.is_set():
+                    break
+                received.put(updates)
+            received.put(None)
+        except Exception as exc:  # pylint: disable=broad-except
+            received.put(exc)
+        finally:
+            responses.close()
+
+    reader = threading.Thread(target=read, name="rate-limited-updates", daemon=True)
+    reader.start()
+    try:
+        ended = False
+        while not ended or update_filter.due_in() is not None:
+            due_in = update_filter.due_in()
+            if ended:
+                time.sleep(due_in)
+                item = None
+            else:
+                try:
+                    item = received.get(timeout=due_in)
+                except queue.Empty:
+                    item = None
+                else:
+                    if isinstance(item, Exception):
+                        raise item
+                    ended = item is None
+            # Without new updates only the held back ones which are due are passed
+            updates = filter_updates({} if item is None else item)
+            if updates:
+                yield updates
+    finally:
+        with lock:
+            stopped.set()
+            for call in calls:
+                call.cancel()
+        reader.join(timeout=1.0)
+
+
+@dataclasses.dataclass
+class ChannelOptions:
+    """
+    Options of the gRPC channel opened by connect(), None keeps the gRPC default.
+    Compression can also be chosen per call with the compression rpc_kwarg, e.g.
+    client.get_metadata(paths, compression=grpc.Compression.Gzip).
+    """
+    # Compression of all requests on the channel. Responses are compressed as the server decides.
+    compression: Optional[grpc.Compression] = None
+    # Maximum message sizes in bytes, -1 for unlimited. gRPC receives at most 4 MB by default.
+    max_receive_message_length: Optional[int] = None
+    max_send_message_length: Optional[int] = None
+    # Milliseconds between keepalive pings and to wait for their acknowledgement before the
+    # connection is considered dead
+    keepalive_time_ms: Optional[int] = None
+    keepalive_timeout_ms: Optional[int] = None
+    # Send keepalive pings also while no call is active
+    keepalive_permit_without_calls: Optional[bool] = None
+    # Milliseconds to wait before reconnecting after the connection was lost, see ReconnectPolicy
+    initial_reconnect_backoff_ms: Optional[int] = None
+    min_reconnect_backoff_ms: Optional[int] = None
+    max_reconnect_backoff_ms: Optional[int] = None
+    # HTTP/2 flow control: initial window of each stream in bytes and whether the windows are
+    # grown by bandwidth-delay product probing
+    http2_stream_window_size: Optional[int] = None
+    http2_bdp_probe: Optional[bool] = None
+    # Further channel arguments passed as they are, e.g. (("grpc.http2.max_frame_size", 65536),)
+    extra: Tuple[Tuple[str, Any], ...] = ()
+
+    _ARGS = {
+        "max_receive_message_length": "grpc.max_receive_message_length",
+        "max_send_message_length": "grpc.max_send_message_length",
+        "keepalive_time_ms": "grpc.keepalive_time_ms",
+        "keepalive_timeout_ms": "grpc.keepalive_timeout_ms",
+        "keepalive_permit_without_calls": "grpc.keepalive_permit_without_calls",
+        "initial_reconnect_backoff_ms": "grpc.initial_reconnect_backoff_ms",
+        "min_reconnect_backoff_ms": "grpc.min_reconnect_backoff_ms",
+        "max_reconnect_backoff_ms": "grpc.max_reconnect_backoff_ms",
+        "http2_stream_window_size": "grpc.http2.lookahead_bytes",
+        "http2_bdp_probe": "grpc.http2.bdp_probe",
+    }
+
+    def channel_args(self) -> List[Tuple[str, Any]]:
+        args = []
+        for field, arg in self._ARGS.items():
+            value = getattr(self, field)
+            if value is not None:
+                args.append((arg, int(value)))
+        args.extend(self.extra)
+        return args
+
+
+class DataTypeCache:
+    """
+    Client-side path to DataType mapping, so that setting values does not need a
+    metadata round trip for paths whose type is already known.
+    Hit/miss counters are kept to allow monitoring of the cache efficiency.
+    """
+
+    def __init__(self):
+        self._data_types: Dict[str, DataType] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data_types)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._data_types
+
+    def get(self, path: str) -> Optional[DataType]:
+        return self._data_types.get(path)
+
+    def lookup(self, paths: Iterable[str]) -> Tuple[Dict[str, DataType], List[str]]:
+        """
+        Return the cached data types of the given paths and the paths that are not cached.
+        """
+        cached = {}
+        missing = []
+        for path in paths:
+            data_type = self._data_types.get(path)
+            if data_type is None:
+                missing.append(path)
+            else:
+                cached[path] = data_type
+        self.hits += len(cached)
+        self.misses += len(missing)
+        return cached, missing
+
+    def update(self, data_types: Dict[str, DataType]) -> None:
+        for path, data_type in data_types.items():
+            if data_type is not DataType.UNSPECIFIED:
+                self._data_types[path] = data_type
+
+    def discard(self, path: str) -> None:
+        self._data_types.pop(path, None)
+
+    def clear(self) -> None:
+        self._data_types.clear()
+
+
+class _StubPool:
+    """
+    Stubs of the same service on a pool of channels.
+    Every call, unary or streaming, is started on the next channel in turn. A stream stays on its
+    channel for its whole lifetime.
+    """
+
+    def __init__(self, stubs: List[Any]):
+        self.stubs = stubs
+        self._next_stub = itertools.cycle(stubs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(next(self._next_stub), name)
+
+
+def _raise_if_publish_failed(
+    response: val_v2.OpenProviderStreamResponse,
+    id_to_path_mapping: Dict[int, str],
+) -> None:
+    if not response.HasField("publish_values_response"):
+        return
+    errors = [
+        {
+            "path": id_to_path_mapping.get(signal_id, str(signal_id)),
+            "error": json_format.MessageToDict(error, preserving_proto_field_name=True),
+        }
+        for signal_id, error in response.publish_values_response.status.items()
+        if error.code != types_v2.ERROR_CODE_OK
+    ]
+    if errors:
+        raise VSSClientError(
+            error={
+                "code": grpc.StatusCode.INVALID_ARGUMENT.value[0],
+                "reason": grpc.StatusCode.INVALID_ARGUMENT.value[1],
+                "message": "Failed to publish values",
+            },
+            errors=errors,
+        )
+
+
 class BaseVSSClient:
 
     def __init__(
@@ -767,6 +1395,9 @@ class BaseVSSClient:
         ensure_startup_connection: bool = True,
         connected: bool = False,
         tls_server_name: Optional[str] = None,
+        timestamp_ns: bool = False,
+        channel_options: Optional[ChannelOptions] = None,
+        channel_pool_size: int = 1,
     ):
         self.authorization_header = self.get_authorization_header(token)
         self.target_host = f"{host}:{port}"
@@ -776,6 +1407,21 @@ class BaseVSSClient:
         self.connected = connected
         self.client_stub_v1 = None
         self.client_stub_v2 = None
+        self.data_type_cache = DataTypeCache()
+        # Carry timestamps of received datapoints as integer nanoseconds since the epoch instead of datetimes
+        self.timestamp_ns = timestamp_ns
+        self.channel_options = ChannelOptions() if channel_options is None else channel_options
+        # Number of channels to the server, each with its own connection. Unary calls are spread over
+        # them in turn and every stream stays on the channel it was started on.
+        self.channel_pool_size = channel_pool_size
+
+    def _create_stubs(self, channels: List[Any]) -> None:
+        if len(channels) == 1:
+            self.client_stub_v1 = val_grpc_v1.VALStub(channels[0])
+            self.client_stub_v2 = val_grpc_v2.VALStub(channels[0])
+        else:
+            self.client_stub_v1 = _StubPool([val_grpc_v1.VALStub(channel) for channel in channels])
+            self.client_stub_v2 = _StubPool([val_grpc_v2.VALStub(channel) for channel in channels])
 
     def _load_creds(self) -> Optional[grpc.ChannelCredentials]:
         if self.root_certificates:
@@ -804,7 +1450,7 @@ class BaseVSSClient:
     def _process_get_response(self, response: val_v1.GetResponse) -> List[DataEntry]:
         logger.debug("%s: %s", type(response).__name__, response)
         self._raise_if_invalid(response)
-        return [DataEntry.from_message(entry) for entry in response.entries]
+        return [DataEntry.from_message(entry, self.timestamp_ns) for entry in response.entries]
 
     def _get_paths_with_required_type(
         self, updates: Collection[EntryUpdate]
@@ -825,6 +1471,32 @@ class BaseVSSClient:
                 )
         return paths_with_required_type
 
+    def _apply_cached_value_types(
+        self,
+        updates: Collection[EntryUpdate],
+        paths_with_required_type: Dict[str, DataType],
+    ) -> List[str]:
+        """
+        Fill in the data types known from the cache and return the paths for which
+        the data type still has to be requested from the server.
+        """
+        for update in updates:
+            # Metadata updates may change the data type, so do not trust the cache anymore
+            if Field.METADATA in update.fields or Field.METADATA_DATA_TYPE in update.fields:
+                self.data_type_cache.discard(update.entry.path)
+        cached_types, paths_without_type = self.data_type_cache.lookup(
+            path
+            for path, data_type in paths_with_required_type.items()
+            if data_type is DataType.UNSPECIFIED
+        )
+        paths_with_required_type.update(cached_types)
+        return paths_without_type
+
+    def _update_data_type_cache(self, metadata: Dict[str, Optional[Metadata]]) -> None:
+        self.data_type_cache.update(
+            {path: md.data_type for path, md in metadata.items() if md is not None}
+        )
+
     def _prepare_set_request(
         self,
         updates: Collection[EntryUpdate],
@@ -835,19 +1507,21 @@ class BaseVSSClient:
             value_type = paths_with_required_type.get(update.entry.path)
             if value_type is not None:
                 update.entry.value_type = value_type
-            req.updates.append(update.to_message())
+            update.encode_into(req.updates.add())
         logger.debug("%s: %s", type(req).__name__, req)
         return req
 
-    def _prepare_publish_value_request(
+    def _check_v2_update(
         self,
         update: EntryUpdate,
         paths_with_required_type: Dict[str, DataType],
-    ) -> val_v2.PublishValueRequest:
+    ) -> None:
         value_type = paths_with_required_type.get(update.entry.path)
         if value_type is not None:
             update.entry.value_type = value_type
+        self._check_v2_fields(update)
 
+    def _check_v2_fields(self, update: EntryUpdate) -> None:
         for field in update.fields:
             if field != Field.VALUE:
                 raise VSSClientError(
@@ -859,10 +1533,14 @@ class BaseVSSClient:
                     errors=[],
                 )
 
-        req = val_v2.PublishValueRequest(
-            signal_id=types_v2.SignalID(path=update.entry.path),
-            data_point=update.entry.value.v2_to_message(update.entry.value_type),
-        )
+    def _prepare_publish_value_request(
+        self,
+        update: EntryUpdate,
+        paths_with_required_type: Dict[str, DataType],
+    ) -> val_v2.PublishValueRequest:
+        self._check_v2_update(update, paths_with_required_type)
+        req = val_v2.PublishValueRequest(signal_id=types_v2.SignalID(path=update.entry.path))
+        update.entry.value.v2_encode_into(req.data_point, update.entry.value_type)
         logger.debug("%s: %s", type(req).__name__, req)
         return req
 
@@ -885,10 +1563,104 @@ class BaseVSSClient:
         logger.debug("%s: %s", type(req).__name__, req)
         return req
 
-    def _prepare_v2_subscribe_request(
+    def _prepare_v2_get_values_request(
         self, paths: Iterable[str]
+    ) -> Optional[val_v2.GetValuesRequest]:
+        """
+        Return a GetValuesRequest addressing the signals by id
+        or None if some path could not be resolved via v2.
+        """
+        signal_ids = []
+        for path in paths:
+            signal_id = self.path_to_id_mapping.get(path)
+            if signal_id is None:
+                return None
+            signal_ids.append(types_v2.SignalID(id=signal_id))
+        req = val_v2.GetValuesRequest(signal_ids=signal_ids)
+        logger.debug("%s: %s", type(req).__name__, req)
+        return req
+
+    def _process_v2_get_values_response(
+        self, paths: List[str], response: val_v2.GetValuesResponse
+    ) -> Dict[str, Datapoint]:
+        logger.debug("%s: %s", type(response).__name__, response)
+        return {
+            path: Datapoint.from_v2_message(data_point, timestamp_ns=self.timestamp_ns)
+            for path, data_point in zip(paths, response.data_points)
+        }
+
+    def _v2_get_values_tuples(
+        self, paths: List[str], response: val_v2.GetValuesResponse
+    ) -> List[ValueTuple]:
+        return [
+            _v2_value_tuple(path, data_point)
+            for path, data_point in zip(paths, response.data_points)
+        ]
+
+    def _v1_get_tuples(self, response: val_v1.GetResponse) -> List[ValueTuple]:
+        self._raise_if_invalid(response)
+        return [_v1_value_tuple(entry.path, entry.value) for entry in response.entries]
+
+    def _v2_subscribe_tuples(
+        self,
+        response: Union[val_v2.SubscribeResponse, val_v2.SubscribeByIdResponse],
+        by_id: bool,
+    ) -> List[ValueTuple]:
+        if by_id:
+            return [
+                _v2_value_tuple(self.id_to_path_mapping[signal_id], data_point)
+                for signal_id, data_point in response.entries.items()
+            ]
+        return [_v2_value_tuple(path, data_point) for path, data_point in response.entries.items()]
+
+    def _v1_subscribe_tuples(
+        self, response: val_v1.SubscribeResponse, field: Field
+    ) -> List[ValueTuple]:
+        if field == Field.ACTUATOR_TARGET:
+            return [
+                _v1_value_tuple(update.entry.path, update.entry.actuator_target)
+                for update in response.updates
+            ]
+        return [_v1_value_tuple(update.entry.path, update.entry.value) for update in response.updates]
+
+    def _v2_actuation_tuples(self, response: val_v2.OpenProviderStreamResponse) -> List[ValueTuple]:
+        return [
+            (self.get_path(actuate_req.signal_id), _decode_v2_value(actuate_req.value), None)
+            for actuate_req in response.batch_actuate_stream_request.actuate_requests
+        ]
+
+    def _v2_datapoint_decoder(self, lazy: bool) -> Callable[[types_v2.Datapoint], Datapoint]:
+        if lazy:
+            return _LazyNsDatapoint if self.timestamp_ns else _LazyDatapoint
+        if self.timestamp_ns:
+            return functools.partial(Datapoint.from_v2_message, timestamp_ns=True)
+        return Datapoint.from_v2_message
+
+    def _prepare_v2_subscribe_request(
+        self, paths: Iterable[str], buffer_size: int = 0
     ) -> val_v2.SubscribeRequest:
-        req = val_v2.SubscribeRequest(signal_paths=paths)
+        req = val_v2.SubscribeRequest(signal_paths=paths, buffer_size=buffer_size)
+        logger.debug("%s: %s", type(req).__name__, req)
+        return req
+
+    def _prepare_v2_subscribe_by_id_request(
+        self, paths: Iterable[str], buffer_size: int = 0
+    ) -> val_v2.SubscribeByIdRequest:
+        signal_ids = []
+        for path in paths:
+            signal_id = self.path_to_id_mapping.get(path)
+            if signal_id is None:
+                # Ids can only be missing if ListMetadata is not available
+                raise VSSClientError(
+                    error={
+                        "code": grpc.StatusCode.UNIMPLEMENTED.value[0],
+                        "reason": grpc.StatusCode.UNIMPLEMENTED.value[1],
+                        "message": f"Cannot resolve signal id of {path}",
+                    },
+                    errors=[],
+                )
+            signal_ids.append(signal_id)
+        req = val_v2.SubscribeByIdRequest(signal_ids=signal_ids, buffer_size=buffer_size)
         logger.debug("%s: %s", type(req).__name__, req)
         return req
 
@@ -911,6 +1683,51 @@ class BaseVSSClient:
         logger.debug("%s: %s", type(req).__name__, req)
         return req
 
+    def _group_paths_by_branch(self, paths: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        Group paths by their parent branch, so that a single ListMetadata request per branch
+        is enough to resolve them. Paths that are alone in their branch are looked up directly
+        to avoid listing the whole branch.
+        """
+        branches: Dict[str, List[str]] = {}
+        for path in paths:
+            branches.setdefault(path.rpartition(".")[0] or path, []).append(path)
+        roots = {}
+        for branch, branch_paths in branches.items():
+            if len(branch_paths) == 1:
+                roots[branch_paths[0]] = branch_paths
+            else:
+                roots[branch] = branch_paths
+        return roots
+
+    def _update_id_mapping(
+        self, paths: Collection[str], metadata: Iterable[types_v2.Metadata]
+    ) -> List[str]:
+        """
+        Store ids and data types of all signals in a ListMetadata response
+        and return those of the given paths that are still unresolved.
+        """
+        for signal_metadata in metadata:
+            self.path_to_id_mapping[signal_metadata.path] = signal_metadata.id
+            self.id_to_path_mapping[signal_metadata.id] = signal_metadata.path
+            self.data_type_cache.update(
+                {signal_metadata.path: DataType(signal_metadata.data_type)}
+            )
+        return [path for path in paths if self.path_to_id_mapping.get(path) is None]
+
+    def _raise_paths_not_found(self, paths: List[str]) -> None:
+        for path in paths:
+            # Allow to query the paths again later on
+            self.path_to_id_mapping.pop(path, None)
+        raise VSSClientError(
+            error={
+                "code": grpc.StatusCode.NOT_FOUND.value[0],
+                "reason": grpc.StatusCode.NOT_FOUND.value[1],
+                "message": f"Path {', '.join(paths)} not found on server",
+            },
+            errors=[],
+        )
+
     def _raise_if_invalid(self, response):
         if response.HasField("error"):
             error = json_format.MessageToDict(
@@ -962,13 +1779,150 @@ class BaseVSSClient:
         return list(metadata.items())
 
 
-class VSSClient(BaseVSSClient):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.channel = None
-        self.exit_stack = contextlib.ExitStack()
+class BaseProviderSession:
+    """
+    Common part of the synchronous and asynchronous provider sessions, see ProviderSession.
+    """
+
+    def __init__(
+        self,
+        client,
+        paths: Iterable[str],
+        actuator_paths: Iterable[str] = (),
+        error_callback: Optional[Callable[[int, VSSClientError], None]] = None,
+        actuation_callback: Optional[Callable[[List[EntryUpdate]], None]] = None,
+        **rpc_kwargs,
+    ):
+        self.client = client
+        self.paths = list(paths)
+        self.actuator_paths = list(actuator_paths)
+        self.error_callback = error_callback
+        self.actuation_callback = actuation_callback
+        self.rpc_kwargs = rpc_kwargs
+        # Set if the stream itself failed, single failing requests do not end the session
+        self.error: Optional[VSSClientError] = None
+        self._data_types: Dict[int, DataType] = {}
+        self._request_ids = itertools.count(1)
+
+    def signal_id(self, path: str) -> int:
+        try:
+            return self.client.path_to_id_mapping[path]
+        except KeyError as exc:
+            raise ValueError(f"Path {path} is not part of this provider session") from exc
+
+    def _all_paths(self) -> List[str]:
+        return list(dict.fromkeys(self.paths + self.actuator_paths))
+
+    def _set_data_types(self, data_types: Dict[str, DataType]) -> None:
+        for path in self._all_paths():
+            signal_id = self.client.path_to_id_mapping.get(path)
+            if signal_id is None:
+                raise VSSClientError(
+                    error={
+                        "code": grpc.StatusCode.UNIMPLEMENTED.value[0],
+                        "reason": grpc.StatusCode.UNIMPLEMENTED.value[1],
+                        "message": f"Could not resolve signal id of {path}, provider sessions require v2",
+                    },
+                    errors=[],
+                )
+            self._data_types[signal_id] = data_types.get(path, DataType.UNSPECIFIED)
+
+    def _prepare_provide_requests(self) -> List[val_v2.OpenProviderStreamRequest]:
+        """
+        Claim the signals and the actuators for this provider, brokers enforcing ownership
+        reject values of signals the stream does not provide. Actuators are claimed as signals
+        as well, so that their current values can be published.
+        """
+        reqs = [
+            val_v2.OpenProviderStreamRequest(
+                provide_signal_request=val_v2.ProvideSignalRequest(signals_sample_intervals={
+                    self.client.path_to_id_mapping[path]: types_v2.SampleInterval() for path in self._all_paths()
+                })
+            )
+        ]
+        if self.actuator_paths:
+            provide_req = val_v2.ProvideActuationRequest(
+                actuator_identifiers=[types_v2.SignalID(path=path) for path in self.actuator_paths]
+            )
+            reqs.append(val_v2.OpenProviderStreamRequest(provide_actuation_request=provide_req))
+        for req in reqs:
+            logger.debug("%s: %s", type(req).__name__, req)
+        return reqs
+
+    def _prepare_publish_values_request(
+        self, values: Dict[int, Datapoint]
+    ) -> Tuple[int, val_v2.OpenProviderStreamRequest]:
+        if self.error is not None:
+            raise self.error
+        # request_id is an uint32
+        request_id = next(self._request_ids) % 0x100000000
+        publish_req = val_v2.PublishValuesRequest(request_id=request_id)
+        for signal_id, datapoint in values.items():
+            datapoint.v2_encode_into(
+                publish_req.data_points[signal_id], self._data_types.get(signal_id, DataType.UNSPECIFIED)
+            )
+        return request_id, val_v2.OpenProviderStreamRequest(publish_values_request=publish_req)
+
+    def _process_response(self, response: val_v2.OpenProviderStreamResponse) -> None:
+        if response.HasField("publish_values_response"):
+            logger.debug("%s: %s", type(response).__name__, response)
+            try:
+                _raise_if_publish_failed(response, self.client.id_to_path_mapping)
+            except VSSClientError as exc:
+                request_id = response.publish_values_response.request_id
+                if self.error_callback is not None:
+                    self._run_callback(self.error_callback, request_id, exc)
+                else:
+                    logger.warning("Publish request %d failed: %s", request_id, exc.errors)
+        elif response.HasField("batch_actuate_stream_request"):
+            logger.debug("%s: %s", type(response).__name__, response)
+            if self.actuation_callback is not None:
+                self._run_callback(self.actuation_callback, [
+                    EntryUpdate.from_actuate_value(
+                        self.client.get_path(actuate_req.signal_id), actuate_req.value
+                    )
+                    for actuate_req in response.batch_actuate_stream_request.actuate_requests
+                ])
+        else:
+            logger.debug("%s: %s", type(response).__name__, response)
+
+    @staticmethod
+    def _run_callback(callback: Callable[..., None], *args) -> None:
+        # A failing callback must not end the session, later responses still have to be processed
+        try:
+            callback(*args)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Provider session callback failed")
+
+    def _stream_failed(self, exc: Exception) -> None:
+        # Keep the failure visible to publish() instead of letting the reader end silently
+        logger.exception("Provider stream failed")
+        self.error = VSSClientError(
+            error={
+                "code": grpc.StatusCode.INTERNAL.value[0],
+                "reason": grpc.StatusCode.INTERNAL.value[1],
+                "message": f"Provider stream failed: {exc}",
+            },
+            errors=[],
+        )
+
+
+class VSSClient(BaseVSSClient):
+    def __init__(self, *args, max_concurrent_metadata_requests: int = 8, **kwargs):
+        """
+        Parameters:
+            max_concurrent_metadata_requests
+                Maximum number of ListMetadata requests in flight while resolving signal ids.
+        """
+        super().__init__(*args, **kwargs)
+        self.channel = None
+        self.channels = []
+        self.exit_stack = contextlib.ExitStack()
         self.path_to_id_mapping: Dict[str, int] = dict()
         self.id_to_path_mapping: Dict[int, str] = dict()
+        self.max_concurrent_metadata_requests = max_concurrent_metadata_requests
+        # Branch path -> leaf signal paths, valid for the current connection
+        self.branch_expansions: Dict[str, List[str]] = {}
 
     def __enter__(self):
         self.connect()
@@ -994,29 +1948,34 @@ class VSSClient(BaseVSSClient):
         # Reset the id mapping on each new connection to the data broker because the broker
         # could have been restarted and assigned new ids to paths in between.
         # Furthermore, the specified target host could have changed.
-        self.path_to_id_mapping.clear()
-        self.id_to_path_mapping.clear()
+        self._clear_server_state()
 
         creds = self._load_creds()
         if target_host is None:
             target_host = self.target_host
 
+        options = self.channel_options.channel_args()
+        compression = self.channel_options.compression
+        if self.channel_pool_size > 1:
+            # Let every channel open its own connection instead of sharing one per target
+            options.append(("grpc.use_local_subchannel_pool", 1))
         if creds is not None:
             logger.info("Establishing secure channel")
             if self.tls_server_name:
                 logger.info(f"Using TLS server name {self.tls_server_name}")
-                options = [("grpc.ssl_target_name_override", self.tls_server_name)]
-                channel = grpc.secure_channel(target_host, creds, options)
+                options.append(("grpc.ssl_target_name_override", self.tls_server_name))
             else:
                 logger.debug("Not providing explicit TLS server name")
-                channel = grpc.secure_channel(target_host, creds)
+            create_channel = functools.partial(grpc.secure_channel, target_host, creds, options, compression)
         else:
             logger.info("Establishing insecure channel")
-            channel = grpc.insecure_channel(target_host)
+            create_channel = functools.partial(grpc.insecure_channel, target_host, options, compression)
 
-        self.channel = self.exit_stack.enter_context(channel)
-        self.client_stub_v1 = val_grpc_v1.VALStub(self.channel)
-        self.client_stub_v2 = val_grpc_v2.VALStub(self.channel)
+        self.channels = [
+            self.exit_stack.enter_context(create_channel()) for _ in range(self.channel_pool_size)
+        ]
+        self.channel = self.channels[0]
+        self._create_stubs(self.channels)
         self.connected = True
         if self.ensure_startup_connection:
             logger.debug("Connected to server: %s", self.get_server_info())
@@ -1026,14 +1985,111 @@ class VSSClient(BaseVSSClient):
         self.client_stub_v1 = None
         self.client_stub_v2 = None
         self.channel = None
+        self.channels = []
         self.connected = False
+        self.branch_expansions.clear()
+
+    def _clear_server_state(self):
+        self.path_to_id_mapping.clear()
+        self.id_to_path_mapping.clear()
+        self.data_type_cache.clear()
+        self.branch_expansions.clear()
+
+    @staticmethod
+    def _pipeline(calls: Iterable[Callable[[], grpc.Future]], max_in_flight: int) -> Iterator[grpc.Future]:
+        """
+        Start calls without waiting for the responses of the previous ones, with at most max_in_flight
+        of them outstanding, and yield their futures in order once they are done.
+        Calls still outstanding when the iteration is stopped are cancelled.
+        """
+        in_flight: Deque[grpc.Future] = collections.deque()
+        try:
+            for call in calls:
+                if len(in_flight) >= max_in_flight:
+                    future = in_flight.popleft()
+                    future.exception()  # Wait for the call to finish
+                    yield future
+                in_flight.append(call())
+            while in_flight:
+                future = in_flight.popleft()
+                future.exception()
+                yield future
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    @staticmethod
+    def _future_result(future: grpc.Future) -> Any:
+        try:
+            return future.result()
+        except RpcError as exc:
+            raise VSSClientError.from_grpc_error(exc) from exc
+
+    def resubscribe(
+        self,
+        subscribe: Callable[[], Iterator[Any]],
+        paths: Collection[str],
+        policy: ReconnectPolicy,
+        error: Optional[VSSClientError] = None,
+        **rpc_kwargs,
+    ) -> Iterator[Any]:
+        """
+        Yield from subscribe() and call it again whenever the stream fails with an error matching policy.
+        A SubscriptionGap is yielded before the first update of the new stream.
+        Parameters:
+            paths
+                Paths subscribed by subscribe(). Their ids are resolved again before each new stream,
+                because the databroker could have been restarted. The ids of other paths are kept,
+                provider sessions and updates received by id may still use them.
+            error
+                The stream is considered lost already, subscribe() is first called after a delay.
+            rpc_kwargs
+                grpc.*MultiCallable kwargs e.g. timeout, metadata, credentials.
+        """
+        attempts, lost_at, delays = 0, time.monotonic(), policy.delays()
+        while True:
+            if error is not None:
+                delay = next(delays, None)
+                if delay is None:
+                    raise error
+                attempts += 1
+                if attempts == 1:
+                    logger.warning("Subscription failed (%s), resubscribing", error.error)
+                logger.debug("Resubscribe attempt %d in %.3f s", attempts, delay)
+                time.sleep(delay)
+                self._refresh_paths(paths, **rpc_kwargs)
+            try:
+                for updates in subscribe():
+                    if error is not None:
+                        yield SubscriptionGap(error, attempts, time.monotonic() - lost_at)
+                        error = None
+                    yield updates
+                return
+            except VSSClientError as exc:
+                if not policy.should_reconnect(exc):
+                    raise
+                if error is None:
+                    error, attempts, lost_at, delays = exc, 0, time.monotonic(), policy.delays()
+
+    def _refresh_paths(self, paths: Collection[str], **rpc_kwargs) -> None:
+        # Overwrite the ids in place, so the maps stay usable for everybody else meanwhile
+        for path in paths:
+            self.branch_expansions.pop(path[:-2] if path.endswith(".*") else path, None)
+        try:
+            self._expand_v2_branch_paths(paths, **rpc_kwargs)
+        except VSSClientError as exc:
+            # Left to the subscribe attempt, e.g. a v1 databroker subscribes without ids
+            logger.debug("Could not resolve the ids of %s again: %s", sorted(paths), exc.error)
 
     @check_connected
     def get_current_values(
-        self, paths: Iterable[str], **rpc_kwargs
-    ) -> Dict[str, Datapoint]:
+        self, paths: Iterable[str], output_mode: OutputMode = OutputMode.DATAPOINTS, **rpc_kwargs
+    ) -> Union[Dict[str, Datapoint], List[ValueTuple], val_v2.GetValuesResponse, val_v1.GetResponse]:
         """
         Parameters:
+            output_mode
+                OutputMode.DATAPOINTS (default) for Datapoint objects, OutputMode.TUPLES for
+                (path, value, timestamp_ns) tuples or OutputMode.RAW for the protobuf responses.
             rpc_kwargs
                 grpc.*MultiCallable kwargs e.g. timeout, metadata, credentials.
         Example:
@@ -1042,7 +2098,24 @@ class VSSClient(BaseVSSClient):
                 'Vehicle.ADAS.ABS.IsActive',
             ])
             speed_value = current_values['Vehicle.Speed'].value
+
+        Values are read via v2 GetValues if the server supports it, otherwise via v1 Get.
+        With OutputMode.RAW the response is either a v2 GetValuesResponse or a v1 GetResponse.
         """
+        paths = list(dict.fromkeys(paths))
+        if output_mode is not OutputMode.DATAPOINTS:
+            result = self._v2_get_values_response(paths, **rpc_kwargs)
+            if result is None:
+                resp = self._v1_get(
+                    (EntryRequest(path, View.CURRENT_VALUE, (Field.VALUE,)) for path in paths),
+                    **rpc_kwargs,
+                )
+                return resp if output_mode is OutputMode.RAW else self._v1_get_tuples(resp)
+            paths, resp = result
+            return resp if output_mode is OutputMode.RAW else self._v2_get_values_tuples(paths, resp)
+        values = self._v2_get_values(paths, **rpc_kwargs)
+        if values is not None:
+            return values
         entries = self.get(
             entries=(
                 EntryRequest(path, View.CURRENT_VALUE, (Field.VALUE,)) for path in paths
@@ -1051,6 +2124,53 @@ class VSSClient(BaseVSSClient):
         )
         return {entry.path: entry.value for entry in entries}
 
+    @check_connected
+    def get_many(
+        self, path_groups: Iterable[Iterable[str]], max_in_flight: int = 32, **rpc_kwargs
+    ) -> List[Dict[str, Datapoint]]:
+        """
+        Read the current values of several groups of paths with one GetValues call per group.
+        The calls are pipelined instead of waiting for each response before sending the next request.
+        Parameters:
+            max_in_flight
+                Maximum number of calls waiting for their response.
+            rpc_kwargs
+                grpc.*MultiCallable kwargs e.g. timeout, metadata, credentials.
+        Example:
+            for values in client.get_many([['Vehicle.Speed'], ['Vehicle.ADAS.ABS.IsActive']]):
+                print(values)
+
+        Returns one dict per group in the order of path_groups.
+        Values are read via v2 GetValues if the server supports it, otherwise via v1 Get.
+        """
+        path_groups = [list(dict.fromkeys(paths)) for paths in path_groups]
+        rpc_kwargs["metadata"] = self.generate_metadata_header(
+            rpc_kwargs.get("metadata")
+        )
+        self.ensure_id_mapping(itertools.chain.from_iterable(path_groups), **rpc_kwargs)
+        requests = [self._prepare_v2_get_values_request(paths) for paths in path_groups]
+        if all(req is not None for req in requests):
+            calls = (
+                functools.partial(self.client_stub_v2.GetValues.future, req, **rpc_kwargs) for req in requests
+            )
+            return [
+                self._process_v2_get_values_response(paths, self._future_result(future))
+                for paths, future in zip(path_groups, self._pipeline(calls, max_in_flight))
+            ]
+        logger.debug("v2 not available - falling back to v1 get current values")
+        calls = (
+            functools.partial(
+                self.client_stub_v1.Get.future,
+                self._prepare_get_request(EntryRequest(path, View.CURRENT_VALUE, (Field.VALUE,)) for path in paths),
+                **rpc_kwargs,
+            )
+            for paths in path_groups
+        )
+        return [
+            {entry.path: entry.value for entry in self._process_get_response(self._future_result(future))}
+            for future in self._pipeline(calls, max_in_flight)
+        ]
+
     @check_connected
     def get_target_values(
         self, paths: Iterable[str], **rpc_kwargs
@@ -1103,7 +2223,10 @@ class VSSClient(BaseVSSClient):
             ),
             **rpc_kwargs,
         )
-        return {entry.path: entry.metadata for entry in entries}
+        metadata = {entry.path: entry.metadata for entry in entries}
+        if field in (MetadataField.ALL, MetadataField.DATA_TYPE):
+            self._update_data_type_cache(metadata)
+        return metadata
 
     @check_connected
     def set_current_values(self, updates: Dict[str, Datapoint], **rpc_kwargs) -> None:
@@ -1126,6 +2249,42 @@ class VSSClient(BaseVSSClient):
             **rpc_kwargs,
         )
 
+    @check_connected
+    def publish_many(
+        self, values: Iterable[Tuple[str, Datapoint]], max_in_flight: int = 32, **rpc_kwargs
+    ) -> None:
+        """
+        Publish a sequence of current values with one PublishValue call each, e.g. a recorded trace.
+        The calls are pipelined instead of waiting for each response before sending the next request,
+        values of the same path may thus be applied in a different order.
+        Parameters:
+            max_in_flight
+                Maximum number of calls waiting for their response.
+            rpc_kwargs
+                grpc.*MultiCallable kwargs e.g. timeout, metadata, credentials.
+        Example:
+            client.publish_many([
+                ('Vehicle.Speed', Datapoint(42)),
+                ('Vehicle.ADAS.ABS.IsActive', Datapoint(False)),
+            ])
+
+        Falls back to a single v1 Set of all values if the server does not support v2.
+        """
+        updates = [EntryUpdate(DataEntry(path, value=dp), (Field.VALUE,)) for path, dp in values]
+        if not updates:
+            return
+        rpc_kwargs["metadata"] = self.generate_metadata_header(
+            rpc_kwargs.get("metadata")
+        )
+        paths_with_required_type = self._get_paths_with_required_type(updates)
+        paths_without_type = self._apply_cached_value_types(
+            updates, paths_with_required_type
+        )
+        paths_with_required_type.update(
+            self.get_value_types(paths_without_type, **rpc_kwargs)
+        )
+        self._v2_publish_values(updates, paths_with_required_type, max_in_flight, **rpc_kwargs)
+
     @check_connected
     def set_target_values(self, updates: Dict[str, Datapoint], **rpc_kwargs) -> None:
         """
@@ -1176,10 +2335,48 @@ class VSSClient(BaseVSSClient):
 
     @check_connected
     def subscribe_current_values(
-        self, paths: Iterable[str], **rpc_kwargs
-    ) -> Iterator[Dict[str, Datapoint]]:
+        self,
+        paths: Iterable[str],
+        by_id: bool = False,
+        lazy: bool = False,
+        output_mode: OutputMode = OutputMode.DATAPOINTS,
+        buffer_size: int = 0,
+        max_rate_hz: Optional[PathSetting] = None,
+        deadband: Optional[PathSetting] = None,
+        reconnect: Optional[ReconnectPolicy] = None,
+        **rpc_kwargs,
+    ) -> Iterator[
+        Union[
+            Mapping[str, Datapoint],
+            List[ValueTuple],
+            val_v2.SubscribeResponse,
+            val_v1.SubscribeResponse,
+            SubscriptionGap,
+        ]
+    ]:
         """
         Parameters:
+            by_id
+                Subscribe via v2 SubscribeById so that updates carry signal ids instead of paths.
+            lazy
+                Yield read-only mappings wrapping the v2 response which decode a datapoint only
+                when it is accessed. Saves work for consumers only reading some of the paths.
+            output_mode
+                OutputMode.DATAPOINTS (default) for Datapoint objects, OutputMode.TUPLES for
+                (path, value, timestamp_ns) tuples or OutputMode.RAW for the protobuf responses.
+            buffer_size
+                Number of updates the databroker buffers for this subscription before dropping the oldest
+                ones, 0 for its default of a single update (v2 only).
+            max_rate_hz, deadband
+                Pass on updates of a path at most max_rate_hz times per second and, for numeric values,
+                only if they differ by at least deadband from the last value passed on. The latest update
+                held back by the rate limit is passed on once the interval has expired. Either a value
+                for all paths or a mapping of paths or glob patterns to values. Updates left without
+                any path are not yielded. Not supported with OutputMode.RAW.
+            reconnect
+                Resubscribe with this backoff when the stream fails, e.g. because the databroker was
+                restarted. Then a SubscriptionGap is yielded, followed by one catch-up update with the
+                current values of all paths.
             rpc_kwargs
                 grpc.*MultiCallable kwargs e.g. timeout, metadata, credentials.
         Example:
@@ -1195,14 +2392,40 @@ class VSSClient(BaseVSSClient):
         with the resulting leaf signals. This restores the wildcard semantics
         that v1 provided natively.
         """
+        if reconnect is not None:
+            paths = list(paths)
+            yield from self.resubscribe(
+                lambda: self.subscribe_current_values(
+                    paths, by_id, lazy, output_mode, buffer_size, max_rate_hz, deadband, **rpc_kwargs
+                ),
+                paths,
+                reconnect,
+                **rpc_kwargs,
+            )
+            return
+        update_filter = _UpdateFilter.create(max_rate_hz, deadband)
+        if update_filter is not None:
+            if output_mode is OutputMode.RAW:
+                raise ValueError("max_rate_hz and deadband are not supported with OutputMode.RAW")
+            filter_updates = (
+                update_filter.filter_tuples if output_mode is OutputMode.TUPLES else update_filter.filter_datapoints
+            )
+            responses = self.subscribe_current_values(paths, by_id, lazy, output_mode, buffer_size, **rpc_kwargs)
+            if max_rate_hz is not None:
+                yield from _rate_limited_updates(responses, update_filter, filter_updates)
+                return
+            for updates in responses:
+                updates = filter_updates(updates)
+                if updates:
+                    yield updates
+            return
         paths = list(paths)
         try:
             logger.debug("Try to subscribe current values via v2")
             try:
-                for updates in self.v2_subscribe(paths, **rpc_kwargs):
-                    yield {
-                        update.entry.path: update.entry.value for update in updates
-                    }
+                yield from self._v2_subscribe_current_values(
+                    paths, by_id, lazy, output_mode, buffer_size, **rpc_kwargs
+                )
             except VSSClientError as exc:
                 if exc.error["code"] != grpc.StatusCode.NOT_FOUND.value[0]:
                     raise
@@ -1210,30 +2433,34 @@ class VSSClient(BaseVSSClient):
                     "v2 Subscribe returned NOT_FOUND; expanding branch paths via ListMetadata"
                 )
                 expanded = self._expand_v2_branch_paths(paths, **rpc_kwargs)
-                for updates in self.v2_subscribe(expanded, **rpc_kwargs):
-                    yield {
-                        update.entry.path: update.entry.value for update in updates
-                    }
+                yield from self._v2_subscribe_current_values(
+                    expanded, by_id, lazy, output_mode, buffer_size, **rpc_kwargs
+                )
         except VSSClientError as exc:
             if exc.error["code"] != grpc.StatusCode.UNIMPLEMENTED.value[0]:
                 raise
 
             logger.debug("v2 not available - falling back to v1 subscribe current values")
-            for updates in self.subscribe(
-                entries=(
-                    SubscribeEntry(path, View.CURRENT_VALUE, (Field.VALUE,))
-                    for path in paths
-                ),
-                **rpc_kwargs,
-            ):
+            entries = (SubscribeEntry(path, View.CURRENT_VALUE, (Field.VALUE,)) for path in paths)
+            if output_mode is not OutputMode.DATAPOINTS:
+                for resp in self._v1_subscribe_responses(entries, **rpc_kwargs):
+                    if output_mode is OutputMode.RAW:
+                        yield resp
+                    else:
+                        yield self._v1_subscribe_tuples(resp, Field.VALUE)
+                return
+            for updates in self.subscribe(entries=entries, **rpc_kwargs):
                 yield {update.entry.path: update.entry.value for update in updates}
 
     @check_connected
     def subscribe_target_values(
-        self, paths: Iterable[str], **rpc_kwargs
-    ) -> Iterator[Dict[str, Datapoint]]:
+        self, paths: Iterable[str], output_mode: OutputMode = OutputMode.DATAPOINTS, **rpc_kwargs
+    ) -> Iterator[Union[Dict[str, Datapoint], List[ValueTuple], val_v2.OpenProviderStreamResponse]]:
         """
         Parameters:
+            output_mode
+                OutputMode.DATAPOINTS (default) for Datapoint objects, OutputMode.TUPLES for
+                (path, value, timestamp_ns) tuples or OutputMode.RAW for the protobuf responses.
             rpc_kwargs
                 grpc.*MultiCallable kwargs e.g. timeout, metadata, credentials.
         Example:
@@ -1243,8 +2470,13 @@ class VSSClient(BaseVSSClient):
                 for path, dp in updates.items():
                     print(f"Target value for {path} is now: {dp.value}")
         """
+        paths = list(paths)
         try:
             logger.debug("Try to subscribe actuation requests via v2")
+            if output_mode is not OutputMode.DATAPOINTS:
+                for resp in self._v2_actuation_request_responses(paths, **rpc_kwargs):
+                    yield resp if output_mode is OutputMode.RAW else self._v2_actuation_tuples(resp)
+                return
             for updates in self.v2_subscribe_actuation_requests(paths, **rpc_kwargs):
                 yield {
                     update.entry.path: update.entry.actuator_target for update in updates
@@ -1254,17 +2486,88 @@ class VSSClient(BaseVSSClient):
                 raise
 
             logger.debug("v2 not available - falling back to v1 subscribe target values")
-            for updates in self.subscribe(
-                entries=(
-                    SubscribeEntry(path, View.TARGET_VALUE, (Field.ACTUATOR_TARGET,))
-                    for path in paths
-                ),
-                **rpc_kwargs,
-            ):
+            entries = (SubscribeEntry(path, View.TARGET_VALUE, (Field.ACTUATOR_TARGET,)) for path in paths)
+            if output_mode is not OutputMode.DATAPOINTS:
+                for resp in self._v1_subscribe_responses(entries, **rpc_kwargs):
+                    if output_mode is OutputMode.RAW:
+                        yield resp
+                    else:
+                        yield self._v1_subscribe_tuples(resp, Field.ACTUATOR_TARGET)
+                return
+            for updates in self.subscribe(entries=entries, **rpc_kwargs):
                 yield {
                     update.entry.path: update.entry.actuator_target for update in updates
                 }
 
+    @check_connected
+    def get_current_values_columnar(self, paths: Iterable[str], **rpc_kwargs) -> "ColumnarBatch":
+        """
+        Return the current values of a fixed set of signals as a single-row ColumnarBatch.
+        Requires numpy.
+        Parameters:
+            rpc_kwargs
+                grpc.*MultiCallable kwargs e.g. timeout, metadata, credentials.
+        Example:
+            batch = client.get_current_values_columnar(['Vehicle.Speed', 'Vehicle.ADAS.ABS.IsActive'])
+            speed = batch.column('Vehicle.Speed')[0]
+        """
+        from .columnar import ColumnarBatch  # pylint: disable=import-outside-toplevel
+
+        batch = ColumnarBatch(self._get_columnar_data_types(paths, **rpc_kwargs))
+        batch.append(self.get_current_values(batch.paths, output_mode=OutputMode.RAW, **rpc_kwargs))
+        return batch
+
+    @check_connected
+    def subscribe_current_values_columnar(
+        self, paths: Iterable[str], window_size: int, reuse_batch: bool = False, **rpc_kwargs
+    ) -> Iterator["ColumnarBatch"]:
+        """
+        Accumulate current value updates of a fixed set of signals into ColumnarBatches of
+        window_size rows, one row per update. A batch is yielded once it is full
+        and, if the subscription ends, with the remaining rows.
+        Requires numpy.
+        Parameters:
+            window_size
+                Number of updates per yielded batch.
+            reuse_batch
+                Clear and refill the same batch instead of allocating a new one per window.
+                The consumer must be done with a batch before requesting the next one.
+            rpc_kwargs
+                grpc.*MultiCallable kwargs e.g. timeout, metadata, credentials.
+        Example:
+            for batch in client.subscribe_current_values_columnar(['Vehicle.Speed'], window_size=100):
+                speeds = batch.column('Vehicle.Speed')[batch.mask('Vehicle.Speed')]
+        """
+        from .columnar import ColumnarBatch  # pylint: disable=import-outside-toplevel
+
+        data_types = self._get_columnar_data_types(paths, **rpc_kwargs)
+        batch = ColumnarBatch(data_types, window_size)
+        for resp in self.subscribe_current_values(batch.paths, output_mode=OutputMode.RAW, **rpc_kwargs):
+            batch.append(resp)
+            if batch.full:
+                yield batch
+                if reuse_batch:
+                    batch.clear()
+                else:
+                    batch = ColumnarBatch(data_types, window_size)
+        if len(batch):
+            yield batch
+
+    def _get_columnar_data_types(self, paths: Iterable[str], **rpc_kwargs) -> Dict[str, DataType]:
+        paths = list(dict.fromkeys(paths))
+        rpc_kwargs["metadata"] = self.generate_metadata_header(
+            rpc_kwargs.get("metadata")
+        )
+        data_types, missing = self.data_type_cache.lookup(paths)
+        if missing:
+            # Resolving ids via v2 ListMetadata fills the data type cache as well
+            self.ensure_id_mapping(missing, **rpc_kwargs)
+            resolved, missing = self.data_type_cache.lookup(missing)
+            data_types.update(resolved)
+        if missing:
+            data_types.update(self.get_value_types(missing, **rpc_kwargs))
+        return {path: data_types[path] for path in paths}
+
     @check_connected
     def subscribe_metadata(
         self,
@@ -1291,7 +2594,10 @@ class VSSClient(BaseVSSClient):
             ),
             **rpc_kwargs,
         ):
-            yield {update.entry.path: update.entry.metadata for update in updates}
+            metadata = {update.entry.path: update.entry.metadata for update in updates}
+            if field in (MetadataField.ALL, MetadataField.DATA_TYPE):
+                self._update_data_type_cache(metadata)
+            yield metadata
 
     @check_connected
     def get(self, entries: Iterable[EntryRequest], **rpc_kwargs) -> List[DataEntry]:
@@ -1300,15 +2606,17 @@ class VSSClient(BaseVSSClient):
             rpc_kwargs
                 grpc.*MultiCallable kwargs e.g. timeout, metadata, credentials.
         """
+        return self._process_get_response(self._v1_get(entries, **rpc_kwargs))
+
+    def _v1_get(self, entries: Iterable[EntryRequest], **rpc_kwargs) -> val_v1.GetResponse:
         rpc_kwargs["metadata"] = self.generate_metadata_header(
             rpc_kwargs.get("metadata")
         )
         req = self._prepare_get_request(entries)
         try:
-            resp = self.client_stub_v1.Get(req, **rpc_kwargs)
+            return self.client_stub_v1.Get(req, **rpc_kwargs)
         except RpcError as exc:
             raise VSSClientError.from_grpc_error(exc) from exc
-        return self._process_get_response(resp)
 
     @check_connected
     def set(
@@ -1323,11 +2631,14 @@ class VSSClient(BaseVSSClient):
             rpc_kwargs.get("metadata")
         )
         paths_with_required_type = self._get_paths_with_required_type(updates)
-        paths_without_type = [
-            path
-            for path, data_type in paths_with_required_type.items()
-            if data_type is DataType.UNSPECIFIED
-        ]
+        if try_v2 and len(updates) > 1:
+            for update in updates:
+                self._check_v2_fields(update)
+            # The data types of a batch are resolved with ListMetadata along with the ids, rather than with v1
+            self.ensure_id_mapping(paths_with_required_type, **rpc_kwargs)
+        paths_without_type = self._apply_cached_value_types(
+            updates, paths_with_required_type
+        )
         paths_with_required_type.update(
             self.get_value_types(paths_without_type, **rpc_kwargs)
         )
@@ -1342,18 +2653,11 @@ class VSSClient(BaseVSSClient):
                     },
                     errors=[],
                 )
-            for update in updates:
-                req = self._prepare_publish_value_request(
-                    update, paths_with_required_type
-                )
-                try:
-                    resp = self.client_stub_v2.PublishValue(req, **rpc_kwargs)
-                except RpcError as exc:
-                    if exc.code() == grpc.StatusCode.UNIMPLEMENTED:
-                        logger.debug("v2 not available fall back to v1 instead")
-                        self.set(updates)
-                    else:
-                        raise VSSClientError.from_grpc_error(exc) from exc
+            # The calls are pipelined, only the last update of a path is published so that it wins
+            updates_by_path = {update.entry.path: update for update in updates}
+            self._v2_publish_values(
+                list(updates_by_path.values()), paths_with_required_type, **rpc_kwargs
+            )
         else:
             logger.debug("Trying v1")
             req = self._prepare_set_request(updates, paths_with_required_type)
@@ -1363,6 +2667,78 @@ class VSSClient(BaseVSSClient):
                 raise VSSClientError.from_grpc_error(exc) from exc
             self._process_set_response(resp)
 
+    def _v2_get_values(
+        self, paths: List[str], **rpc_kwargs
+    ) -> Optional[Dict[str, Datapoint]]:
+        """
+        Read current values via v2 GetValues using resolved signal ids.
+        Returns None if the server does not support it, so that the caller can fall back to v1.
+        """
+        result = self._v2_get_values_response(paths, **rpc_kwargs)
+        if result is None:
+            return None
+        return self._process_v2_get_values_response(*result)
+
+    def _v2_get_values_response(
+        self, paths: List[str], **rpc_kwargs
+    ) -> Optional[Tuple[List[str], val_v2.GetValuesResponse]]:
+        """
+        Return the paths of the signals read along with the response, paths that are not signals
+        are expanded into the signals below them, so that branch paths return all their signals as with v1.
+        """
+        if not paths:
+            return paths, val_v2.GetValuesResponse()
+        rpc_kwargs["metadata"] = self.generate_metadata_header(
+            rpc_kwargs.get("metadata")
+        )
+        try:
+            self.ensure_id_mapping(paths, **rpc_kwargs)
+        except VSSClientError as exc:
+            if exc.error.get("code") != grpc.StatusCode.NOT_FOUND.value[0]:
+                raise
+            paths = self._expand_v2_branch_paths(paths, **rpc_kwargs)
+        req = self._prepare_v2_get_values_request(paths)
+        if req is None:
+            return None
+        try:
+            resp = self.client_stub_v2.GetValues(req, **rpc_kwargs)
+        except RpcError as exc:
+            if exc.code() == grpc.StatusCode.UNIMPLEMENTED:
+                logger.debug("v2 not available - falling back to v1 get current values")
+                return None
+            raise VSSClientError.from_grpc_error(exc) from exc
+        logger.debug("%s: %s", type(resp).__name__, resp)
+        return paths, resp
+
+    def _v2_publish_values(
+        self,
+        updates: Collection[EntryUpdate],
+        paths_with_required_type: Dict[str, DataType],
+        max_in_flight: int = 32,
+        **rpc_kwargs,
+    ) -> None:
+        """
+        Publish updates with one PublishValue call each, pipelined with at most max_in_flight
+        calls waiting for their response.
+        Falls back to a single v1 Set of all updates if the server does not support v2.
+        """
+        calls = (
+            functools.partial(
+                self.client_stub_v2.PublishValue.future,
+                self._prepare_publish_value_request(update, paths_with_required_type),
+                **rpc_kwargs,
+            )
+            for update in updates
+        )
+        try:
+            for future in self._pipeline(calls, max(1, max_in_flight)):
+                self._future_result(future)
+        except VSSClientError as exc:
+            if exc.error["code"] != grpc.StatusCode.UNIMPLEMENTED.value[0]:
+                raise
+            logger.debug("v2 not available fall back to v1 instead")
+            self.set(updates, **rpc_kwargs)
+
     def get_path(self, signal_id: types_v2.SignalID) -> str:
         if signal_id.HasField("path"):
             return signal_id.path
@@ -1380,6 +2756,10 @@ class VSSClient(BaseVSSClient):
         (ListMetadata returns a single entry). Non-existent paths surface
         as NOT_FOUND. Trailing ``.*`` suffixes are stripped before lookup.
 
+        Lookups are pipelined, at most ``max_concurrent_metadata_requests``
+        at a time, and their results are memoized for the current connection.
+        The returned metadata also fills the signal id mapping.
+
         Order is preserved and duplicates (from overlapping branches) are
         removed. Used to restore v1-style wildcard semantics on top of the
         v2 Subscribe RPC, which only accepts fully-qualified leaf paths.
@@ -1387,14 +2767,22 @@ class VSSClient(BaseVSSClient):
         rpc_kwargs["metadata"] = self.generate_metadata_header(
             rpc_kwargs.get("metadata")
         )
-        expanded: List[str] = []
-        for path in paths:
-            lookup = path[:-2] if path.endswith(".*") else path
-            req = self._prepare_v2_list_metadata_request(lookup)
-            try:
-                resp = self.client_stub_v2.ListMetadata(req, **rpc_kwargs)
-            except RpcError as exc:
-                raise VSSClientError.from_grpc_error(exc) from exc
+        lookups = {
+            path: path[:-2] if path.endswith(".*") else path for path in paths
+        }
+        pending = {
+            lookup: path for path, lookup in lookups.items() if lookup not in self.branch_expansions
+        }
+        calls = (
+            functools.partial(
+                self.client_stub_v2.ListMetadata.future, self._prepare_v2_list_metadata_request(lookup), **rpc_kwargs
+            )
+            for lookup in pending
+        )
+        for (lookup, path), future in zip(
+            pending.items(), self._pipeline(calls, max(1, self.max_concurrent_metadata_requests))
+        ):
+            resp = self._future_result(future)
             if not resp.metadata:
                 raise VSSClientError(
                     error={
@@ -1404,36 +2792,49 @@ class VSSClient(BaseVSSClient):
                     },
                     errors=[],
                 )
-            expanded.extend(m.path for m in resp.metadata)
+            self._update_id_mapping((), resp.metadata)
+            self.branch_expansions[lookup] = [m.path for m in resp.metadata]
+        expanded: List[str] = []
+        for lookup in lookups.values():
+            expanded.extend(self.branch_expansions[lookup])
         return list(dict.fromkeys(expanded))
 
     def ensure_id_mapping(self, paths: Iterable[str], **rpc_kwargs):
-        for path in paths:
-            if path not in self.path_to_id_mapping:
-                # Prevent duplicate requests for the same path
-                self.path_to_id_mapping[path] = None
-                req = self._prepare_v2_list_metadata_request(path)
-                try:
-                    resp = self.client_stub_v2.ListMetadata(req, **rpc_kwargs)
-                    logger.debug("%s: %s", type(resp).__name__, resp)
-                    if len(resp.metadata) == 1:
-                        self.path_to_id_mapping[path] = resp.metadata[0].id
-                        self.id_to_path_mapping[resp.metadata[0].id] = path
-                    else:
-                        del self.path_to_id_mapping[path]
-                        raise VSSClientError(
-                            error={
-                                "code": grpc.StatusCode.NOT_FOUND.value[0],
-                                "reason": grpc.StatusCode.NOT_FOUND.value[1],
-                                "message": f"Path {path} not found on server",
-                            },
-                            errors=[],
-                        )
-                except RpcError as exc:
-                    if exc.code() == grpc.StatusCode.UNIMPLEMENTED:
-                        logger.debug("v2 not available - skip querying ids")
-                        return
-                    raise VSSClientError.from_grpc_error(exc) from exc
+        """
+        Resolve the signal ids of all paths not resolved yet.
+        Paths are grouped by branch so that one ListMetadata request resolves a whole group,
+        the requests of all groups are pipelined with at most ``max_concurrent_metadata_requests`` in flight.
+        """
+        missing_paths = [
+            path for path in dict.fromkeys(paths) if path not in self.path_to_id_mapping
+        ]
+        not_found = []
+        roots = self._group_paths_by_branch(missing_paths)
+        calls = (
+            functools.partial(
+                self.client_stub_v2.ListMetadata.future, self._prepare_v2_list_metadata_request(root), **rpc_kwargs
+            )
+            for root in roots
+        )
+        futures = self._pipeline(calls, max(1, self.max_concurrent_metadata_requests))
+        for root_paths, future in zip(roots.values(), futures):
+            try:
+                resp = future.result()
+            except RpcError as exc:
+                if exc.code() == grpc.StatusCode.UNIMPLEMENTED:
+                    logger.debug("v2 not available - skip querying ids")
+                    # Prevent further requests for these paths
+                    for path in missing_paths:
+                        self.path_to_id_mapping.setdefault(path, None)
+                    return
+                if exc.code() == grpc.StatusCode.NOT_FOUND:
+                    not_found.extend(root_paths)
+                    continue
+                raise VSSClientError.from_grpc_error(exc) from exc
+            logger.debug("%s: %s", type(resp).__name__, resp)
+            not_found.extend(self._update_id_mapping(root_paths, resp.metadata))
+        if not_found:
+            self._raise_paths_not_found(not_found)
 
     @check_connected
     def subscribe(
@@ -1456,45 +2857,136 @@ class VSSClient(BaseVSSClient):
                 errors=[],
             )
 
+        for resp in self._v1_subscribe_responses(entries, **rpc_kwargs):
+            yield [EntryUpdate.from_message(update, self.timestamp_ns) for update in resp.updates]
+
+    def _v1_subscribe_responses(
+        self, entries: Iterable[SubscribeEntry], **rpc_kwargs
+    ) -> Iterator[val_v1.SubscribeResponse]:
         logger.debug("Try subscribing via v1")
         rpc_kwargs["metadata"] = self.generate_metadata_header(
             rpc_kwargs.get("metadata")
         )
         req = self._prepare_subscribe_request(entries)
         resp_stream = self.client_stub_v1.Subscribe(req, **rpc_kwargs)
+        _track_call(resp_stream)
         try:
             for resp in resp_stream:
                 logger.debug("%s: %s", type(resp).__name__, resp)
-                yield [EntryUpdate.from_message(update) for update in resp.updates]
+                yield resp
         except RpcError as exc:
             raise VSSClientError.from_grpc_error(exc) from exc
 
     @check_connected
     def v2_subscribe(
-        self, paths: Iterable[str], **rpc_kwargs
+        self,
+        paths: Iterable[str],
+        by_id: bool = False,
+        lazy: bool = False,
+        buffer_size: int = 0,
+        **rpc_kwargs,
     ) -> Iterator[List[EntryUpdate]]:
         """
         Parameters:
+            by_id
+                Subscribe via SubscribeById and map the signal ids of the updates back to paths.
+            lazy
+                Decode value and timestamp of a datapoint only when they are accessed.
+            buffer_size
+                Number of updates the databroker buffers for this subscription before dropping the oldest
+                ones, 0 for its default of a single update (v2 only).
+            rpc_kwargs
+                grpc.*MultiCallable kwargs e.g. timeout, metadata, credentials.
+        """
+
+        decode = self._v2_datapoint_decoder(lazy)
+        for resp in self._v2_subscribe_responses(paths, by_id, buffer_size, **rpc_kwargs):
+            if by_id:
+                yield [
+                    EntryUpdate(
+                        DataEntry(self.id_to_path_mapping[signal_id], value=decode(dp)),
+                        [Field.VALUE],
+                    )
+                    for signal_id, dp in resp.entries.items()
+                ]
+            else:
+                yield [
+                    EntryUpdate(DataEntry(path, value=decode(dp)), [Field.VALUE])
+                    for path, dp in resp.entries.items()
+                ]
+
+    @check_connected
+    def v2_subscribe_by_id(
+        self, paths: Iterable[str], lazy: bool = False, buffer_size: int = 0, **rpc_kwargs
+    ) -> Iterator[Mapping[int, Datapoint]]:
+        """
+        Subscribe to current values via v2 SubscribeById.
+        Updates are keyed by signal id, use id_to_path_mapping to look up their paths.
+        Parameters:
+            lazy
+                Yield read-only mappings decoding a datapoint only when it is accessed.
+            buffer_size
+                Number of updates the databroker buffers for this subscription before dropping the oldest
+                ones, 0 for its default of a single update (v2 only).
             rpc_kwargs
                 grpc.*MultiCallable kwargs e.g. timeout, metadata, credentials.
         """
 
-        logger.debug("Subscribe current values via v2")
+        decode = self._v2_datapoint_decoder(lazy=False)
+        for resp in self._v2_subscribe_responses(paths, True, buffer_size, **rpc_kwargs):
+            if lazy:
+                yield LazyDatapoints(resp.entries, timestamp_ns=self.timestamp_ns)
+            else:
+                yield {signal_id: decode(dp) for signal_id, dp in resp.entries.items()}
+
+    def _v2_subscribe_responses(
+        self, paths: Iterable[str], by_id: bool = False, buffer_size: int = 0, **rpc_kwargs
+    ) -> Iterator[Union[val_v2.SubscribeResponse, val_v2.SubscribeByIdResponse]]:
         rpc_kwargs["metadata"] = self.generate_metadata_header(
             rpc_kwargs.get("metadata")
         )
-        req = self._prepare_v2_subscribe_request(paths)
-        resp_stream = self.client_stub_v2.Subscribe(req, **rpc_kwargs)
+        if by_id:
+            logger.debug("Subscribe current values by id via v2")
+            paths = list(paths)
+            self.ensure_id_mapping(paths, **rpc_kwargs)
+            req = self._prepare_v2_subscribe_by_id_request(paths, buffer_size)
+            resp_stream = self.client_stub_v2.SubscribeById(req, **rpc_kwargs)
+        else:
+            logger.debug("Subscribe current values via v2")
+            req = self._prepare_v2_subscribe_request(paths, buffer_size)
+            resp_stream = self.client_stub_v2.Subscribe(req, **rpc_kwargs)
+        _track_call(resp_stream)
         try:
             for resp in resp_stream:
                 logger.debug("%s: %s", type(resp).__name__, resp)
-                yield [
-                    EntryUpdate.from_tuple(path, dp)
-                    for path, dp in resp.entries.items()
-                ]
+                yield resp
         except RpcError as exc:
             raise VSSClientError.from_grpc_error(exc) from exc
 
+    def _v2_subscribe_current_values(
+        self,
+        paths: Iterable[str],
+        by_id: bool,
+        lazy: bool,
+        output_mode: OutputMode,
+        buffer_size: int = 0,
+        **rpc_kwargs,
+    ) -> Iterator[Union[Mapping[str, Datapoint], List[ValueTuple], val_v2.SubscribeResponse]]:
+        if output_mode is not OutputMode.DATAPOINTS:
+            for resp in self._v2_subscribe_responses(paths, by_id, buffer_size, **rpc_kwargs):
+                yield resp if output_mode is OutputMode.RAW else self._v2_subscribe_tuples(resp, by_id)
+        elif lazy:
+            for resp in self._v2_subscribe_responses(paths, by_id, buffer_size, **rpc_kwargs):
+                if by_id:
+                    yield LazyDatapoints(
+                        resp.entries, self.path_to_id_mapping, self.id_to_path_mapping, self.timestamp_ns
+                    )
+                else:
+                    yield LazyDatapoints(resp.entries, timestamp_ns=self.timestamp_ns)
+        else:
+            for updates in self.v2_subscribe(paths=paths, by_id=by_id, buffer_size=buffer_size, **rpc_kwargs):
+                yield {update.entry.path: update.entry.value for update in updates}
+
     @check_connected
     def v2_subscribe_actuation_requests(
         self, paths: Iterable[str], **rpc_kwargs
@@ -1505,10 +2997,20 @@ class VSSClient(BaseVSSClient):
                 grpc.*MultiCallable kwargs e.g. timeout, metadata, credentials.
         """
 
+        for resp in self._v2_actuation_request_responses(paths, **rpc_kwargs):
+            yield [
+                EntryUpdate.from_actuate_value(self.get_path(actuate_req.signal_id), actuate_req.value)
+                for actuate_req in resp.batch_actuate_stream_request.actuate_requests
+            ]
+
+    def _v2_actuation_request_responses(
+        self, paths: Iterable[str], **rpc_kwargs
+    ) -> Iterator[val_v2.OpenProviderStreamResponse]:
         logger.debug("Subscribe actuation requests via v2")
         rpc_kwargs["metadata"] = self.generate_metadata_header(
             rpc_kwargs.get("metadata")
         )
+        paths = list(paths)
         self.ensure_id_mapping(paths, **rpc_kwargs)
         req = self._prepare_v2_provide_actuation_request(paths)
         resp_stream = self.client_stub_v2.OpenProviderStream(iter(req), **rpc_kwargs)
@@ -1516,10 +3018,7 @@ class VSSClient(BaseVSSClient):
             for resp in resp_stream:
                 logger.debug("batch %s: %s", type(resp).__name__, resp)
                 if resp.HasField("batch_actuate_stream_request"):
-                    yield [
-                        EntryUpdate.from_actuate_value(self.get_path(actuate_req.signal_id), actuate_req.value)
-                        for actuate_req in resp.batch_actuate_stream_request.actuate_requests
-                    ]
+                    yield resp
         except RpcError as exc:
             raise VSSClientError.from_grpc_error(exc) from exc
 
@@ -1588,5 +3087,133 @@ class VSSClient(BaseVSSClient):
                 for path in paths
             )
             entries = self.get(entries=entry_requests, **rpc_kwargs)
-            return {entry.path: DataType(entry.metadata.data_type) for entry in entries}
+            data_types = {entry.path: DataType(entry.metadata.data_type) for entry in entries}
+            self.data_type_cache.update(data_types)
+            return data_types
         return {}
+
+    @check_connected
+    def load_data_types(
+        self, roots: Iterable[str] = ("Vehicle",), **rpc_kwargs
+    ) -> int:
+        """
+        Fill the data type cache in bulk, so that subsequent set calls for any signal
+        below the given roots do not need to query the data type.
+        Returns the number of cached signals.
+        Parameters:
+            rpc_kwargs
+                grpc.*MultiCallable kwargs e.g. timeout, metadata, credentials.
+        Example:
+            client.load_data_types(['Vehicle.Cabin'])
+        """
+        rpc_kwargs["metadata"] = self.generate_metadata_header(
+            rpc_kwargs.get("metadata")
+        )
+        roots = list(roots)
+        for root in roots:
+            req = self._prepare_v2_list_metadata_request(root)
+            try:
+                resp = self.client_stub_v2.ListMetadata(req, **rpc_kwargs)
+            except RpcError as exc:
+                if exc.code() == grpc.StatusCode.UNIMPLEMENTED:
+                    logger.debug("v2 not available - falling back to v1 to query data types")
+                    self.get_value_types(roots, **rpc_kwargs)
+                    break
+                raise VSSClientError.from_grpc_error(exc) from exc
+            logger.debug("%s: %s", type(resp).__name__, resp)
+            self.data_type_cache.update(
+                {metadata.path: DataType(metadata.data_type) for metadata in resp.metadata}
+            )
+        return len(self.data_type_cache)
+
+
+class ProviderSession(BaseProviderSession):
+    """
+    Long-lived OpenProviderStream for publishing values of many signals at a high rate.
+    Signal ids and data types are resolved once when the session is opened and values are then
+    published by numeric signal id as PublishValuesRequests on the same stream, instead of one RPC
+    per value. The signals are claimed for this provider when the session is opened. Failing requests
+    are reported through error_callback with their request_id while the stream stays open. Actuators
+    given as actuator_paths are claimed as well and their actuation requests are passed to
+    actuation_callback.
+    Example:
+        with ProviderSession(client, ['Vehicle.Speed']) as session:
+            speed_id = session.signal_id('Vehicle.Speed')
+            for speed in speeds:
+                session.publish({speed_id: Datapoint(speed)})
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._requests: Optional[queue.Queue] = None
+        self._responses = None
+        self._reader: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def open(self) -> None:
+        rpc_kwargs = dict(self.rpc_kwargs)
+        rpc_kwargs["metadata"] = self.client.generate_metadata_header(
+            rpc_kwargs.get("metadata")
+        )
+        paths = self._all_paths()
+        self.client.ensure_id_mapping(paths, **rpc_kwargs)
+        data_types, paths_without_type = self.client.data_type_cache.lookup(paths)
+        data_types.update(self.client.get_value_types(paths_without_type, **rpc_kwargs))
+        self._set_data_types(data_types)
+
+        self.error = None
+        self._requests = queue.Queue()
+        for req in self._prepare_provide_requests():
+            self._requests.put(req)
+        self._responses = self.client.client_stub_v2.OpenProviderStream(
+            iter(self._requests.get, None), **rpc_kwargs
+        )
+        self._reader = threading.Thread(target=self._read_responses, daemon=True)
+        self._reader.start()
+
+    def publish(self, values: Dict[int, Datapoint]) -> int:
+        """
+        Queue the values for publishing and return the request_id used for them.
+        """
+        if self._requests is None:
+            raise VSSClientError(
+                error={
+                    "code": grpc.StatusCode.FAILED_PRECONDITION.value[0],
+                    "reason": grpc.StatusCode.FAILED_PRECONDITION.value[1],
+                    "message": "Provider session not open! Call open() before publishing!",
+                },
+                errors=[],
+            )
+        request_id, req = self._prepare_publish_values_request(values)
+        self._requests.put(req)
+        return request_id
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        if self._requests is None:
+            return
+        # Ending the request stream lets the server finish the stream once pending requests are processed
+        self._requests.put(None)
+        self._reader.join(timeout)
+        if self._reader.is_alive():
+            self._responses.cancel()
+            self._reader.join()
+        self._requests = None
+        self._responses = None
+        self._reader = None
+
+    def _read_responses(self) -> None:
+        try:
+            for resp in self._responses:
+                self._process_response(resp)
+        except RpcError as exc:
+            if exc.code() != grpc.StatusCode.CANCELLED:
+                logger.error("Provider stream failed: %s", exc.details())
+                self.error = VSSClientError.from_grpc_error(exc)
+        except Exception as exc:  # pylint: disable=broad-except
+            self._stream_failed(exc)
@@ -17,25 +17,36 @@
 ########################################################################
 
 import asyncio
+import collections
+import concurrent.futures
 import contextlib
+import dataclasses
+import functools
 import logging
+import time
+from typing import Any
 from typing import AsyncIterator
 from typing import Callable
 from typing import Collection
+from typing import Deque
 from typing import Dict
 from typing import Iterable
 from typing import List
+from typing import Mapping
 from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import Union
 import uuid
 
 import grpc
 from grpc.aio import AioRpcError
 
 from kuksa.val.v1 import val_pb2 as val_v1
-from kuksa.val.v1 import val_pb2_grpc as val_grpc_v1
 from kuksa.val.v2 import types_pb2 as types_v2
-from kuksa.val.v2 import val_pb2_grpc as val_grpc_v2
+from kuksa.val.v2 import val_pb2 as val_v2
 
+from . import BaseProviderSession
 from . import BaseVSSClient
 from . import Datapoint
 from . import DataEntry
@@ -43,23 +54,81 @@ from . import DataType
 from . import EntryRequest
 from . import EntryUpdate
 from . import Field
+from . import LazyDatapoints
 from . import Metadata
 from . import MetadataField
+from . import OutputMode
+from . import PathSetting
+from . import QueuePolicy
+from . import ReconnectPolicy
 from . import ServerInfo
 from . import SubscribeEntry
+from . import SubscriberStats
+from . import SubscriptionGap
+from . import ValueTuple
 from . import View
 from . import VSSClientError
+from . import WorkerStats
+from . import _UpdateFilter
+from .columnar import ColumnarBatch
 
 logger = logging.getLogger(__name__)
 
 
+async def _rate_limited_updates(
+    responses: AsyncIterator[Any], update_filter: _UpdateFilter, filter_updates: Callable[[Any], Any]
+) -> AsyncIterator[Any]:
+    """
+    Yield the updates of responses passed by filter_updates. Updates held back by the rate limit are
+    yielded once due, also if no further response arrives meanwhile.
+    """
+    responses = responses.__aiter__()  # pylint: disable=unnecessary-dunder-call
+    next_response: Optional[asyncio.Future] = asyncio.ensure_future(
+        responses.__anext__()  # pylint: disable=unnecessary-dunder-call
+    )
+    try:
+        while next_response is not None or update_filter.due_in() is not None:
+            due_in = update_filter.due_in()
+            item = None
+            if next_response is None:
+                await asyncio.sleep(due_in)
+            else:
+                done, _ = await asyncio.wait((next_response,), timeout=due_in)
+                if done:
+                    try:
+                        item = next_response.result()
+                        next_response = asyncio.ensure_future(
+                            responses.__anext__()  # pylint: disable=unnecessary-dunder-call
+                        )
+                    except StopAsyncIteration:
+                        next_response = None
+            # Without new updates only the held back ones which are due are passed
+            updates = filter_updates({} if item is None else item)
+            if updates:
+                yield updates
+    finally:
+        if next_response is not None:
+            next_response.cancel()
+            await asyncio.wait((next_response,))
+        await responses.aclose()
+
+
 class VSSClient(BaseVSSClient):
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, max_concurrent_metadata_requests: int = 8, **kwargs):
+        """
+        Parameters:
+            max_concurrent_metadata_requests
+                Maximum number of ListMetadata requests in flight while expanding branch paths.
+        """
         super().__init__(*args, **kwargs)
         self.channel = None
+        self.channels = []
         self.exit_stack = contextlib.AsyncExitStack()
         self.path_to_id_mapping: Dict[str, int] = dict()
         self.id_to_path_mapping: Dict[int, str] = dict()
+        self.max_concurrent_metadata_requests = max_concurrent_metadata_requests
+        # Branch path -> leaf signal paths, valid for the current connection
+        self.branch_expansions: Dict[str, List[str]] = {}
 
     async def __aenter__(self):
         await self.connect()
@@ -69,29 +138,34 @@ class VSSClient(BaseVSSClient):
         await self.disconnect()
 
     async def connect(self, target_host=None):
-        self.path_to_id_mapping.clear()
-        self.id_to_path_mapping.clear()
+        self._clear_server_state()
 
         creds = self._load_creds()
         if target_host is None:
             target_host = self.target_host
 
+        options = self.channel_options.channel_args()
+        compression = self.channel_options.compression
+        if self.channel_pool_size > 1:
+            # Let every channel open its own connection instead of sharing one per target
+            options.append(("grpc.use_local_subchannel_pool", 1))
         if creds is not None:
             logger.info("Establishing secure channel")
             if self.tls_server_name:
                 logger.info(f"Using TLS server name {self.tls_server_name}")
-                options = [("grpc.ssl_target_name_override", self.tls_server_name)]
-                channel = grpc.aio.secure_channel(target_host, creds, options)
+                options.append(("grpc.ssl_target_name_override", self.tls_server_name))
             else:
                 logger.debug("Not providing explicit TLS server name")
-                channel = grpc.aio.secure_channel(target_host, creds)
+            create_channel = functools.partial(grpc.aio.secure_channel, target_host, creds, options, compression)
         else:
             logger.info("Establishing insecure channel")
-            channel = grpc.aio.insecure_channel(target_host)
+            create_channel = functools.partial(grpc.aio.insecure_channel, target_host, options, compression)
 
-        self.channel = await self.exit_stack.enter_async_context(channel)
-        self.client_stub_v1 = val_grpc_v1.VALStub(self.channel)
-        self.client_stub_v2 = val_grpc_v2.VALStub(self.channel)
+        self.channels = [
+            await self.exit_stack.enter_async_context(create_channel()) for _ in range(self.channel_pool_size)
+        ]
+        self.channel = self.channels[0]
+        self._create_stubs(self.channels)
         self.connected = True
         if self.ensure_startup_connection:
             logger.debug("Connected to server: %s", await self.get_server_info())
@@ -101,7 +175,71 @@ class VSSClient(BaseVSSClient):
         self.client_stub_v1 = None
         self.client_stub_v2 = None
         self.channel = None
+        self.channels = []
         self.connected = False
+        self.branch_expansions.clear()
+
+    def _clear_server_state(self):
+        self.path_to_id_mapping.clear()
+        self.id_to_path_mapping.clear()
+        self.data_type_cache.clear()
+        self.branch_expansions.clear()
+
+    async def resubscribe(
+        self,
+        subscribe: Callable[[], AsyncIterator[Any]],
+        paths: Collection[str],
+        policy: ReconnectPolicy,
+        error: Optional[VSSClientError] = None,
+        **rpc_kwargs,
+    ) -> AsyncIterator[Any]:
+        """
+        Yield from subscribe() and call it again whenever the stream fails with an error matching policy.
+        A SubscriptionGap is yielded before the first update of the new stream.
+        Parameters:
+            paths
+                Paths subscribed by subscribe(). Their ids are resolved again before each new stream,
+                because the databroker could have been restarted. The ids of other paths are kept,
+                provider sessions and updates received by id may still use them.
+            error
+                The stream is considered lost already, subscribe() is first called after a delay.
+            rpc_kwargs
+                grpc.*MultiCallable kwargs e.g. timeout, metadata, credentials.
+        """
+        attempts, lost_at, delays = 0, time.monotonic(), policy.delays()
+        while True:
+            if error is not None:
+                delay = next(delays, None)
+                if delay is None:
+                    raise error
+                attempts += 1
+                if attempts == 1:
+                    logger.warning("Subscription failed (%s), resubscribing", error.error)
+                logger.debug("Resubscribe attempt %d in %.3f s", attempts, delay)
+                await asyncio.sleep(delay)
+                await self._refresh_paths(paths, **rpc_kwargs)
+            try:
+                async for updates in subscribe():
+                    if error is not None:
+                        yield SubscriptionGap(error, attempts, time.monotonic() - lost_at)
+                        error = None
+                    yield updates
+                return
+            except VSSClientError as exc:
+                if not policy.should_reconnect(exc):
+                    raise
+                if error is None:
+                    error, attempts, lost_at, delays = exc, 0, time.monotonic(), policy.delays()
+
+    async def _refresh_paths(self, paths: Collection[str], **rpc_kwargs) -> None:
+        # Overwrite the ids in place, so the maps stay usable for everybody else meanwhile
+        for path in paths:
+            self.branch_expansions.pop(path[:-2] if path.endswith(".*") else path, None)
+        try:
+            await self._expand_v2_branch_paths(paths, **rpc_kwargs)
+        except VSSClientError as exc:
+            # Left to the subscribe attempt, e.g. a v1 databroker subscribes without ids
+            logger.debug("Could not resolve the ids of %s again: %s", sorted(paths), exc.error)
 
     def check_connected_async(func):
         """
@@ -141,10 +279,13 @@ class VSSClient(BaseVSSClient):
 
     @check_connected_async
     async def get_current_values(
-        self, paths: Iterable[str], **rpc_kwargs
-    ) -> Dict[str, Datapoint]:
+        self, paths: Iterable[str], output_mode: OutputMode = OutputMode.DATAPOINTS, **rpc_kwargs
+    ) -> Union[Dict[str, Datapoint], List[ValueTuple], val_v2.GetValuesResponse, val_v1.GetResponse]:
         """
         Parameters:
+            output_mode
+                OutputMode.DATAPOINTS (default) for Datapoint objects, OutputMode.TUPLES for
+                (path, value, timestamp_ns) tuples or OutputMode.RAW for the protobuf responses.
             rpc_kwargs
                 grpc.*MultiCallable kwargs e.g. timeout, metadata, credentials.
         Example:
@@ -153,7 +294,24 @@ class VSSClient(BaseVSSClient):
                 'Vehicle.ADAS.ABS.IsActive',
             ])
             speed_value = current_values['Vehicle.Speed'].value
+
+        Values are read via v2 GetValues if the server supports it, otherwise via v1 Get.
+        With OutputMode.RAW the response is either a v2 GetValuesResponse or a v1 GetResponse.
         """
+        paths = list(dict.fromkeys(paths))
+        if output_mode is not OutputMode.DATAPOINTS:
+            result = await self._v2_get_values_response(paths, **rpc_kwargs)
+            if result is None:
+                resp = await self._v1_get(
+                    (EntryRequest(path, View.CURRENT_VALUE, (Field.VALUE,)) for path in paths),
+                    **rpc_kwargs,
+                )
+                return resp if output_mode is OutputMode.RAW else self._v1_get_tuples(resp)
+            paths, resp = result
+            return resp if output_mode is OutputMode.RAW else self._v2_get_values_tuples(paths, resp)
+        values = await self._v2_get_values(paths, **rpc_kwargs)
+        if values is not None:
+            return values
         entries = await self.get(
             entries=(
                 EntryRequest(path, View.CURRENT_VALUE, (Field.VALUE,)) for path in paths
@@ -214,7 +372,10 @@ class VSSClient(BaseVSSClient):
             ),
             **rpc_kwargs,
         )
-        return {entry.path: entry.metadata for entry in entries}
+        metadata = {entry.path: entry.metadata for entry in entries}
+        if field in (MetadataField.ALL, MetadataField.DATA_TYPE):
+            self._update_data_type_cache(metadata)
+        return metadata
 
     @check_connected_async
     async def set_current_values(
@@ -291,10 +452,48 @@ class VSSClient(BaseVSSClient):
 
     @check_connected_async_iter
     async def subscribe_current_values(
-        self, paths: Iterable[str], **rpc_kwargs
-    ) -> AsyncIterator[Dict[str, Datapoint]]:
+        self,
+        paths: Iterable[str],
+        by_id: bool = False,
+        lazy: bool = False,
+        output_mode: OutputMode = OutputMode.DATAPOINTS,
+        buffer_size: int = 0,
+        max_rate_hz: Optional[PathSetting] = None,
+        deadband: Optional[PathSetting] = None,
+        reconnect: Optional[ReconnectPolicy] = None,
+        **rpc_kwargs,
+    ) -> AsyncIterator[
+        Union[
+            Mapping[str, Datapoint],
+            List[ValueTuple],
+            val_v2.SubscribeResponse,
+            val_v1.SubscribeResponse,
+            SubscriptionGap,
+        ]
+    ]:
         """
         Parameters:
+            by_id
+                Subscribe via v2 SubscribeById so that updates carry signal ids instead of paths.
+            lazy
+                Yield read-only mappings wrapping the v2 response which decode a datapoint only
+                when it is accessed. Saves work for consumers only reading some of the paths.
+            output_mode
+                OutputMode.DATAPOINTS (default) for Datapoint objects, OutputMode.TUPLES for
+                (path, value, timestamp_ns) tuples or OutputMode.RAW for the protobuf responses.
+            buffer_size
+                Number of updates the databroker buffers for this subscription before dropping the oldest
+                ones, 0 for its default of a single update (v2 only).
+            max_rate_hz, deadband
+                Pass on updates of a path at most max_rate_hz times per second and, for numeric values,
+                only if they differ by at least deadband from the last value passed on. The latest update
+                held back by the rate limit is passed on once the interval has expired. Either a value
+                for all paths or a mapping of paths or glob patterns to values. Updates left without
+                any path are not yielded. Not supported with OutputMode.RAW.
+            reconnect
+                Resubscribe with this backoff when the stream fails, e.g. because the databroker was
+                restarted. Then a SubscriptionGap is yielded, followed by one catch-up update with the
+                current values of all paths.
             rpc_kwargs
                 grpc.*MultiCallable kwargs e.g. timeout, metadata, credentials.
         Example:
@@ -310,14 +509,43 @@ class VSSClient(BaseVSSClient):
         with the resulting leaf signals. This restores the wildcard semantics
         that v1 provided natively.
         """
+        if reconnect is not None:
+            paths = list(paths)
+            async for updates in self.resubscribe(
+                lambda: self.subscribe_current_values(
+                    paths, by_id, lazy, output_mode, buffer_size, max_rate_hz, deadband, **rpc_kwargs
+                ),
+                paths,
+                reconnect,
+                **rpc_kwargs,
+            ):
+                yield updates
+            return
+        update_filter = _UpdateFilter.create(max_rate_hz, deadband)
+        if update_filter is not None:
+            if output_mode is OutputMode.RAW:
+                raise ValueError("max_rate_hz and deadband are not supported with OutputMode.RAW")
+            filter_updates = (
+                update_filter.filter_tuples if output_mode is OutputMode.TUPLES else update_filter.filter_datapoints
+            )
+            responses = self.subscribe_current_values(paths, by_id, lazy, output_mode, buffer_size, **rpc_kwargs)
+            if max_rate_hz is not None:
+                async for updates in _rate_limited_updates(responses, update_filter, filter_updates):
+                    yield updates
+                return
+            async for updates in responses:
+                updates = filter_updates(updates)
+                if updates:
+                    yield updates
+            return
         paths = list(paths)
         try:
             logger.debug("Try to subscribe current values via v2")
             try:
-                async for updates in self.v2_subscribe(paths=paths, **rpc_kwargs):
-                    yield {
-                        update.entry.path: update.entry.value for update in updates
-                    }
+                async for updates in self._v2_subscribe_current_values(
+                    paths, by_id, lazy, output_mode, buffer_size, **rpc_kwargs
+                ):
+                    yield updates
             except VSSClientError as exc:
                 if exc.error["code"] != grpc.StatusCode.NOT_FOUND.value[0]:
                     raise
@@ -325,30 +553,35 @@ class VSSClient(BaseVSSClient):
                     "v2 Subscribe returned NOT_FOUND; expanding branch paths via ListMetadata"
                 )
                 expanded = await self._expand_v2_branch_paths(paths, **rpc_kwargs)
-                async for updates in self.v2_subscribe(paths=expanded, **rpc_kwargs):
-                    yield {
-                        update.entry.path: update.entry.value for update in updates
-                    }
+                async for updates in self._v2_subscribe_current_values(
+                    expanded, by_id, lazy, output_mode, buffer_size, **rpc_kwargs
+                ):
+                    yield updates
         except VSSClientError as exc:
             if exc.error["code"] != grpc.StatusCode.UNIMPLEMENTED.value[0]:
                 raise
 
             logger.debug("v2 not available - falling back to v1 subscribe current values")
-            async for updates in self.subscribe(
-                entries=(
-                    SubscribeEntry(path, View.CURRENT_VALUE, (Field.VALUE,))
-                    for path in paths
-                ),
-                **rpc_kwargs,
-            ):
+            entries = (SubscribeEntry(path, View.CURRENT_VALUE, (Field.VALUE,)) for path in paths)
+            if output_mode is not OutputMode.DATAPOINTS:
+                async for resp in self._v1_subscribe_responses(entries, **rpc_kwargs):
+                    if output_mode is OutputMode.RAW:
+                        yield resp
+                    else:
+                        yield self._v1_subscribe_tuples(resp, Field.VALUE)
+                return
+            async for updates in self.subscribe(entries=entries, **rpc_kwargs):
                 yield {update.entry.path: update.entry.value for update in updates}
 
     @check_connected_async_iter
     async def subscribe_target_values(
-        self, paths: Iterable[str], **rpc_kwargs
-    ) -> AsyncIterator[Dict[str, Datapoint]]:
+        self, paths: Iterable[str], output_mode: OutputMode = OutputMode.DATAPOINTS, **rpc_kwargs
+    ) -> AsyncIterator[Union[Dict[str, Datapoint], List[ValueTuple], val_v2.OpenProviderStreamResponse]]:
         """
         Parameters:
+            output_mode
+                OutputMode.DATAPOINTS (default) for Datapoint objects, OutputMode.TUPLES for
+                (path, value, timestamp_ns) tuples or OutputMode.RAW for the protobuf responses.
             rpc_kwargs
                 grpc.*MultiCallable kwargs e.g. timeout, metadata, credentials.
         Example:
@@ -358,8 +591,13 @@ class VSSClient(BaseVSSClient):
                 for path, dp in updates.items():
                     print(f"Target value for {path} is now: {dp.value}")
         """
+        paths = list(paths)
         try:
             logger.debug("Try to subscribe actuation requests via v2")
+            if output_mode is not OutputMode.DATAPOINTS:
+                async for resp in self._v2_actuation_request_responses(paths, **rpc_kwargs):
+                    yield resp if output_mode is OutputMode.RAW else self._v2_actuation_tuples(resp)
+                return
             async for updates in self.v2_subscribe_actuation_requests(paths=paths, **rpc_kwargs):
                 yield {
                     update.entry.path: update.entry.actuator_target for update in updates
@@ -369,17 +607,84 @@ class VSSClient(BaseVSSClient):
                 raise
 
             logger.debug("v2 not available - falling back to v1 subscribe target values")
-            async for updates in self.subscribe(
-                entries=(
-                    SubscribeEntry(path, View.TARGET_VALUE, (Field.ACTUATOR_TARGET,))
-                    for path in paths
-                ),
-                **rpc_kwargs,
-            ):
+            entries = (SubscribeEntry(path, View.TARGET_VALUE, (Field.ACTUATOR_TARGET,)) for path in paths)
+            if output_mode is not OutputMode.DATAPOINTS:
+                async for resp in self._v1_subscribe_responses(entries, **rpc_kwargs):
+                    if output_mode is OutputMode.RAW:
+                        yield resp
+                    else:
+                        yield self._v1_subscribe_tuples(resp, Field.ACTUATOR_TARGET)
+                return
+            async for updates in self.subscribe(entries=entries, **rpc_kwargs):
                 yield {
                     update.entry.path: update.entry.actuator_target for update in updates
                 }
 
+    @check_connected_async
+    async def get_current_values_columnar(self, paths: Iterable[str], **rpc_kwargs) -> ColumnarBatch:
+        """
+        Return the current values of a fixed set of signals as a single-row ColumnarBatch.
+        Requires numpy.
+        Parameters:
+            rpc_kwargs
+                grpc.*MultiCallable kwargs e.g. timeout, metadata, credentials.
+        Example:
+            batch = await client.get_current_values_columnar(['Vehicle.Speed', 'Vehicle.ADAS.ABS.IsActive'])
+            speed = batch.column('Vehicle.Speed')[0]
+        """
+        batch = ColumnarBatch(await self._get_columnar_data_types(paths, **rpc_kwargs))
+        batch.append(await self.get_current_values(batch.paths, output_mode=OutputMode.RAW, **rpc_kwargs))
+        return batch
+
+    @check_connected_async_iter
+    async def subscribe_current_values_columnar(
+        self, paths: Iterable[str], window_size: int, reuse_batch: bool = False, **rpc_kwargs
+    ) -> AsyncIterator[ColumnarBatch]:
+        """
+        Accumulate current value updates of a fixed set of signals into ColumnarBatches of
+        window_size rows, one row per update. A batch is yielded once it is full
+        and, if the subscription ends, with the remaining rows.
+        Requires numpy.
+        Parameters:
+            window_size
+                Number of updates per yielded batch.
+            reuse_batch
+                Clear and refill the same batch instead of allocating a new one per window.
+                The consumer must be done with a batch before requesting the next one.
+            rpc_kwargs
+                grpc.*MultiCallable kwargs e.g. timeout, metadata, credentials.
+        Example:
+            async for batch in client.subscribe_current_values_columnar(['Vehicle.Speed'], window_size=100):
+                speeds = batch.column('Vehicle.Speed')[batch.mask('Vehicle.Speed')]
+        """
+        data_types = await self._get_columnar_data_types(paths, **rpc_kwargs)
+        batch = ColumnarBatch(data_types, window_size)
+        async for resp in self.subscribe_current_values(batch.paths, output_mode=OutputMode.RAW, **rpc_kwargs):
+            batch.append(resp)
+            if batch.full:
+                yield batch
+                if reuse_batch:
+                    batch.clear()
+                else:
+                    batch = ColumnarBatch(data_types, window_size)
+        if len(batch):
+            yield batch
+
+    async def _get_columnar_data_types(self, paths: Iterable[str], **rpc_kwargs) -> Dict[str, DataType]:
+        paths = list(dict.fromkeys(paths))
+        rpc_kwargs["metadata"] = self.generate_metadata_header(
+            rpc_kwargs.get("metadata")
+        )
+        data_types, missing = self.data_type_cache.lookup(paths)
+        if missing:
+            # Resolving ids via v2 ListMetadata fills the data type cache as well
+            await self.ensure_id_mapping(missing, **rpc_kwargs)
+            resolved, missing = self.data_type_cache.lookup(missing)
+            data_types.update(resolved)
+        if missing:
+            data_types.update(await self.get_value_types(missing, **rpc_kwargs))
+        return {path: data_types[path] for path in paths}
+
     @check_connected_async_iter
     async def subscribe_metadata(
         self,
@@ -406,7 +711,10 @@ class VSSClient(BaseVSSClient):
             ),
             **rpc_kwargs,
         ):
-            yield {update.entry.path: update.entry.metadata for update in updates}
+            metadata = {update.entry.path: update.entry.metadata for update in updates}
+            if field in (MetadataField.ALL, MetadataField.DATA_TYPE):
+                self._update_data_type_cache(metadata)
+            yield metadata
 
     @check_connected_async
     async def get(
@@ -417,15 +725,17 @@ class VSSClient(BaseVSSClient):
             rpc_kwargs
                 grpc.*MultiCallable kwargs e.g. timeout, metadata, credentials.
         """
+        return self._process_get_response(await self._v1_get(entries, **rpc_kwargs))
+
+    async def _v1_get(self, entries: Iterable[EntryRequest], **rpc_kwargs) -> val_v1.GetResponse:
         rpc_kwargs["metadata"] = self.generate_metadata_header(
             rpc_kwargs.get("metadata")
         )
         req = self._prepare_get_request(entries)
         try:
-            resp = await self.client_stub_v1.Get(req, **rpc_kwargs)
+            return await self.client_stub_v1.Get(req, **rpc_kwargs)
         except AioRpcError as exc:
             raise VSSClientError.from_grpc_error(exc) from exc
-        return self._process_get_response(resp)
 
     @check_connected_async
     async def set(
@@ -440,11 +750,14 @@ class VSSClient(BaseVSSClient):
             rpc_kwargs.get("metadata")
         )
         paths_with_required_type = self._get_paths_with_required_type(updates)
-        paths_without_type = [
-            path
-            for path, data_type in paths_with_required_type.items()
-            if data_type is DataType.UNSPECIFIED
-        ]
+        if try_v2 and len(updates) > 1:
+            for update in updates:
+                self._check_v2_fields(update)
+            # The data types of a batch are resolved with ListMetadata along with the ids, rather than with v1
+            await self.ensure_id_mapping(paths_with_required_type, **rpc_kwargs)
+        paths_without_type = self._apply_cached_value_types(
+            updates, paths_with_required_type
+        )
         paths_with_required_type.update(
             await self.get_value_types(paths_without_type, **rpc_kwargs)
         )
@@ -459,18 +772,26 @@ class VSSClient(BaseVSSClient):
                     },
                     errors=[],
                 )
-            for update in updates:
-                req = self._prepare_publish_value_request(
-                    update, paths_with_required_type
-                )
-                try:
-                    resp = await self.client_stub_v2.PublishValue(req, **rpc_kwargs)
-                except AioRpcError as exc:
-                    if exc.code() == grpc.StatusCode.UNIMPLEMENTED:
+            # Requests are pipelined over the channel rather than awaited one after another,
+            # only the last update of a path is published so that it wins
+            updates_by_path = {update.entry.path: update for update in updates}
+            reqs = [
+                self._prepare_publish_value_request(update, paths_with_required_type)
+                for update in updates_by_path.values()
+            ]
+            results = await asyncio.gather(
+                *(self.client_stub_v2.PublishValue(req, **rpc_kwargs) for req in reqs),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, AioRpcError):
+                    if result.code() == grpc.StatusCode.UNIMPLEMENTED:
                         logger.debug("v2 not available fall back to v1 instead")
-                        await self.set(updates)
-                    else:
-                        raise VSSClientError.from_grpc_error(exc) from exc
+                        await self.set(updates, **rpc_kwargs)
+                        return
+                    raise VSSClientError.from_grpc_error(result) from result
+                if isinstance(result, BaseException):
+                    raise result
         else:
             logger.debug("Trying v1")
             req = self._prepare_set_request(updates, paths_with_required_type)
@@ -480,6 +801,49 @@ class VSSClient(BaseVSSClient):
                 raise VSSClientError.from_grpc_error(exc) from exc
             self._process_set_response(resp)
 
+    async def _v2_get_values(
+        self, paths: List[str], **rpc_kwargs
+    ) -> Optional[Dict[str, Datapoint]]:
+        """
+        Read current values via v2 GetValues using resolved signal ids.
+        Returns None if the server does not support it, so that the caller can fall back to v1.
+        """
+        result = await self._v2_get_values_response(paths, **rpc_kwargs)
+        if result is None:
+            return None
+        return self._process_v2_get_values_response(*result)
+
+    async def _v2_get_values_response(
+        self, paths: List[str], **rpc_kwargs
+    ) -> Optional[Tuple[List[str], val_v2.GetValuesResponse]]:
+        """
+        Return the paths of the signals read along with the response, paths that are not signals
+        are expanded into the signals below them, so that branch paths return all their signals as with v1.
+        """
+        if not paths:
+            return paths, val_v2.GetValuesResponse()
+        rpc_kwargs["metadata"] = self.generate_metadata_header(
+            rpc_kwargs.get("metadata")
+        )
+        try:
+            await self.ensure_id_mapping(paths, **rpc_kwargs)
+        except VSSClientError as exc:
+            if exc.error.get("code") != grpc.StatusCode.NOT_FOUND.value[0]:
+                raise
+            paths = await self._expand_v2_branch_paths(paths, **rpc_kwargs)
+        req = self._prepare_v2_get_values_request(paths)
+        if req is None:
+            return None
+        try:
+            resp = await self.client_stub_v2.GetValues(req, **rpc_kwargs)
+        except AioRpcError as exc:
+            if exc.code() == grpc.StatusCode.UNIMPLEMENTED:
+                logger.debug("v2 not available - falling back to v1 get current values")
+                return None
+            raise VSSClientError.from_grpc_error(exc) from exc
+        logger.debug("%s: %s", type(resp).__name__, resp)
+        return paths, resp
+
     def get_path(self, signal_id: types_v2.SignalID) -> str:
         if signal_id.HasField("path"):
             return signal_id.path
@@ -497,6 +861,10 @@ class VSSClient(BaseVSSClient):
         (ListMetadata returns a single entry). Non-existent paths surface
         as NOT_FOUND. Trailing ``.*`` suffixes are stripped before lookup.
 
+        Lookups run concurrently, at most ``max_concurrent_metadata_requests``
+        at a time, and their results are memoized for the current connection.
+        The returned metadata also fills the signal id mapping.
+
         Order is preserved and duplicates (from overlapping branches) are
         removed. Used to restore v1-style wildcard semantics on top of the
         v2 Subscribe RPC, which only accepts fully-qualified leaf paths.
@@ -504,14 +872,21 @@ class VSSClient(BaseVSSClient):
         rpc_kwargs["metadata"] = self.generate_metadata_header(
             rpc_kwargs.get("metadata")
         )
-        expanded: List[str] = []
-        for path in paths:
-            lookup = path[:-2] if path.endswith(".*") else path
-            req = self._prepare_v2_list_metadata_request(lookup)
-            try:
-                resp = await self.client_stub_v2.ListMetadata(req, **rpc_kwargs)
-            except AioRpcError as exc:
-                raise VSSClientError.from_grpc_error(exc) from exc
+        paths = list(paths)
+        lookups = {
+            path: path[:-2] if path.endswith(".*") else path for path in paths
+        }
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrent_metadata_requests))
+
+        async def expand(path: str, lookup: str) -> None:
+            async with semaphore:
+                if lookup in self.branch_expansions:
+                    return
+                req = self._prepare_v2_list_metadata_request(lookup)
+                try:
+                    resp = await self.client_stub_v2.ListMetadata(req, **rpc_kwargs)
+                except AioRpcError as exc:
+                    raise VSSClientError.from_grpc_error(exc) from exc
             if not resp.metadata:
                 raise VSSClientError(
                     error={
@@ -521,36 +896,66 @@ class VSSClient(BaseVSSClient):
                     },
                     errors=[],
                 )
-            expanded.extend(m.path for m in resp.metadata)
+            self._update_id_mapping((), resp.metadata)
+            self.branch_expansions[lookup] = [m.path for m in resp.metadata]
+
+        pending = {
+            lookup: path for path, lookup in lookups.items() if lookup not in self.branch_expansions
+        }
+        tasks = [asyncio.create_task(expand(path, lookup)) for lookup, path in pending.items()]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # A failed lookup stops the others, so that none of them updates the mappings afterwards
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        expanded: List[str] = []
+        for lookup in lookups.values():
+            expanded.extend(self.branch_expansions[lookup])
         return list(dict.fromkeys(expanded))
 
     async def ensure_id_mapping(self, paths: Iterable[str], **rpc_kwargs):
-        for path in paths:
-            if path not in self.path_to_id_mapping:
-                # Prevent duplicate requests for the same path
-                self.path_to_id_mapping[path] = None
-                req = self._prepare_v2_list_metadata_request(path)
-                try:
-                    resp = await self.client_stub_v2.ListMetadata(req, **rpc_kwargs)
-                    logger.debug("%s: %s", type(resp).__name__, resp)
-                    if len(resp.metadata) == 1:
-                        self.path_to_id_mapping[path] = resp.metadata[0].id
-                        self.id_to_path_mapping[resp.metadata[0].id] = path
-                    else:
-                        del self.path_to_id_mapping[path]
-                        raise VSSClientError(
-                            error={
-                                "code": grpc.StatusCode.NOT_FOUND.value[0],
-                                "reason": grpc.StatusCode.NOT_FOUND.value[1],
-                                "message": f"Path {path} not found on server",
-                            },
-                            errors=[],
-                        )
-                except AioRpcError as exc:
-                    if exc.code() == grpc.StatusCode.UNIMPLEMENTED:
-                        logger.debug("v2 not available - skip querying ids")
-                        return
-                    raise VSSClientError.from_grpc_error(exc) from exc
+        """
+        Resolve the signal ids of all paths not resolved yet.
+        Paths are grouped by branch and the ListMetadata requests of all groups run concurrently,
+        at most ``max_concurrent_metadata_requests`` at a time.
+        """
+        missing_paths = [
+            path for path in dict.fromkeys(paths) if path not in self.path_to_id_mapping
+        ]
+        roots = self._group_paths_by_branch(missing_paths)
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrent_metadata_requests))
+
+        async def list_metadata(root: str) -> val_v2.ListMetadataResponse:
+            async with semaphore:
+                return await self.client_stub_v2.ListMetadata(
+                    self._prepare_v2_list_metadata_request(root), **rpc_kwargs
+                )
+
+        results = await asyncio.gather(
+            *(list_metadata(root) for root in roots),
+            return_exceptions=True,
+        )
+        not_found = []
+        for root_paths, result in zip(roots.values(), results):
+            if isinstance(result, AioRpcError):
+                if result.code() == grpc.StatusCode.UNIMPLEMENTED:
+                    logger.debug("v2 not available - skip querying ids")
+                    # Prevent further requests for these paths
+                    for path in missing_paths:
+                        self.path_to_id_mapping.setdefault(path, None)
+                    return
+                if result.code() == grpc.StatusCode.NOT_FOUND:
+                    not_found.extend(root_paths)
+                    continue
+                raise VSSClientError.from_grpc_error(result) from result
+            if isinstance(result, BaseException):
+                raise result
+            logger.debug("%s: %s", type(result).__name__, result)
+            not_found.extend(self._update_id_mapping(root_paths, result.metadata))
+        if not_found:
+            self._raise_paths_not_found(not_found)
 
     @check_connected_async_iter
     async def subscribe(
@@ -576,6 +981,12 @@ class VSSClient(BaseVSSClient):
                 errors=[],
             )
 
+        async for resp in self._v1_subscribe_responses(entries, **rpc_kwargs):
+            yield [EntryUpdate.from_message(update, self.timestamp_ns) for update in resp.updates]
+
+    async def _v1_subscribe_responses(
+        self, entries: Iterable[SubscribeEntry], **rpc_kwargs
+    ) -> AsyncIterator[val_v1.SubscribeResponse]:
         logger.debug("Try subscribing via v1")
         rpc_kwargs["metadata"] = self.generate_metadata_header(
             rpc_kwargs.get("metadata")
@@ -585,36 +996,119 @@ class VSSClient(BaseVSSClient):
         try:
             async for resp in resp_stream:
                 logger.debug("%s: %s", type(resp).__name__, resp)
-                yield [EntryUpdate.from_message(update) for update in resp.updates]
+                yield resp
         except AioRpcError as exc:
             raise VSSClientError.from_grpc_error(exc) from exc
 
     @check_connected_async_iter
     async def v2_subscribe(
-        self, paths: Iterable[str], **rpc_kwargs
+        self,
+        paths: Iterable[str],
+        by_id: bool = False,
+        lazy: bool = False,
+        buffer_size: int = 0,
+        **rpc_kwargs,
     ) -> AsyncIterator[List[EntryUpdate]]:
         """
         Parameters:
+            by_id
+                Subscribe via SubscribeById and map the signal ids of the updates back to paths.
+            lazy
+                Decode value and timestamp of a datapoint only when they are accessed.
+            buffer_size
+                Number of updates the databroker buffers for this subscription before dropping the oldest
+                ones, 0 for its default of a single update (v2 only).
+            rpc_kwargs
+                grpc.*MultiCallable kwargs e.g. timeout, metadata, credentials.
+        """
+
+        decode = self._v2_datapoint_decoder(lazy)
+        async for resp in self._v2_subscribe_responses(paths, by_id, buffer_size, **rpc_kwargs):
+            if by_id:
+                yield [
+                    EntryUpdate(
+                        DataEntry(self.id_to_path_mapping[signal_id], value=decode(dp)),
+                        [Field.VALUE],
+                    )
+                    for signal_id, dp in resp.entries.items()
+                ]
+            else:
+                yield [
+                    EntryUpdate(DataEntry(path, value=decode(dp)), [Field.VALUE])
+                    for path, dp in resp.entries.items()
+                ]
+
+    @check_connected_async_iter
+    async def v2_subscribe_by_id(
+        self, paths: Iterable[str], lazy: bool = False, buffer_size: int = 0, **rpc_kwargs
+    ) -> AsyncIterator[Mapping[int, Datapoint]]:
+        """
+        Subscribe to current values via v2 SubscribeById.
+        Updates are keyed by signal id, use id_to_path_mapping to look up their paths.
+        Parameters:
+            lazy
+                Yield read-only mappings decoding a datapoint only when it is accessed.
+            buffer_size
+                Number of updates the databroker buffers for this subscription before dropping the oldest
+                ones, 0 for its default of a single update (v2 only).
             rpc_kwargs
                 grpc.*MultiCallable kwargs e.g. timeout, metadata, credentials.
         """
 
-        logger.debug("Subscribe current values via v2")
+        decode = self._v2_datapoint_decoder(lazy=False)
+        async for resp in self._v2_subscribe_responses(paths, True, buffer_size, **rpc_kwargs):
+            if lazy:
+                yield LazyDatapoints(resp.entries, timestamp_ns=self.timestamp_ns)
+            else:
+                yield {signal_id: decode(dp) for signal_id, dp in resp.entries.items()}
+
+    async def _v2_subscribe_responses(
+        self, paths: Iterable[str], by_id: bool = False, buffer_size: int = 0, **rpc_kwargs
+    ) -> AsyncIterator[Union[val_v2.SubscribeResponse, val_v2.SubscribeByIdResponse]]:
         rpc_kwargs["metadata"] = self.generate_metadata_header(
             rpc_kwargs.get("metadata")
         )
-        req = self._prepare_v2_subscribe_request(paths)
-        resp_stream = self.client_stub_v2.Subscribe(req, **rpc_kwargs)
+        if by_id:
+            logger.debug("Subscribe current values by id via v2")
+            paths = list(paths)
+            await self.ensure_id_mapping(paths, **rpc_kwargs)
+            req = self._prepare_v2_subscribe_by_id_request(paths, buffer_size)
+            resp_stream = self.client_stub_v2.SubscribeById(req, **rpc_kwargs)
+        else:
+            logger.debug("Subscribe current values via v2")
+            req = self._prepare_v2_subscribe_request(paths, buffer_size)
+            resp_stream = self.client_stub_v2.Subscribe(req, **rpc_kwargs)
         try:
             async for resp in resp_stream:
                 logger.debug("%s: %s", type(resp).__name__, resp)
-                yield [
-                    EntryUpdate.from_tuple(path, dp)
-                    for path, dp in resp.entries.items()
-                ]
+                yield resp
         except AioRpcError as exc:
             raise VSSClientError.from_grpc_error(exc) from exc
 
+    async def _v2_subscribe_current_values(
+        self,
+        paths: Iterable[str],
+        by_id: bool,
+        lazy: bool,
+        output_mode: OutputMode,
+        buffer_size: int = 0,
+        **rpc_kwargs,
+    ) -> AsyncIterator[Union[Mapping[str, Datapoint], List[ValueTuple], val_v2.SubscribeResponse]]:
+        if output_mode is not OutputMode.DATAPOINTS:
+            async for resp in self._v2_subscribe_responses(paths, by_id, buffer_size, **rpc_kwargs):
+                yield resp if output_mode is OutputMode.RAW else self._v2_subscribe_tuples(resp, by_id)
+        elif lazy:
+            async for resp in self._v2_subscribe_responses(paths, by_id, buffer_size, **rpc_kwargs):
+                if by_id:
+                    yield LazyDatapoints(
+                        resp.entries, self.path_to_id_mapping, self.id_to_path_mapping, self.timestamp_ns
+                    )
+                else:
+                    yield LazyDatapoints(resp.entries, timestamp_ns=self.timestamp_ns)
+        else:
+            async for updates in self.v2_subscribe(paths=paths, by_id=by_id, buffer_size=buffer_size, **rpc_kwargs):
+                yield {update.entry.path: update.entry.value for update in updates}
+
     @check_connected_async_iter
     async def v2_subscribe_actuation_requests(
         self, paths: Iterable[str], **rpc_kwargs
@@ -625,10 +1119,20 @@ class VSSClient(BaseVSSClient):
                 grpc.*MultiCallable kwargs e.g. timeout, metadata, credentials.
         """
 
+        async for resp in self._v2_actuation_request_responses(paths, **rpc_kwargs):
+            yield [
+                EntryUpdate.from_actuate_value(self.get_path(actuate_req.signal_id), actuate_req.value)
+                for actuate_req in resp.batch_actuate_stream_request.actuate_requests
+            ]
+
+    async def _v2_actuation_request_responses(
+        self, paths: Iterable[str], **rpc_kwargs
+    ) -> AsyncIterator[val_v2.OpenProviderStreamResponse]:
         logger.debug("Subscribe actuation requests via v2")
         rpc_kwargs["metadata"] = self.generate_metadata_header(
             rpc_kwargs.get("metadata")
         )
+        paths = list(paths)
         await self.ensure_id_mapping(paths, **rpc_kwargs)
         req = self._prepare_v2_provide_actuation_request(paths)
         resp_stream = self.client_stub_v2.OpenProviderStream(iter(req), **rpc_kwargs)
@@ -636,10 +1140,7 @@ class VSSClient(BaseVSSClient):
             async for resp in resp_stream:
                 logger.debug("batch %s: %s", type(resp).__name__, resp)
                 if resp.HasField("batch_actuate_stream_request"):
-                    yield [
-                        EntryUpdate.from_actuate_value(self.get_path(actuate_req.signal_id), actuate_req.value)
-                        for actuate_req in resp.batch_actuate_stream_request.actuate_requests
-                    ]
+                    yield resp
         except AioRpcError as exc:
             raise VSSClientError.from_grpc_error(exc) from exc
 
@@ -707,31 +1208,398 @@ class VSSClient(BaseVSSClient):
                 for path in paths
             )
             entries = await self.get(entries=entry_requests, **rpc_kwargs)
-            return {entry.path: DataType(entry.metadata.data_type) for entry in entries}
+            data_types = {entry.path: DataType(entry.metadata.data_type) for entry in entries}
+            self.data_type_cache.update(data_types)
+            return data_types
         return {}
 
+    @check_connected_async
+    async def load_data_types(
+        self, roots: Iterable[str] = ("Vehicle",), **rpc_kwargs
+    ) -> int:
+        """
+        Fill the data type cache in bulk, so that subsequent set calls for any signal
+        below the given roots do not need to query the data type.
+        Returns the number of cached signals.
+        Parameters:
+            rpc_kwargs
+                grpc.*MultiCallable kwargs e.g. timeout, metadata, credentials.
+        Example:
+            await client.load_data_types(['Vehicle.Cabin'])
+        """
+        rpc_kwargs["metadata"] = self.generate_metadata_header(
+            rpc_kwargs.get("metadata")
+        )
+        roots = list(roots)
+        for root in roots:
+            req = self._prepare_v2_list_metadata_request(root)
+            try:
+                resp = await self.client_stub_v2.ListMetadata(req, **rpc_kwargs)
+            except AioRpcError as exc:
+                if exc.code() == grpc.StatusCode.UNIMPLEMENTED:
+                    logger.debug("v2 not available - falling back to v1 to query data types")
+                    await self.get_value_types(roots, **rpc_kwargs)
+                    break
+                raise VSSClientError.from_grpc_error(exc) from exc
+            logger.debug("%s: %s", type(resp).__name__, resp)
+            self.data_type_cache.update(
+                {metadata.path: DataType(metadata.data_type) for metadata in resp.metadata}
+            )
+        return len(self.data_type_cache)
+
+
+def _timed_call(callback: Callable[[Iterable[EntryUpdate]], None], updates: List[EntryUpdate]) -> float:
+    # Module level function so that process pools can pickle it
+    start = time.perf_counter()
+    callback(updates)
+    return time.perf_counter() - start
+
+
+class CallbackDispatcher:
+    """
+    Runs subscription callbacks off the event loop thread while keeping the order of the updates per path.
+    Updates are hash-partitioned by path onto `workers` partitions, each running one callback call at a time:
+    plain callbacks in a thread pool or, with use_processes, in a process pool (callbacks and updates must
+    be picklable then), coroutine callbacks on the event loop. At most `workers` callbacks thus run
+    concurrently. Partitions hold up to max_pending batches before dispatch() waits.
+    The updates of a batch spanning several partitions are passed to the callback in one call per partition.
+    Example:
+        dispatcher = CallbackDispatcher(workers=4)
+        manager = SubscriberManager(client, dispatcher=dispatcher)
+        ...
+        await dispatcher.close()
+    """
+
+    def __init__(self, workers: int = 4, use_processes: bool = False, max_pending: int = 100):
+        self.workers = workers
+        self.use_processes = use_processes
+        self.max_pending = max_pending
+        self._executor: Optional[concurrent.futures.Executor] = None
+        self._queues: List[asyncio.Queue] = []
+        self._tasks: List[asyncio.Task] = []
+        self._stats = [WorkerStats() for _ in range(workers)]
+        self._started_at = 0.0
+        self._partitions: Dict[str, int] = {}
+
+    async def dispatch(
+        self, callback: Callable[[Iterable[EntryUpdate]], None], updates: List[EntryUpdate]
+    ) -> None:
+        if not self._tasks:
+            self._start()
+        batches: Dict[int, List[EntryUpdate]] = {}
+        for update in updates:
+            batches.setdefault(self._partition(update.entry.path), []).append(update)
+        for index, batch in batches.items():
+            self._stats[index].pending += 1
+            await self._queues[index].put((callback, batch))
+
+    def stats(self) -> List[WorkerStats]:
+        """
+        Return a snapshot of the statistics of each worker.
+        """
+        elapsed = time.monotonic() - self._started_at if self._tasks else 0.0
+        return [
+            dataclasses.replace(stats, utilization=stats.busy_time / elapsed if elapsed else 0.0)
+            for stats in self._stats
+        ]
+
+    async def close(self) -> None:
+        """
+        Stop the workers, discarding pending updates.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = None
+        self._queues = []
+        self._tasks = []
+
+    def _start(self) -> None:
+        if self.use_processes:
+            self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="kuksa-callback",
+            )
+        self._queues = [asyncio.Queue(self.max_pending) for _ in range(self.workers)]
+        self._tasks = [asyncio.create_task(self._worker(index)) for index in range(self.workers)]
+        self._started_at = time.monotonic()
+
+    def _partition(self, path: str) -> int:
+        try:
+            return self._partitions[path]
+        except KeyError:
+            index = self._partitions[path] = hash(path) % self.workers
+            return index
+
+    async def _worker(self, index: int) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._queues[index]
+        stats = self._stats[index]
+        while True:
+            callback, updates = await queue.get()
+            try:
+                if asyncio.iscoroutinefunction(callback):
+                    start = time.perf_counter()
+                    await callback(updates)
+                    stats.busy_time += time.perf_counter() - start
+                else:
+                    stats.busy_time += await loop.run_in_executor(self._executor, _timed_call, callback, updates)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Subscription callback failed")
+            finally:
+                stats.calls += 1
+                stats.pending -= 1
+
+
+class _SubscriberQueue:
+    """
+    Bounded queue of updates between the subscription stream and the dispatch task of a subscriber.
+    """
+
+    def __init__(self, maxsize: int, policy: QueuePolicy, update_filter: Optional[_UpdateFilter] = None):
+        self.maxsize = maxsize
+        self.policy = policy
+        self.update_filter = update_filter
+        self.stats = SubscriberStats()
+        self.task: Optional[asyncio.Task] = None
+        # (monotonic time of queueing, updates)
+        self._batches: Deque[Tuple[float, List[EntryUpdate]]] = collections.deque()
+        # Latest update per path and queueing time of the oldest of them for QueuePolicy.CONFLATE
+        self._latest: Dict[str, EntryUpdate] = {}
+        self._latest_since = 0.0
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self._closed = False
+
+    async def put(self, updates: List[EntryUpdate]) -> None:
+        if self.update_filter is not None:
+            updates = self.update_filter.filter_entry_updates(updates)
+            self.stats.filtered = self.update_filter.held_back
+            if not updates:
+                # Let get() wait for held back updates to become due
+                self._not_empty.set()
+                return
+        if self.policy is QueuePolicy.CONFLATE:
+            if not self._latest:
+                self._latest_since = time.monotonic()
+            for update in updates:
+                if update.entry.path in self._latest:
+                    self.stats.dropped += 1
+                self._latest[update.entry.path] = update
+        else:
+            if len(self._batches) >= self.maxsize:
+                if self.policy is QueuePolicy.DROP_OLDEST:
+                    _, dropped = self._batches.popleft()
+                    self.stats.dropped += len(dropped)
+                else:
+                    while len(self._batches) >= self.maxsize and not self._closed:
+                        self._not_full.clear()
+                        await self._not_full.wait()
+            if self._closed:
+                return
+            self._batches.append((time.monotonic(), updates))
+        self._update_depth()
+        self._not_empty.set()
+
+    async def get(self) -> Tuple[float, List[EntryUpdate]]:
+        while not self._batches and not self._latest:
+            self._not_empty.clear()
+            due_in = None if self.update_filter is None else self.update_filter.due_in()
+            try:
+                await asyncio.wait_for(self._not_empty.wait(), due_in)
+            except asyncio.TimeoutError:
+                # Nothing is queued, so the held back updates which are due are passed on right away
+                updates = self.update_filter.filter_entry_updates([])
+                if updates:
+                    return time.monotonic(), updates
+        if self._latest:
+            item = (self._latest_since, list(self._latest.values()))
+            self._latest = {}
+        else:
+            item = self._batches.popleft()
+            self._not_full.set()
+        self._update_depth()
+        return item
+
+    def close(self) -> None:
+        """
+        Discard updates put from now on and release producers waiting for space.
+        """
+        self._closed = True
+        self._not_full.set()
+
+    def _update_depth(self) -> None:
+        depth = len(self._batches) + len(self._latest)
+        self.stats.queue_depth = depth
+        self.stats.max_queue_depth = max(self.stats.max_queue_depth, depth)
+
+
+class _SharedStream:
+    """
+    Current value subscription shared by all subscribers of its paths.
+    Paths are reference counted, a path with count 0 is no longer passed to any subscriber.
+    """
+
+    def __init__(self, paths: Collection[str], buffer_size: int, rpc_kwargs: Dict[str, Any]):
+        self.paths = frozenset(paths)
+        self.buffer_size = buffer_size
+        self.rpc_kwargs = rpc_kwargs
+        self.refcounts: Dict[str, int] = {}
+        self.subscribers: Dict[uuid.UUID, Set[str]] = {}
+        self.task: Optional[asyncio.Task] = None
+        # Subscribers interested in an updated path, filled on first update of that path
+        self._targets: Dict[str, Tuple[uuid.UUID, ...]] = {}
+
+    def attach(self, subscription_id: uuid.UUID, path: str) -> None:
+        self.refcounts[path] = self.refcounts.get(path, 0) + 1
+        self.subscribers.setdefault(subscription_id, set()).add(path)
+        self._targets.clear()
+
+    def detach(self, subscription_id: uuid.UUID) -> List[str]:
+        """
+        Detach the subscriber and return the paths no longer referenced by any subscriber.
+        """
+        unreferenced = []
+        for path in self.subscribers.pop(subscription_id, ()):
+            self.refcounts[path] -= 1
+            if self.refcounts[path] == 0:
+                del self.refcounts[path]
+                unreferenced.append(path)
+        self._targets.clear()
+        return unreferenced
+
+    def targets(self, path: str) -> Tuple[uuid.UUID, ...]:
+        try:
+            return self._targets[path]
+        except KeyError:
+            # v1 delivers updates of branch subscriptions with the paths of their leaves
+            targets = tuple(
+                subscription_id
+                for subscription_id, paths in self.subscribers.items()
+                if any(path == sub_path or path.startswith(sub_path + ".") for sub_path in paths)
+            )
+            self._targets[path] = targets
+            return targets
+
 
 class SubscriberManager:
-    def __init__(self, client: VSSClient):
+    """
+    Runs subscription callbacks as tasks.
+    add_subscriber consumes a dedicated response stream per subscriber. add_shared_subscriber
+    multiplexes current value subscriptions instead: every path is covered by one shared stream,
+    updates are decoded once and passed to all subscribers of their paths. Subscribing to new paths
+    opens a stream for those paths only, a stream left with unreferenced paths is replaced by one for
+    the remaining paths and a stream without any referenced path is closed.
+
+    Updates are passed to the callback of a subscriber by its own dispatch task through a queue of
+    queue_size batches of updates. When the queue is full queue_policy decides whether the stream
+    waits for the callback (QueuePolicy.BLOCK, for shared streams this holds back all their
+    subscribers), the oldest batch is dropped (QueuePolicy.DROP_OLDEST) or, regardless of queue_size,
+    only the latest update per path is kept (QueuePolicy.CONFLATE). Updates exceeding the max_rate_hz
+    of a subscriber are held back and updates within its deadband dropped before they are queued, see
+    VSSClient.subscribe_current_values. stats() reports queue depth, drops and dispatch lag of a subscriber.
+
+    Callbacks run on the event loop, coroutine callbacks are awaited. With a CallbackDispatcher they
+    run on its workers instead, so CPU-heavy callbacks do not hold up the other subscriptions.
+
+    With a ReconnectPolicy a failed shared stream is resubscribed and its subscribers receive one
+    catch-up update with the current values of their paths, counted as resyncs in their stats().
+    """
+
+    def __init__(
+        self,
+        client: VSSClient,
+        queue_size: int = 100,
+        queue_policy: QueuePolicy = QueuePolicy.BLOCK,
+        dispatcher: Optional[CallbackDispatcher] = None,
+        reconnect: Optional[ReconnectPolicy] = None,
+    ):
         self.client = client
+        self.queue_size = queue_size
+        self.queue_policy = queue_policy
+        self.dispatcher = dispatcher
+        self.reconnect = reconnect
         self.subscribers = {}
+        self.shared_subscribers: Dict[uuid.UUID, Set[_SharedStream]] = {}
+        self._queues: Dict[uuid.UUID, _SubscriberQueue] = {}
+        self._path_streams: Dict[str, _SharedStream] = {}
+        self._shared_lock = asyncio.Lock()
 
     async def add_subscriber(
         self,
         subscribe_response_stream: AsyncIterator[List[EntryUpdate]],
         callback: Callable[[Iterable[EntryUpdate]], None],
+        queue_size: Optional[int] = None,
+        queue_policy: Optional[QueuePolicy] = None,
+        max_rate_hz: Optional[PathSetting] = None,
+        deadband: Optional[PathSetting] = None,
     ) -> uuid.UUID:
+        """
+        Parameters:
+            queue_size, queue_policy
+                Override the defaults of the manager for this subscriber.
+            max_rate_hz, deadband
+                Rate limit and deadband of the current values passed to the callback.
+        """
         # We expect the first SubscribeResponse to be immediately available and to only hold a status
         await subscribe_response_stream.__aiter__().__anext__()  # pylint: disable=unnecessary-dunder-call
 
         sub_id = uuid.uuid4()
+        queue = self._start_dispatch(sub_id, callback, queue_size, queue_policy, max_rate_hz, deadband)
         new_sub_task = asyncio.create_task(
-            self._subscriber_loop(subscribe_response_stream, callback)
+            self._subscriber_loop(subscribe_response_stream, queue)
         )
         self.subscribers[sub_id] = new_sub_task
         return sub_id
 
+    async def add_shared_subscriber(
+        self,
+        paths: Iterable[str],
+        callback: Callable[[Iterable[EntryUpdate]], None],
+        queue_size: Optional[int] = None,
+        queue_policy: Optional[QueuePolicy] = None,
+        max_rate_hz: Optional[PathSetting] = None,
+        deadband: Optional[PathSetting] = None,
+        buffer_size: int = 0,
+        **rpc_kwargs,
+    ) -> uuid.UUID:
+        """
+        Subscribe callback to the current values of paths over the shared streams.
+        Like with add_subscriber the initial response of a stream is not passed to the callback.
+        Parameters:
+            queue_size, queue_policy
+                Override the defaults of the manager for this subscriber.
+            max_rate_hz, deadband
+                Rate limit and deadband of the current values passed to the callback.
+            buffer_size, rpc_kwargs
+                v2 Subscribe buffer_size and grpc.*MultiCallable kwargs e.g. timeout, metadata, credentials.
+                Used for the streams opened for paths not subscribed yet.
+        """
+        paths = list(dict.fromkeys(paths))
+        async with self._shared_lock:
+            new_paths = [path for path in paths if path not in self._path_streams]
+            if new_paths:
+                await self._open_shared_stream(new_paths, buffer_size, rpc_kwargs)
+
+            sub_id = uuid.uuid4()
+            self._start_dispatch(sub_id, callback, queue_size, queue_policy, max_rate_hz, deadband)
+            streams = set()
+            for path in paths:
+                stream = self._path_streams[path]
+                stream.attach(sub_id, path)
+                streams.add(stream)
+            self.shared_subscribers[sub_id] = streams
+        return sub_id
+
     async def remove_subscriber(self, subscription_id: uuid.UUID):
+        if subscription_id in self.shared_subscribers:
+            await self._remove_shared_subscriber(subscription_id)
+            await self._stop_dispatch(subscription_id)
+            return
         try:
             subscriber_task = self.subscribers.pop(subscription_id)
         except KeyError as exc:
@@ -743,11 +1611,283 @@ class SubscriberManager:
             await subscriber_task
         except asyncio.CancelledError:
             pass
+        await self._stop_dispatch(subscription_id)
+
+    def stats(self, subscription_id: uuid.UUID) -> SubscriberStats:
+        """
+        Return a snapshot of the queue statistics of the subscriber.
+        """
+        try:
+            queue = self._queues[subscription_id]
+        except KeyError as exc:
+            raise ValueError(
+                f"Could not find subscription {str(subscription_id)}"
+            ) from exc
+        return dataclasses.replace(queue.stats)
 
     async def _subscriber_loop(
         self,
         subscribe_response_stream: AsyncIterator[List[EntryUpdate]],
-        callback: Callable[[Iterable[EntryUpdate]], None],
+        queue: _SubscriberQueue,
     ):
         async for updates in subscribe_response_stream:
-            callback(updates)
+            await queue.put(updates)
+
+    def _start_dispatch(
+        self,
+        subscription_id: uuid.UUID,
+        callback: Callable[[Iterable[EntryUpdate]], None],
+        queue_size: Optional[int],
+        queue_policy: Optional[QueuePolicy],
+        max_rate_hz: Optional[PathSetting],
+        deadband: Optional[PathSetting],
+    ) -> _SubscriberQueue:
+        queue = _SubscriberQueue(
+            self.queue_size if queue_size is None else queue_size,
+            self.queue_policy if queue_policy is None else queue_policy,
+            _UpdateFilter.create(max_rate_hz, deadband),
+        )
+        queue.task = asyncio.create_task(self._dispatch_loop(subscription_id, queue, callback))
+        self._queues[subscription_id] = queue
+        return queue
+
+    async def _stop_dispatch(self, subscription_id: uuid.UUID) -> None:
+        queue = self._queues.pop(subscription_id)
+        queue.close()
+        queue.task.cancel()
+        try:
+            await queue.task
+        except asyncio.CancelledError:
+            pass
+
+    async def _dispatch_loop(
+        self,
+        subscription_id: uuid.UUID,
+        queue: _SubscriberQueue,
+        callback: Callable[[Iterable[EntryUpdate]], None],
+    ):
+        stats = queue.stats
+        is_coroutine = asyncio.iscoroutinefunction(callback)
+        while True:
+            queued_at, updates = await queue.get()
+            stats.dispatch_lag = time.monotonic() - queued_at
+            stats.max_dispatch_lag = max(stats.max_dispatch_lag, stats.dispatch_lag)
+            try:
+                if self.dispatcher is not None:
+                    await self.dispatcher.dispatch(callback, updates)
+                elif is_coroutine:
+                    await callback(updates)
+                else:
+                    callback(updates)
+            except Exception:  # pylint: disable=broad-except
+                # A failing callback must not end the subscription
+                logger.exception("Callback of subscription %s failed", subscription_id)
+            stats.dispatched += 1
+
+    async def _remove_shared_subscriber(self, subscription_id: uuid.UUID):
+        async with self._shared_lock:
+            streams = self.shared_subscribers.pop(subscription_id)
+            # Detach from all streams before awaiting anything, so no update is dispatched to it anymore
+            for stream in streams:
+                for path in stream.detach(subscription_id):
+                    if self._path_streams.get(path) is stream:
+                        del self._path_streams[path]
+            for stream in streams:
+                if stream.refcounts:
+                    if len(stream.refcounts) < len(stream.paths) and not stream.task.done():
+                        await self._replace_shared_stream(stream)
+                else:
+                    await self._close_shared_stream(stream)
+
+    async def _open_shared_stream(
+        self, paths: List[str], buffer_size: int, rpc_kwargs: Dict[str, Any]
+    ) -> _SharedStream:
+        responses = self._shared_stream_responses(paths, buffer_size, dict(rpc_kwargs)).__aiter__()
+        # As in add_subscriber the first response only acknowledges the subscription
+        try:
+            await responses.__anext__()  # pylint: disable=unnecessary-dunder-call
+        except StopAsyncIteration:
+            pass
+        stream = _SharedStream(paths, buffer_size, rpc_kwargs)
+        stream.task = asyncio.create_task(self._shared_stream_loop(stream, responses))
+        for path in paths:
+            self._path_streams[path] = stream
+        return stream
+
+    async def _replace_shared_stream(self, stream: _SharedStream) -> None:
+        """
+        Subscribe the paths still referenced by stream on a new stream and close stream.
+        The new stream is opened before the old one is closed, so no update is lost in between.
+        """
+        new_stream = await self._open_shared_stream(
+            list(stream.refcounts), stream.buffer_size, stream.rpc_kwargs
+        )
+        for sub_id, paths in stream.subscribers.items():
+            for path in paths:
+                new_stream.attach(sub_id, path)
+            sub_streams = self.shared_subscribers[sub_id]
+            sub_streams.discard(stream)
+            sub_streams.add(new_stream)
+        await self._close_shared_stream(stream)
+
+    @staticmethod
+    async def _close_shared_stream(stream: _SharedStream) -> None:
+        stream.task.cancel()
+        try:
+            await stream.task
+        except asyncio.CancelledError:
+            pass
+
+    async def _shared_stream_responses(
+        self, paths: List[str], buffer_size: int, rpc_kwargs: Dict[str, Any]
+    ) -> AsyncIterator[List[EntryUpdate]]:
+        # subscribe_current_values expands branch paths and falls back to v1 like for any other subscription
+        async for updates in self.client.subscribe_current_values(paths, buffer_size=buffer_size, **rpc_kwargs):
+            yield [EntryUpdate(DataEntry(path, value=dp), [Field.VALUE]) for path, dp in updates.items()]
+
+    async def _shared_stream_loop(
+        self, stream: _SharedStream, responses: AsyncIterator[List[EntryUpdate]]
+    ):
+        try:
+            try:
+                async for updates in responses:
+                    await self._dispatch_shared_updates(stream, updates)
+            except VSSClientError as exc:
+                if self.reconnect is None or not self.reconnect.should_reconnect(exc):
+                    raise
+                await responses.aclose()
+                responses = self.client.resubscribe(
+                    lambda: self._shared_stream_responses(
+                        list(stream.paths), stream.buffer_size, dict(stream.rpc_kwargs)
+                    ),
+                    stream.paths,
+                    self.reconnect,
+                    exc,
+                    **stream.rpc_kwargs,
+                )
+                async for updates in responses:
+                    if isinstance(updates, SubscriptionGap):
+                        logger.info(
+                            "Resubscribed shared subscription for %s after %.3f s",
+                            sorted(stream.paths), updates.duration,
+                        )
+                        for sub_id in stream.subscribers:
+                            self._queues[sub_id].stats.resyncs += 1
+                    else:
+                        await self._dispatch_shared_updates(stream, updates)
+        except VSSClientError as exc:
+            logger.error("Shared subscription for %s failed: %s", sorted(stream.paths), exc.error)
+        finally:
+            await responses.aclose()
+            # Let later subscribers to these paths open a new stream
+            for path in stream.paths:
+                if self._path_streams.get(path) is stream:
+                    del self._path_streams[path]
+
+    async def _dispatch_shared_updates(self, stream: _SharedStream, updates: List[EntryUpdate]) -> None:
+        updates_by_subscriber: Dict[uuid.UUID, List[EntryUpdate]] = {}
+        for update in updates:
+            for sub_id in stream.targets(update.entry.path):
+                updates_by_subscriber.setdefault(sub_id, []).append(update)
+        # Look up all queues before waiting for any of them, subscribers may be removed meanwhile
+        queued = [(self._queues[sub_id], sub_updates) for sub_id, sub_updates in updates_by_subscriber.items()]
+        for queue, sub_updates in queued:
+            await queue.put(sub_updates)
+
+
+class ProviderSession(BaseProviderSession):
+    """
+    Long-lived OpenProviderStream for publishing values of many signals at a high rate.
+    Signal ids and data types are resolved once when the session is opened and values are then
+    published by numeric signal id as PublishValuesRequests on the same stream, instead of one RPC
+    per value. The signals are claimed for this provider when the session is opened. Failing requests
+    are reported through error_callback with their request_id while the stream stays open. Actuators
+    given as actuator_paths are claimed as well and their actuation requests are passed to
+    actuation_callback.
+    Example:
+        async with ProviderSession(client, ['Vehicle.Speed']) as session:
+            speed_id = session.signal_id('Vehicle.Speed')
+            async for speed in speeds:
+                await session.publish({speed_id: Datapoint(speed)})
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._call = None
+        self._reader: Optional[asyncio.Task] = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def open(self) -> None:
+        rpc_kwargs = dict(self.rpc_kwargs)
+        rpc_kwargs["metadata"] = self.client.generate_metadata_header(
+            rpc_kwargs.get("metadata")
+        )
+        paths = self._all_paths()
+        await self.client.ensure_id_mapping(paths, **rpc_kwargs)
+        data_types, paths_without_type = self.client.data_type_cache.lookup(paths)
+        data_types.update(await self.client.get_value_types(paths_without_type, **rpc_kwargs))
+        self._set_data_types(data_types)
+
+        self.error = None
+        self._call = self.client.client_stub_v2.OpenProviderStream(**rpc_kwargs)
+        for req in self._prepare_provide_requests():
+            await self._write(req)
+        self._reader = asyncio.create_task(self._read_responses())
+
+    async def publish(self, values: Dict[int, Datapoint]) -> int:
+        """
+        Publish the values and return the request_id used for them.
+        """
+        if self._call is None:
+            raise VSSClientError(
+                error={
+                    "code": grpc.StatusCode.FAILED_PRECONDITION.value[0],
+                    "reason": grpc.StatusCode.FAILED_PRECONDITION.value[1],
+                    "message": "Provider session not open! Call open() before publishing!",
+                },
+                errors=[],
+            )
+        request_id, req = self._prepare_publish_values_request(values)
+        await self._write(req)
+        return request_id
+
+    async def close(self, timeout: Optional[float] = 5.0) -> None:
+        if self._call is None:
+            return
+        # Ending the request stream lets the server finish the stream once pending requests are processed
+        with contextlib.suppress(AioRpcError):
+            await self._call.done_writing()
+        await asyncio.wait((self._reader,), timeout=timeout)
+        if not self._reader.done():
+            self._call.cancel()
+            self._reader.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reader
+        self._call = None
+        self._reader = None
+
+    async def _write(self, req) -> None:
+        try:
+            await self._call.write(req)
+        except AioRpcError as exc:
+            raise VSSClientError.from_grpc_error(exc) from exc
+
+    async def _read_responses(self) -> None:
+        try:
+            while True:
+                resp = await self._call.read()
+                if resp is grpc.aio.EOF:
+                    break
+                self._process_response(resp)
+        except AioRpcError as exc:
+            if exc.code() != grpc.StatusCode.CANCELLED:
+                logger.error("Provider stream failed: %s", exc.details())
+                self.error = VSSClientError.from_grpc_error(exc)
+        except Exception as exc:  # pylint: disable=broad-except
+            self._stream_failed(exc)
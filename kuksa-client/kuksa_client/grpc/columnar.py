@@ -0,0 +1,191 @@
+########################################################################
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+########################################################################
+
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Mapping
+from typing import Tuple
+from typing import Union
+
+from kuksa.val.v1 import types_pb2 as types_v1
+from kuksa.val.v1 import val_pb2 as val_v1
+from kuksa.val.v2 import types_pb2 as types_v2
+from kuksa.val.v2 import val_pb2 as val_v2
+
+from . import DataType
+from . import _V2_VALUE_ACCESSORS
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Fixed-width numpy dtypes per DataType; all other types (strings, arrays) are stored in object columns.
+_NUMPY_DTYPES = {
+    DataType.BOOLEAN: "bool",
+    DataType.INT8: "int8",
+    DataType.INT16: "int16",
+    DataType.INT32: "int32",
+    DataType.INT64: "int64",
+    DataType.UINT8: "uint8",
+    DataType.UINT16: "uint16",
+    DataType.UINT32: "uint32",
+    DataType.UINT64: "uint64",
+    DataType.FLOAT: "float32",
+    DataType.DOUBLE: "float64",
+    DataType.TIMESTAMP: "int64",
+}
+
+ColumnarResponse = Union[
+    val_v1.GetResponse, val_v1.SubscribeResponse, val_v2.GetValuesResponse, val_v2.SubscribeResponse,
+]
+
+
+def _v1_value(message: types_v1.Datapoint) -> Any:
+    field = message.WhichOneof("value")
+    if field is None:
+        return None
+    value = getattr(message, field)
+    return list(value.values) if field.endswith("_array") else value
+
+
+def _v2_value(message: types_v2.Datapoint) -> Any:
+    field = message.value.WhichOneof("typed_value")
+    if field is None:
+        return None
+    value = _V2_VALUE_ACCESSORS[field](message.value)
+    return list(value.values) if field.endswith("_array") else value
+
+
+class ColumnarBatch:
+    """
+    Values of a fixed set of signals stored column-wise in preallocated numpy arrays.
+
+    Each row holds the datapoints of one response, e.g. one snapshot or one subscription update.
+    Values are grouped per DataType in 2-dimensional arrays (rows x signals of that type);
+    strings and arrays are kept in object arrays. Timestamps are int64 nanoseconds since the epoch
+    and `valid` marks which signals had a value in a row. Requires numpy (`kuksa-client[numpy]`).
+
+    Example:
+        batch = ColumnarBatch({'Vehicle.Speed': DataType.FLOAT}, capacity=100)
+        batch.append(response)
+        speeds = batch.column('Vehicle.Speed')[batch.mask('Vehicle.Speed')]
+    """
+
+    def __init__(self, data_types: Mapping[str, DataType], capacity: int = 1):
+        if np is None:
+            raise ImportError("ColumnarBatch requires numpy, install it with 'pip install kuksa-client[numpy]'")
+        if capacity < 1:
+            raise ValueError(f"Capacity must be at least 1, got {capacity}")
+        self.data_types: Dict[str, DataType] = {path: DataType(data_type) for path, data_type in data_types.items()}
+        self.paths: Tuple[str, ...] = tuple(self.data_types)
+        self.capacity = capacity
+        self.size = 0
+        self.timestamps = np.zeros((capacity, len(self.paths)), dtype=np.int64)
+        self.valid = np.zeros((capacity, len(self.paths)), dtype=bool)
+        self.values: Dict[DataType, "np.ndarray"] = {}
+        # path -> (index in timestamps/valid, values array of the path's data type, index in that array)
+        self._columns: Dict[str, Tuple[int, "np.ndarray", int]] = {}
+        paths_by_type: Dict[DataType, List[str]] = {}
+        for path, data_type in self.data_types.items():
+            paths_by_type.setdefault(data_type, []).append(path)
+        for data_type, typed_paths in paths_by_type.items():
+            dtype = _NUMPY_DTYPES.get(data_type)
+            if dtype is None:
+                values = np.full((capacity, len(typed_paths)), None, dtype=object)
+            else:
+                values = np.zeros((capacity, len(typed_paths)), dtype=dtype)
+            self.values[data_type] = values
+            for type_index, path in enumerate(typed_paths):
+                self._columns[path] = (self.paths.index(path), values, type_index)
+
+    @property
+    def full(self) -> bool:
+        return self.size == self.capacity
+
+    def __len__(self) -> int:
+        return self.size
+
+    def column(self, path: str) -> "np.ndarray":
+        """
+        Return the values of the given path in the filled rows; rows without a value hold zero/None.
+        """
+        _, values, type_index = self._columns[path]
+        return values[:self.size, type_index]
+
+    def mask(self, path: str) -> "np.ndarray":
+        """
+        Return whether the given path had a value in each of the filled rows.
+        """
+        return self.valid[:self.size, self._columns[path][0]]
+
+    def timestamps_of(self, path: str) -> "np.ndarray":
+        """
+        Return the timestamps (ns since epoch, 0 if unset) of the given path in the filled rows.
+        """
+        return self.timestamps[:self.size, self._columns[path][0]]
+
+    def clear(self) -> None:
+        """
+        Reset the batch so that its arrays can be filled again.
+        """
+        self.size = 0
+        self.valid[:] = False
+        self.timestamps[:] = 0
+        for values in self.values.values():
+            values[:] = None if values.dtype == object else 0
+
+    def append(self, response: ColumnarResponse) -> None:
+        """
+        Fill the next row from a v1 GetResponse/SubscribeResponse or a v2 GetValuesResponse/SubscribeResponse.
+        v2 GetValuesResponse datapoints are expected in the order of `paths`.
+        Signals not part of the batch are ignored.
+        """
+        if self.full:
+            raise IndexError(f"Batch is full ({self.capacity} rows)")
+        if isinstance(response, val_v2.SubscribeResponse):
+            self._fill_row(response.entries.items(), _v2_value)
+        elif isinstance(response, val_v2.GetValuesResponse):
+            self._fill_row(zip(self.paths, response.data_points), _v2_value)
+        elif isinstance(response, val_v1.SubscribeResponse):
+            self._fill_row(((update.entry.path, update.entry.value) for update in response.updates), _v1_value)
+        elif isinstance(response, val_v1.GetResponse):
+            self._fill_row(((entry.path, entry.value) for entry in response.entries), _v1_value)
+        else:
+            raise TypeError(f"Unsupported response type {type(response).__name__}")
+        self.size += 1
+
+    def _fill_row(self, datapoints: Iterable[Tuple[str, Any]], decode) -> None:
+        row = self.size
+        columns = self._columns
+        valid = self.valid
+        timestamps = self.timestamps
+        for path, datapoint in datapoints:
+            column = columns.get(path)
+            if column is None:
+                continue
+            value = decode(datapoint)
+            if value is None:
+                continue
+            index, values, type_index = column
+            values[row, type_index] = value
+            valid[row, index] = True
+            timestamp = datapoint.timestamp
+            timestamps[row, index] = timestamp.seconds * 1_000_000_000 + timestamp.nanos
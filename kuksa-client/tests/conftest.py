@@ -48,9 +48,11 @@ def val_servicer_v1_fixture(mocker):
 def val_servicer_v2_fixture(mocker):
     servicer_v2 = val_v2.VALServicer()
     mocker.patch.object(servicer_v2, "ListMetadata", spec=True)
+    mocker.patch.object(servicer_v2, "GetValues", spec=True)
     mocker.patch.object(servicer_v2, "OpenProviderStream", spec=True)
     mocker.patch.object(servicer_v2, "PublishValue", spec=True)
     mocker.patch.object(servicer_v2, "Subscribe", spec=True)
+    mocker.patch.object(servicer_v2, "SubscribeById", spec=True)
 
     return servicer_v2
 
@@ -0,0 +1,98 @@
+# /********************************************************************************
+# * Copyright (c) 2025 Contributors to the Eclipse Foundation
+# *
+# * See the NOTICE file(s) distributed with this work for additional
+# * information regarding copyright ownership.
+# *
+# * This program and the accompanying materials are made available under the
+# * terms of the Apache License 2.0 which is available at
+# * http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************/
+
+import asyncio
+import functools
+import json
+
+import pytest
+
+from kuksa_client.cli_backend import grpc as grpc_backend
+from kuksa_client.grpc import Datapoint
+from kuksa_client.grpc import DataEntry
+
+
+@pytest.mark.asyncio
+class TestGrpcBackend:
+    """
+    The handler runs on the event loop of the test while requests are sent from worker threads,
+    like from the threads of a KuksaClientThread application.
+    """
+
+    async def test_request_dispatch(self, mocker):
+        backend = grpc_backend.Backend({'protocol': 'grpc', 'insecure': True})
+        vss_client = mocker.AsyncMock()
+        vss_client.get.return_value = [DataEntry('Vehicle.Speed', value=Datapoint(42.0))]
+        get_nowait = mocker.spy(backend.sendMsgQueue, 'get_nowait')
+        handler = asyncio.create_task(backend._grpcHandler(vss_client))
+        while backend.loop is None:
+            await asyncio.sleep(0.001)
+        call_soon_threadsafe = mocker.spy(backend.loop, 'call_soon_threadsafe')
+
+        def get_values():
+            return [backend.getValue('Vehicle.Speed') for _ in range(50)]
+
+        responses = await asyncio.get_running_loop().run_in_executor(None, get_values)
+        assert all(json.loads(resp)['path'] == 'Vehicle.Speed' for resp in responses)
+        assert vss_client.get.call_count == 50
+        # Every request wakes the handler by setting its event instead of being picked up by polling,
+        # the handler checks the queue once for the request and at most once more before waiting again
+        wakeups = [call for call in call_soon_threadsafe.call_args_list if call.args == (backend.request_event.set,)]
+        assert len(wakeups) == 50
+        assert get_nowait.call_count <= 2 * 50 + 1
+
+        # An idle handler waits for the event and does not check the queue again
+        idle_calls = get_nowait.call_count
+        await asyncio.sleep(0.1)
+        assert get_nowait.call_count == idle_calls
+
+        backend.run = False
+        backend._wakeup()
+        await asyncio.wait_for(handler, 1)
+        assert backend.loop is None
+
+    async def test_concurrent_requests(self, mocker):
+        backend = grpc_backend.Backend({'protocol': 'grpc', 'insecure': True, 'max_concurrent_requests': 2})
+        vss_client = mocker.AsyncMock()
+        slow_get_cancelled = asyncio.Event()
+
+        async def get(entries):
+            if entries[0].path == 'Vehicle.Slow':
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    slow_get_cancelled.set()
+                    raise
+            return [DataEntry(entries[0].path, value=Datapoint(1.0))]
+
+        vss_client.get.side_effect = get
+        handler = asyncio.create_task(backend._grpcHandler(vss_client))
+        while backend.loop is None:
+            await asyncio.sleep(0.001)
+
+        loop = asyncio.get_running_loop()
+        slow = loop.run_in_executor(None, functools.partial(backend.getValue, 'Vehicle.Slow', timeout=0.5))
+        while vss_client.get.call_count < 1:
+            await asyncio.sleep(0.001)
+        resp = await loop.run_in_executor(None, backend.getValue, 'Vehicle.Speed')
+        # The slow request does not hold up the others
+        assert json.loads(resp)['path'] == 'Vehicle.Speed'
+        assert not slow.done()
+
+        assert json.loads(await slow) == {'error': 'Timeout'}
+        # The timeout is enforced on the client thread as well, the slow request is not left running
+        await asyncio.wait_for(slow_get_cancelled.wait(), 1)
+
+        backend.run = False
+        backend._wakeup()
+        await asyncio.wait_for(handler, 1)
@@ -0,0 +1,126 @@
+# /********************************************************************************
+# * Copyright (c) 2025 Contributors to the Eclipse Foundation
+# *
+# * See the NOTICE file(s) distributed with this work for additional
+# * information regarding copyright ownership.
+# *
+# * This program and the accompanying materials are made available under the
+# * terms of the Apache License 2.0 which is available at
+# * http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************/
+
+import pytest
+from google.protobuf import timestamp_pb2
+
+from kuksa.val.v1 import types_pb2 as types_v1
+from kuksa.val.v1 import val_pb2 as val_v1
+from kuksa.val.v2 import types_pb2 as types_v2
+from kuksa.val.v2 import val_pb2 as val_v2
+from kuksa_client.grpc import DataType
+from kuksa_client.grpc.columnar import ColumnarBatch
+
+numpy = pytest.importorskip("numpy")
+
+DATA_TYPES = {
+    "Vehicle.Speed": DataType.FLOAT,
+    "Vehicle.ADAS.ABS.IsActive": DataType.BOOLEAN,
+    "Vehicle.Chassis.SteeringWheel.Angle": DataType.INT16,
+    "Vehicle.Cabin.Sunroof.Position.Name": DataType.STRING,
+    "Vehicle.OBD.DTCList": DataType.STRING_ARRAY,
+}
+
+
+def test_layout():
+    batch = ColumnarBatch(DATA_TYPES, capacity=4)
+    assert batch.paths == tuple(DATA_TYPES)
+    assert batch.timestamps.shape == (4, 5)
+    assert batch.timestamps.dtype == numpy.int64
+    assert batch.valid.shape == (4, 5)
+    assert batch.values[DataType.FLOAT].dtype == numpy.float32
+    assert batch.values[DataType.BOOLEAN].dtype == numpy.bool_
+    assert batch.values[DataType.INT16].dtype == numpy.int16
+    assert batch.values[DataType.STRING].dtype == object
+    assert batch.values[DataType.STRING_ARRAY].dtype == object
+    assert len(batch) == 0
+    assert not batch.full
+
+
+def test_invalid_capacity():
+    with pytest.raises(ValueError):
+        ColumnarBatch(DATA_TYPES, capacity=0)
+
+
+def test_append_v2_subscribe_responses():
+    batch = ColumnarBatch(DATA_TYPES, capacity=2)
+    batch.append(val_v2.SubscribeResponse(entries={
+        "Vehicle.Speed": types_v2.Datapoint(
+            timestamp=timestamp_pb2.Timestamp(seconds=1667837915, nanos=247307674),
+            value=types_v2.Value(float=42.5),
+        ),
+        "Vehicle.OBD.DTCList": types_v2.Datapoint(
+            value=types_v2.Value(string_array=types_v2.StringArray(values=["P0001", "P0002"])),
+        ),
+        "Vehicle.Unknown": types_v2.Datapoint(value=types_v2.Value(float=1.0)),
+    }))
+    batch.append(val_v2.SubscribeResponse(entries={
+        "Vehicle.ADAS.ABS.IsActive": types_v2.Datapoint(value=types_v2.Value(bool=True)),
+        "Vehicle.Chassis.SteeringWheel.Angle": types_v2.Datapoint(value=types_v2.Value(int32=-90)),
+        "Vehicle.Speed": types_v2.Datapoint(),
+    }))
+
+    assert batch.full
+    assert batch.column("Vehicle.Speed").tolist() == [42.5, 0.0]
+    assert batch.mask("Vehicle.Speed").tolist() == [True, False]
+    assert batch.timestamps_of("Vehicle.Speed").tolist() == [1667837915247307674, 0]
+    assert batch.column("Vehicle.ADAS.ABS.IsActive").tolist() == [False, True]
+    assert batch.mask("Vehicle.ADAS.ABS.IsActive").tolist() == [False, True]
+    assert batch.column("Vehicle.Chassis.SteeringWheel.Angle").tolist() == [0, -90]
+    assert batch.column("Vehicle.OBD.DTCList")[0] == ["P0001", "P0002"]
+    assert not batch.mask("Vehicle.Cabin.Sunroof.Position.Name").any()
+
+    with pytest.raises(IndexError):
+        batch.append(val_v2.SubscribeResponse())
+
+    batch.clear()
+    assert len(batch) == 0
+    assert not batch.valid.any()
+    assert batch.values[DataType.STRING_ARRAY][0, 0] is None
+
+
+def test_append_v2_get_values_response():
+    batch = ColumnarBatch({"Vehicle.Speed": DataType.FLOAT, "Vehicle.ADAS.ABS.IsActive": DataType.BOOLEAN})
+    batch.append(val_v2.GetValuesResponse(data_points=[
+        types_v2.Datapoint(value=types_v2.Value(float=42.0)),
+        types_v2.Datapoint(value=types_v2.Value(bool=True)),
+    ]))
+    assert batch.column("Vehicle.Speed").tolist() == [42.0]
+    assert batch.column("Vehicle.ADAS.ABS.IsActive").tolist() == [True]
+
+
+def test_append_v1_responses():
+    batch = ColumnarBatch({"Vehicle.Speed": DataType.FLOAT, "Vehicle.OBD.DTCList": DataType.STRING_ARRAY}, 2)
+    batch.append(val_v1.GetResponse(entries=[
+        types_v1.DataEntry(path="Vehicle.Speed", value=types_v1.Datapoint(
+            timestamp=timestamp_pb2.Timestamp(seconds=1, nanos=2), float=42.0,
+        )),
+        types_v1.DataEntry(path="Vehicle.OBD.DTCList", value=types_v1.Datapoint(
+            string_array=types_v1.StringArray(values=["P0001"]),
+        )),
+    ]))
+    batch.append(val_v1.SubscribeResponse(updates=[
+        val_v1.EntryUpdate(entry=types_v1.DataEntry(
+            path="Vehicle.Speed", value=types_v1.Datapoint(float=43.0),
+        ), fields=[types_v1.FIELD_VALUE]),
+    ]))
+    assert batch.column("Vehicle.Speed").tolist() == [42.0, 43.0]
+    assert batch.timestamps_of("Vehicle.Speed").tolist() == [1_000_000_002, 0]
+    assert batch.column("Vehicle.OBD.DTCList").tolist() == [["P0001"], None]
+    assert batch.mask("Vehicle.OBD.DTCList").tolist() == [True, False]
+
+
+def test_append_unsupported_response():
+    batch = ColumnarBatch(DATA_TYPES)
+    with pytest.raises(TypeError):
+        batch.append(val_v2.SubscribeByIdResponse())
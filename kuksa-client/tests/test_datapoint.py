@@ -11,9 +11,14 @@
 # * SPDX-License-Identifier: Apache-2.0
 # ********************************************************************************/
 
+import array
+import datetime
+
 import pytest
 from kuksa_client.grpc import Datapoint
+from kuksa_client.grpc import DataType
 from kuksa.val.v1 import types_pb2
+from kuksa.val.v2 import types_pb2 as types_v2
 from google.protobuf import timestamp_pb2
 
 #
@@ -224,3 +229,70 @@ def test_from_message_time():
     # But the from_message method handle the checks
     datapoint = Datapoint.from_message(msg)
     assert datapoint is None
+
+
+@pytest.mark.parametrize("value", [
+    [1.5, 2.0, -3.25],
+    (1.5, 2.0, -3.25),
+    array.array("d", [1.5, 2.0, -3.25]),
+    memoryview(array.array("d", [1.5, 2.0, -3.25])),
+])
+def test_to_message_native_array(value):
+    """
+    Native sequences and buffers are written to the repeated field without string parsing
+    """
+    assert Datapoint(value).v1_to_message(DataType.DOUBLE_ARRAY) == types_pb2.Datapoint(
+        double_array=types_pb2.DoubleArray(values=[1.5, 2.0, -3.25]),
+    )
+    assert Datapoint(value).v2_to_message(DataType.DOUBLE_ARRAY) == types_v2.Datapoint(
+        value=types_v2.Value(double_array=types_v2.DoubleArray(values=[1.5, 2.0, -3.25])),
+    )
+
+
+def test_to_message_numpy_array():
+    numpy = pytest.importorskip("numpy")
+    datapoint = Datapoint(numpy.array([1, 2, 3], dtype=numpy.uint16))
+    assert datapoint.v2_to_message(DataType.UINT16_ARRAY) == types_v2.Datapoint(
+        value=types_v2.Value(uint32_array=types_v2.Uint32Array(values=[1, 2, 3])),
+    )
+    datapoint = Datapoint(numpy.array([True, False]))
+    assert datapoint.v1_to_message(DataType.BOOLEAN_ARRAY) == types_pb2.Datapoint(
+        bool_array=types_pb2.BoolArray(values=[True, False]),
+    )
+
+
+def test_to_message_string_array():
+    """
+    Strings are still parsed the same way as on the command line, lists of strings are used as is
+    """
+    assert Datapoint('["a", b]').v1_to_message(DataType.STRING_ARRAY) == types_pb2.Datapoint(
+        string_array=types_pb2.StringArray(values=["a", "b"]),
+    )
+    assert Datapoint(['"a"', "b"]).v1_to_message(DataType.STRING_ARRAY) == types_pb2.Datapoint(
+        string_array=types_pb2.StringArray(values=['"a"', "b"]),
+    )
+    assert Datapoint([]).v1_to_message(DataType.STRING_ARRAY).HasField("string_array")
+
+
+def test_timestamp_ns():
+    """
+    Integer nanosecond timestamps are decoded and encoded without datetime conversions
+    """
+    timestamp = timestamp_pb2.Timestamp(seconds=1667837915, nanos=247307674)
+    datapoint = Datapoint.from_v2_message(
+        types_v2.Datapoint(value=types_v2.Value(float=42.0), timestamp=timestamp), timestamp_ns=True,
+    )
+    assert datapoint == Datapoint(42.0, 1667837915247307674)
+    assert Datapoint.from_message(types_pb2.Datapoint(float=42.0, timestamp=timestamp), timestamp_ns=True) == datapoint
+    assert Datapoint.from_message(types_pb2.Datapoint(float=42.0), timestamp_ns=True) == Datapoint(42.0)
+
+    assert datapoint.v1_to_message(DataType.FLOAT).timestamp == timestamp
+    assert datapoint.v2_to_message(DataType.FLOAT).timestamp == timestamp
+
+    as_datetime = datapoint.timestamp_as_datetime()
+    assert as_datetime == timestamp.ToDatetime(tzinfo=datetime.timezone.utc)
+    assert Datapoint(42.0, as_datetime).timestamp_as_ns() == 1667837915247307000
+    assert Datapoint(42.0, as_datetime.replace(tzinfo=None)).timestamp_as_ns() == 1667837915247307000
+    assert datapoint.timestamp_as_ns() == 1667837915247307674
+    assert Datapoint(42.0).timestamp_as_datetime() is None
+    assert datapoint.to_dict() == {"value": 42.0, "timestamp": as_datetime.isoformat()}
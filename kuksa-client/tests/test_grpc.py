@@ -18,6 +18,9 @@
 
 import asyncio
 import datetime
+import pickle
+import queue
+import threading
 import uuid
 
 from google.protobuf import json_format
@@ -39,6 +42,7 @@ from kuksa.val.v2 import val_pb2 as val_v2
 # from kuksa.val.v2 import val_pb2_grpc as val_grpc_v2
 
 import kuksa_client.grpc
+from kuksa_client.grpc import ChannelOptions
 from kuksa_client.grpc import Datapoint
 from kuksa_client.grpc import DataEntry
 from kuksa_client.grpc import DataType
@@ -46,14 +50,21 @@ from kuksa_client.grpc import EntryRequest
 from kuksa_client.grpc import EntryType
 from kuksa_client.grpc import EntryUpdate
 from kuksa_client.grpc import Field
+from kuksa_client.grpc import LazyDatapoints
 from kuksa_client.grpc import Metadata
 from kuksa_client.grpc import MetadataField
+from kuksa_client.grpc import OutputMode
+from kuksa_client.grpc import QueuePolicy
+from kuksa_client.grpc import ReconnectPolicy
 from kuksa_client.grpc import ServerInfo
 from kuksa_client.grpc import SubscribeEntry
+from kuksa_client.grpc import SubscriptionGap
 from kuksa_client.grpc import ValueRestriction
 from kuksa_client.grpc import View
 from kuksa_client.grpc import VSSClientError
+from kuksa_client.grpc.aio import CallbackDispatcher
 from kuksa_client.grpc.aio import VSSClient
+from kuksa_client.grpc.aio import ProviderSession
 from kuksa_client.grpc.aio import SubscriberManager
 
 
@@ -64,6 +75,72 @@ def generate_error(code: grpc.StatusCode, details: str):
     return set_error_context
 
 
+class ProviderStreamCall:
+    """
+    Stand-in for the grpc.aio stream-stream call returned by OpenProviderStream.
+    """
+
+    def __init__(self, *responses: val_v2.OpenProviderStreamResponse):
+        self.requests = []
+        self.responses = asyncio.Queue()
+        for response in responses:
+            self.responses.put_nowait(response)
+        self.cancelled = False
+
+    async def write(self, request):
+        self.requests.append(request)
+
+    async def read(self):
+        return await self.responses.get()
+
+    async def done_writing(self):
+        await self.responses.put(grpc.aio.EOF)
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class SyncProviderStreamCall:
+    """
+    Stand-in for the stream-stream call returned by OpenProviderStream of the sync stub.
+    Exceptions put into responses are raised while iterating over it.
+    """
+
+    def __init__(self, *responses: val_v2.OpenProviderStreamResponse):
+        self.requests = []
+        self.responses = queue.Queue()
+        for response in responses:
+            self.responses.put(response)
+        self.cancelled = False
+
+    def open(self, request_iterator, **kwargs):
+        def write():
+            self.requests.extend(request_iterator)
+            self.responses.put(None)
+
+        threading.Thread(target=write, daemon=True).start()
+        return self
+
+    def __iter__(self):
+        for response in iter(self.responses.get, None):
+            if isinstance(response, Exception):
+                raise response
+            yield response
+
+    def cancel(self):
+        self.cancelled = True
+        self.responses.put(None)
+
+
+def list_metadata_side_effect(*metadata: types_v2.Metadata):
+    def list_metadata(request, _context):
+        root = request.root[:-2] if request.root.endswith(".*") else request.root
+        return val_v2.ListMetadataResponse(metadata=[
+            md for md in metadata if md.path == root or md.path.startswith(root + ".")
+        ])
+    return list_metadata
+
+
 class TestVSSClientError:
     def test_from_grpc_error(self):
         grpc_error = grpc.aio.AioRpcError(
@@ -448,6 +525,18 @@ class TestDatapoint:
         assert Datapoint(**init_kwargs).to_dict() == datapoint_dict
 
 
+@pytest.mark.parametrize('instance', [
+    Datapoint(42.0),
+    DataEntry('Vehicle.Speed', value=Datapoint(42.0)),
+    EntryUpdate(DataEntry('Vehicle.Speed'), (Field.VALUE,)),
+    Metadata(data_type=DataType.FLOAT, value_restriction=ValueRestriction(min=0.0)),
+    ValueRestriction(min=0.0),
+])
+def test_data_classes_are_slotted(instance):
+    assert not hasattr(instance, '__dict__')
+    assert pickle.loads(pickle.dumps(instance)) == instance
+
+
 class TestDataEntry:
     @pytest.mark.parametrize('value, actuator_target, metadata, entry_dict', [
         (None, None, None, {}),
@@ -473,6 +562,30 @@ class TestEntryUpdate:
     def test_to_dict(self, entry, fields, update_dict):
         assert EntryUpdate(entry, fields).to_dict() == update_dict
 
+    @pytest.mark.parametrize('defer_timestamp', [False, True])
+    def test_from_tuple(self, defer_timestamp):
+        update = EntryUpdate.from_tuple('Vehicle.Speed', types_v2.Datapoint(
+            timestamp=timestamp_pb2.Timestamp(seconds=1667837915, nanos=247307674),
+            value=types_v2.Value(float=42.0),
+        ), defer_timestamp=defer_timestamp)
+        assert update == EntryUpdate(DataEntry('Vehicle.Speed', value=Datapoint(
+            42.0, datetime.datetime(2022, 11, 7, 16, 18, 35, 247307, tzinfo=datetime.timezone.utc),
+        )), [Field.VALUE])
+        assert update.entry.value.timestamp == datetime.datetime(
+            2022, 11, 7, 16, 18, 35, 247307, tzinfo=datetime.timezone.utc,
+        )
+        assert update.to_dict()['entry']['value']['timestamp'] == '2022-11-07T16:18:35.247307+00:00'
+
+        update = EntryUpdate.from_tuple('Vehicle.Speed', types_v2.Datapoint(), defer_timestamp=defer_timestamp)
+        assert update == EntryUpdate(DataEntry('Vehicle.Speed', value=Datapoint()), [Field.VALUE])
+
+    def test_from_actuate_value(self):
+        assert EntryUpdate.from_actuate_value(
+            'Vehicle.ADAS.ABS.IsActive', types_v2.Value(bool=False),
+        ) == EntryUpdate(DataEntry('Vehicle.ADAS.ABS.IsActive', actuator_target=Datapoint(False)), [
+            Field.ACTUATOR_TARGET,
+        ])
+
 
 @pytest.mark.asyncio
 class TestVSSClient:
@@ -490,10 +603,78 @@ class TestVSSClient:
                              ):
             assert val_servicer_v1.GetServerInfo.call_count == 1
 
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_channel_options(self, mocker, unused_tcp_port, val_servicer_v1):
+        val_servicer_v1.GetServerInfo.return_value = val_v1.GetServerInfoResponse(
+            name="test_server", version="1.2.3"
+        )
+        insecure_channel = mocker.spy(grpc.aio, 'insecure_channel')
+        channel_options = ChannelOptions(
+            compression=grpc.Compression.Gzip,
+            max_receive_message_length=-1,
+            keepalive_time_ms=10000,
+            keepalive_permit_without_calls=True,
+            http2_bdp_probe=False,
+            extra=(("grpc.http2.max_frame_size", 65536),),
+        )
+        async with VSSClient(
+            '127.0.0.1', unused_tcp_port, ensure_startup_connection=False, channel_options=channel_options,
+        ) as client:
+            assert await client.get_server_info() == ServerInfo(name="test_server", version="1.2.3")
+            assert await client.get_server_info(compression=grpc.Compression.NoCompression) == ServerInfo(
+                name="test_server", version="1.2.3",
+            )
+
+        insecure_channel.assert_called_once_with(
+            f'127.0.0.1:{unused_tcp_port}',
+            [
+                ("grpc.max_receive_message_length", -1),
+                ("grpc.keepalive_time_ms", 10000),
+                ("grpc.keepalive_permit_without_calls", 1),
+                ("grpc.http2.bdp_probe", 0),
+                ("grpc.http2.max_frame_size", 65536),
+            ],
+            grpc.Compression.Gzip,
+        )
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_channel_pool(self, mocker, unused_tcp_port, val_servicer_v1, val_servicer_v2):
+        val_servicer_v1.GetServerInfo.return_value = val_v1.GetServerInfoResponse(
+            name="test_server", version="1.2.3"
+        )
+        done = threading.Event()
+
+        def subscribe(request, _context):
+            yield val_v2.SubscribeResponse(entries={path: types_v2.Datapoint() for path in request.signal_paths})
+            done.wait(5)
+
+        val_servicer_v2.Subscribe.side_effect = subscribe
+        async with VSSClient(
+            '127.0.0.1', unused_tcp_port, ensure_startup_connection=False, channel_pool_size=3,
+        ) as client:
+            assert len(client.channels) == 3
+            assert client.channel is client.channels[0]
+            stubs = client.client_stub_v1.stubs
+            for stub in stubs:
+                mocker.spy(stub, 'GetServerInfo')
+            for _ in range(6):
+                assert await client.get_server_info() == ServerInfo(name="test_server", version="1.2.3")
+            assert [stub.GetServerInfo.call_count for stub in stubs] == [2, 2, 2]
+
+            try:
+                updates = client.v2_subscribe(['Vehicle.Speed']).__aiter__()
+                await updates.__anext__()
+                assert val_servicer_v2.Subscribe.call_count == 1
+            finally:
+                done.set()
+            await updates.aclose()
+
     async def test_get_current_values(self, mocker, unused_tcp_port):
         client = VSSClient('127.0.0.1', unused_tcp_port)
         client.connected = True  # To bypass connection test
 
+        # v2 not available
+        mocker.patch.object(client, '_v2_get_values', return_value=None)
         mocker.patch.object(client, 'get', return_value=[
             DataEntry('Vehicle.Speed', value=Datapoint(
                 42.0, datetime.datetime(
@@ -520,6 +701,151 @@ class TestVSSClient:
                          View.CURRENT_VALUE, (Field.VALUE,)),
         ]
 
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_get_current_values_v2(self, unused_tcp_port, val_servicer_v1, val_servicer_v2):
+        val_servicer_v2.ListMetadata.side_effect = list_metadata_side_effect(
+            types_v2.Metadata(path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT),
+            types_v2.Metadata(path="Vehicle.ADAS.ABS.IsActive", id=2, data_type=types_v2.DATA_TYPE_BOOLEAN),
+            types_v2.Metadata(path="Vehicle.Chassis.Height", id=3, data_type=types_v2.DATA_TYPE_UINT16),
+        )
+        val_servicer_v2.GetValues.return_value = val_v2.GetValuesResponse(data_points=[
+            types_v2.Datapoint(
+                timestamp=timestamp_pb2.Timestamp(seconds=1667837915, nanos=247307674),
+                value=types_v2.Value(float=42.0),
+            ),
+            types_v2.Datapoint(value=types_v2.Value(bool=True)),
+            types_v2.Datapoint(),
+        ])
+        async with VSSClient('127.0.0.1', unused_tcp_port, ensure_startup_connection=False) as client:
+            assert await client.get_current_values([
+                'Vehicle.Speed', 'Vehicle.ADAS.ABS.IsActive', 'Vehicle.Chassis.Height',
+            ]) == {
+                'Vehicle.Speed': Datapoint(
+                    42.0, datetime.datetime(2022, 11, 7, 16, 18, 35, 247307, tzinfo=datetime.timezone.utc),
+                ),
+                'Vehicle.ADAS.ABS.IsActive': Datapoint(True),
+                'Vehicle.Chassis.Height': Datapoint(None),
+            }
+            assert val_servicer_v2.GetValues.call_args[0][0] == val_v2.GetValuesRequest(signal_ids=[
+                types_v2.SignalID(id=1), types_v2.SignalID(id=2), types_v2.SignalID(id=3),
+            ])
+            assert val_servicer_v1.Get.call_count == 0
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_get_current_values_v2_branch(self, unused_tcp_port, val_servicer_v1, val_servicer_v2):
+        val_servicer_v2.ListMetadata.side_effect = list_metadata_side_effect(
+            types_v2.Metadata(path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT),
+            types_v2.Metadata(path="Vehicle.Body.Trunk.Rear.IsOpen", id=2, data_type=types_v2.DATA_TYPE_BOOLEAN),
+            types_v2.Metadata(path="Vehicle.Body.Hood.IsOpen", id=3, data_type=types_v2.DATA_TYPE_BOOLEAN),
+        )
+        val_servicer_v2.GetValues.side_effect = lambda request, _context: val_v2.GetValuesResponse(data_points=[
+            types_v2.Datapoint(value=types_v2.Value(bool=signal_id.id == 2)) for signal_id in request.signal_ids
+        ])
+        async with VSSClient('127.0.0.1', unused_tcp_port, ensure_startup_connection=False) as client:
+            # Like v1, a branch returns all signals below it
+            assert await client.get_current_values(['Vehicle.Body']) == {
+                'Vehicle.Body.Trunk.Rear.IsOpen': Datapoint(True),
+                'Vehicle.Body.Hood.IsOpen': Datapoint(False),
+            }
+            assert val_servicer_v2.GetValues.call_args[0][0] == val_v2.GetValuesRequest(signal_ids=[
+                types_v2.SignalID(id=2), types_v2.SignalID(id=3),
+            ])
+            assert await client.get_current_values(['Vehicle.Body.*'], output_mode=OutputMode.TUPLES) == [
+                ('Vehicle.Body.Trunk.Rear.IsOpen', True, None),
+                ('Vehicle.Body.Hood.IsOpen', False, None),
+            ]
+            assert val_servicer_v1.Get.call_count == 0
+
+            with pytest.raises(VSSClientError) as exc_info:
+                await client.get_current_values(['Vehicle.Speed', 'Vehicle.Trailer'])
+            assert exc_info.value.error["code"] == grpc.StatusCode.NOT_FOUND.value[0]
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_timestamp_ns(self, unused_tcp_port, val_servicer_v2):
+        val_servicer_v2.ListMetadata.side_effect = list_metadata_side_effect(
+            types_v2.Metadata(path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT),
+        )
+        data_point = types_v2.Datapoint(
+            timestamp=timestamp_pb2.Timestamp(seconds=1667837915, nanos=247307674),
+            value=types_v2.Value(float=42.0),
+        )
+        val_servicer_v2.GetValues.return_value = val_v2.GetValuesResponse(data_points=[data_point])
+        val_servicer_v2.Subscribe.side_effect = lambda request, _context: iter((
+            val_v2.SubscribeResponse(entries={'Vehicle.Speed': data_point}),
+        ))
+        val_servicer_v2.PublishValue.return_value = val_v2.PublishValueResponse()
+        async with VSSClient(
+            '127.0.0.1', unused_tcp_port, ensure_startup_connection=False, timestamp_ns=True,
+        ) as client:
+            expected = {'Vehicle.Speed': Datapoint(42.0, 1667837915247307674)}
+            assert await client.get_current_values(['Vehicle.Speed']) == expected
+            async for updates in client.subscribe_current_values(['Vehicle.Speed']):
+                assert updates == expected
+            async for updates in client.subscribe_current_values(['Vehicle.Speed'], lazy=True):
+                assert updates['Vehicle.Speed'].timestamp == 1667837915247307674
+
+            await client.set_current_values({'Vehicle.Speed': Datapoint(42.0, 1667837915247307674)})
+            assert val_servicer_v2.PublishValue.call_args[0][0].data_point == data_point
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_get_current_values_v2_unimplemented(self, unused_tcp_port, val_servicer_v1, val_servicer_v2):
+        val_servicer_v2.ListMetadata.side_effect = list_metadata_side_effect(
+            types_v2.Metadata(path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT),
+        )
+        val_servicer_v2.GetValues.side_effect = generate_error(
+            grpc.StatusCode.UNIMPLEMENTED, 'Unimplemented',
+        )
+        val_servicer_v1.Get.return_value = val_v1.GetResponse(entries=[
+            types_v1.DataEntry(path='Vehicle.Speed', value=types_v1.Datapoint(float=42.0)),
+        ])
+        async with VSSClient('127.0.0.1', unused_tcp_port, ensure_startup_connection=False) as client:
+            assert await client.get_current_values(['Vehicle.Speed']) == {
+                'Vehicle.Speed': Datapoint(42.0),
+            }
+            assert val_servicer_v1.Get.call_args[0][0] == val_v1.GetRequest(entries=(
+                val_v1.EntryRequest(path='Vehicle.Speed', view=types_v1.VIEW_CURRENT_VALUE, fields=(
+                    types_v1.FIELD_VALUE,
+                )),
+            ))
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_get_current_values_output_modes(self, unused_tcp_port, val_servicer_v1, val_servicer_v2):
+        val_servicer_v2.ListMetadata.side_effect = list_metadata_side_effect(
+            types_v2.Metadata(path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT),
+            types_v2.Metadata(path="Vehicle.ADAS.ABS.IsActive", id=2, data_type=types_v2.DATA_TYPE_BOOLEAN),
+        )
+        response = val_v2.GetValuesResponse(data_points=[
+            types_v2.Datapoint(
+                timestamp=timestamp_pb2.Timestamp(seconds=1667837915, nanos=247307674),
+                value=types_v2.Value(float=42.0),
+            ),
+            types_v2.Datapoint(value=types_v2.Value(bool=True)),
+        ])
+        val_servicer_v2.GetValues.return_value = response
+        async with VSSClient('127.0.0.1', unused_tcp_port, ensure_startup_connection=False) as client:
+            assert await client.get_current_values(
+                ['Vehicle.Speed', 'Vehicle.ADAS.ABS.IsActive'], output_mode=OutputMode.TUPLES,
+            ) == [
+                ('Vehicle.Speed', 42.0, 1667837915247307674),
+                ('Vehicle.ADAS.ABS.IsActive', True, None),
+            ]
+            assert await client.get_current_values(
+                ['Vehicle.Speed', 'Vehicle.ADAS.ABS.IsActive'], output_mode=OutputMode.RAW,
+            ) == response
+
+            # v1 fallback
+            val_servicer_v2.GetValues.side_effect = generate_error(grpc.StatusCode.UNIMPLEMENTED, 'Unimplemented')
+            response = val_v1.GetResponse(entries=[
+                types_v1.DataEntry(path='Vehicle.Speed', value=types_v1.Datapoint(
+                    timestamp=timestamp_pb2.Timestamp(seconds=1667837915, nanos=247307674), float=42.0,
+                )),
+            ])
+            val_servicer_v1.Get.return_value = response
+            assert await client.get_current_values(['Vehicle.Speed'], output_mode=OutputMode.TUPLES) == [
+                ('Vehicle.Speed', 42.0, 1667837915247307674),
+            ]
+            assert await client.get_current_values(['Vehicle.Speed'], output_mode=OutputMode.RAW) == response
+
     async def test_get_target_values(self, mocker, unused_tcp_port):
         client = VSSClient('127.0.0.1', unused_tcp_port)
         client.connected = True  # To bypass connection check
@@ -670,6 +996,149 @@ class TestVSSClient:
             'Vehicle.Chassis.Height': Datapoint(666),
         }
 
+    async def test_subscribe_current_values_rate_and_deadband(self, mocker, unused_tcp_port):
+        client = VSSClient('127.0.0.1', unused_tcp_port)
+        client.connected = True  # To bypass connection check
+        clock = [0.0]
+
+        async def subscribe_response_stream(**kwargs):
+            for now, speed, width in ((0.0, 10.0, 1.0), (0.5, 10.5, 2.0), (1.0, 12.0, 3.0), (1.5, 12.1, 4.0)):
+                clock[0] = now
+                yield [
+                    EntryUpdate(DataEntry('Vehicle.Speed', value=Datapoint(speed)), (Field.VALUE,)),
+                    EntryUpdate(DataEntry('Vehicle.Width', value=Datapoint(width)), (Field.VALUE,)),
+                ]
+            clock[0] = 2.0
+        mocker.patch.object(client, 'v2_subscribe', side_effect=subscribe_response_stream)
+        mocker.patch('kuksa_client.grpc.time').monotonic.side_effect = lambda: clock[0]
+
+        received_updates = []
+        async for updates in client.subscribe_current_values(
+            ['Vehicle.Speed', 'Vehicle.Width'], max_rate_hz={'Vehicle.W*': 1.0}, deadband={'Vehicle.Speed': 1.0},
+        ):
+            received_updates.append(updates)
+
+        # The width held back last is passed on once its interval has expired
+        assert received_updates == [
+            {'Vehicle.Speed': Datapoint(10.0), 'Vehicle.Width': Datapoint(1.0)},
+            {'Vehicle.Speed': Datapoint(12.0), 'Vehicle.Width': Datapoint(3.0)},
+            {'Vehicle.Width': Datapoint(4.0)},
+        ]
+
+        with pytest.raises(ValueError):
+            async for _ in client.subscribe_current_values(
+                ['Vehicle.Speed'], output_mode=OutputMode.RAW, deadband=1.0,
+            ):
+                pass
+
+    async def test_subscribe_current_values_rate_limit_burst(self, mocker, unused_tcp_port):
+        client = VSSClient('127.0.0.1', unused_tcp_port)
+        client.connected = True  # To bypass connection check
+        clock = [0.0]
+
+        async def subscribe_response_stream(**kwargs):
+            for now, speed in ((0.0, 1.0), (0.01, 2.0), (0.02, 3.0)):
+                clock[0] = now
+                yield [EntryUpdate(DataEntry('Vehicle.Speed', value=Datapoint(speed)), (Field.VALUE,))]
+            # The burst ends within the interval and no further update arrives
+            clock[0] = 0.2
+            await asyncio.Event().wait()
+        mocker.patch.object(client, 'v2_subscribe', side_effect=subscribe_response_stream)
+        mocker.patch('kuksa_client.grpc.time').monotonic.side_effect = lambda: clock[0]
+
+        received_updates = []
+        subscription = client.subscribe_current_values(['Vehicle.Speed'], max_rate_hz=10.0)
+        async for updates in subscription:
+            received_updates.append(updates)
+            if len(received_updates) == 2:
+                break
+        await subscription.aclose()
+
+        assert received_updates == [{'Vehicle.Speed': Datapoint(1.0)}, {'Vehicle.Speed': Datapoint(3.0)}]
+
+    async def test_subscribe_current_values_reconnect(self, mocker, unused_tcp_port):
+        client = VSSClient('127.0.0.1', unused_tcp_port)
+        client.connected = True  # To bypass connection check
+        client.path_to_id_mapping['Vehicle.Speed'] = 1
+
+        def error(code):
+            return VSSClientError(error={"code": code.value[0], "reason": code.value[1], "message": ""}, errors=[])
+
+        calls = []
+
+        async def subscribe_current_values(paths, *args, **kwargs):
+            calls.append(list(paths))
+            if len(calls) == 1:
+                yield {'Vehicle.Speed': Datapoint(1.0)}
+                raise error(grpc.StatusCode.UNAVAILABLE)
+            if len(calls) == 2:
+                raise error(grpc.StatusCode.UNAVAILABLE)
+            yield {'Vehicle.Speed': Datapoint(3.0)}
+            raise error(grpc.StatusCode.PERMISSION_DENIED)
+        mocker.patch.object(client, '_v2_subscribe_current_values', side_effect=subscribe_current_values)
+
+        async def expand(paths, **kwargs):
+            # The restarted databroker assigned a new id
+            client.path_to_id_mapping['Vehicle.Speed'] = 2
+            client.id_to_path_mapping[2] = 'Vehicle.Speed'
+            return list(paths)
+        mocker.patch.object(client, '_expand_v2_branch_paths', side_effect=expand)
+
+        received_updates = []
+        with pytest.raises(VSSClientError) as exc_info:
+            async for updates in client.subscribe_current_values(
+                ['Vehicle.Speed'], reconnect=ReconnectPolicy(initial_delay=0.0),
+            ):
+                received_updates.append(updates)
+
+        assert exc_info.value.error["code"] == grpc.StatusCode.PERMISSION_DENIED.value[0]
+        assert calls == [['Vehicle.Speed']] * 3
+        # The ids of the subscribed paths are resolved again before each attempt
+        assert client._expand_v2_branch_paths.call_count == 2
+        assert client.path_to_id_mapping == {'Vehicle.Speed': 2}
+        first, gap, catch_up = received_updates
+        assert first == {'Vehicle.Speed': Datapoint(1.0)}
+        assert isinstance(gap, SubscriptionGap)
+        assert gap.error.error["code"] == grpc.StatusCode.UNAVAILABLE.value[0]
+        assert gap.attempts == 2
+        assert gap.duration >= 0.0
+        assert catch_up == {'Vehicle.Speed': Datapoint(3.0)}
+
+        calls.clear()
+        with pytest.raises(VSSClientError) as exc_info:
+            async for updates in client.subscribe_current_values(
+                ['Vehicle.Speed'], reconnect=ReconnectPolicy(initial_delay=0.0, max_attempts=1),
+            ):
+                pass
+        assert exc_info.value.error["code"] == grpc.StatusCode.UNAVAILABLE.value[0]
+        assert len(calls) == 2
+
+    async def test_reconnect_policy_delays(self, mocker):
+        mocker.patch('kuksa_client.grpc.random.random', return_value=0.5)
+        policy = ReconnectPolicy(initial_delay=1.0, max_delay=3.0, multiplier=2.0, jitter=0.5, max_attempts=4)
+        assert list(policy.delays()) == [0.75, 1.5, 2.25, 2.25]
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_subscribe_current_values_buffer_size(self, unused_tcp_port, val_servicer_v2):
+        val_servicer_v2.ListMetadata.side_effect = list_metadata_side_effect(
+            types_v2.Metadata(path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT),
+        )
+        val_servicer_v2.Subscribe.side_effect = lambda request, _context: iter((
+            val_v2.SubscribeResponse(entries={'Vehicle.Speed': types_v2.Datapoint()}),
+        ))
+        val_servicer_v2.SubscribeById.side_effect = lambda request, _context: iter((
+            val_v2.SubscribeByIdResponse(entries={1: types_v2.Datapoint()}),
+        ))
+        async with VSSClient('127.0.0.1', unused_tcp_port, ensure_startup_connection=False) as client:
+            for by_id in (False, True):
+                async for _ in client.subscribe_current_values(['Vehicle.Speed'], by_id=by_id, buffer_size=10):
+                    pass
+            async for _ in client.v2_subscribe_by_id(['Vehicle.Speed'], buffer_size=20):
+                pass
+
+        assert val_servicer_v2.Subscribe.call_args[0][0].buffer_size == 10
+        assert [call[0][0].buffer_size for call in val_servicer_v2.SubscribeById.call_args_list] == [10, 20]
+
     async def test_subscribe_current_values_branch_path_expansion(
         self, mocker, unused_tcp_port,
     ):
@@ -732,6 +1201,80 @@ class TestVSSClient:
             'Vehicle.ADAS.ABS.IsActive': Datapoint(True),
         }
 
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_expand_v2_branch_paths(self, mocker, unused_tcp_port):
+        list_metadata = list_metadata_side_effect(
+            types_v2.Metadata(path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT),
+            types_v2.Metadata(path="Vehicle.Cabin.Door.Row1.DriverSide.IsOpen", id=2,
+                              data_type=types_v2.DATA_TYPE_BOOLEAN),
+            types_v2.Metadata(path="Vehicle.Cabin.Light.IsDomeOn", id=3, data_type=types_v2.DATA_TYPE_BOOLEAN),
+            types_v2.Metadata(path="Vehicle.ADAS.ABS.IsActive", id=4, data_type=types_v2.DATA_TYPE_BOOLEAN),
+        )
+        in_flight = {"current": 0, "max": 0}
+
+        async def list_metadata_call(request, **kwargs):
+            in_flight["current"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["current"])
+            await asyncio.sleep(0.01)
+            in_flight["current"] -= 1
+            return list_metadata(request, None)
+
+        async with VSSClient(
+            '127.0.0.1', unused_tcp_port, ensure_startup_connection=False, max_concurrent_metadata_requests=2,
+        ) as client:
+            mocker.patch.object(client.client_stub_v2, 'ListMetadata', side_effect=list_metadata_call)
+            expanded = await client._expand_v2_branch_paths([
+                'Vehicle.Cabin.*', 'Vehicle.Speed', 'Vehicle.ADAS', 'Vehicle.Cabin.Light',
+            ])
+
+            assert expanded == [
+                'Vehicle.Cabin.Door.Row1.DriverSide.IsOpen',
+                'Vehicle.Cabin.Light.IsDomeOn',
+                'Vehicle.Speed',
+                'Vehicle.ADAS.ABS.IsActive',
+            ]
+            assert client.client_stub_v2.ListMetadata.call_count == 4
+            assert in_flight["max"] == 2
+            assert client.path_to_id_mapping['Vehicle.Cabin.Light.IsDomeOn'] == 3
+
+            # Expansions are memoized for the current connection
+            assert await client._expand_v2_branch_paths(['Vehicle.Cabin']) == [
+                'Vehicle.Cabin.Door.Row1.DriverSide.IsOpen', 'Vehicle.Cabin.Light.IsDomeOn',
+            ]
+            assert client.client_stub_v2.ListMetadata.call_count == 4
+
+            with pytest.raises(VSSClientError) as exc_info:
+                await client._expand_v2_branch_paths(['Vehicle.Trailer'])
+            assert exc_info.value.error["code"] == grpc.StatusCode.NOT_FOUND.value[0]
+
+            await client.disconnect()
+            assert client.branch_expansions == {}
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_expand_v2_branch_paths_failure(self, mocker, unused_tcp_port):
+        list_metadata = list_metadata_side_effect(
+            types_v2.Metadata(path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT),
+        )
+        completed = []
+
+        async def list_metadata_call(request, **kwargs):
+            if request.root == "Vehicle.Speed":
+                await asyncio.sleep(0.05)
+            completed.append(request.root)
+            return list_metadata(request, None)
+
+        async with VSSClient('127.0.0.1', unused_tcp_port, ensure_startup_connection=False) as client:
+            mocker.patch.object(client.client_stub_v2, 'ListMetadata', side_effect=list_metadata_call)
+            with pytest.raises(VSSClientError) as exc_info:
+                await client._expand_v2_branch_paths(['Vehicle.Speed', 'Vehicle.Trailer'])
+            assert exc_info.value.error["code"] == grpc.StatusCode.NOT_FOUND.value[0]
+
+            # The lookup still outstanding is cancelled rather than updating the mappings later on
+            await asyncio.sleep(0.1)
+            assert completed == ['Vehicle.Trailer']
+            assert client.branch_expansions == {}
+            assert 'Vehicle.Speed' not in client.path_to_id_mapping
+
     async def test_subscribe_target_values(self, mocker, unused_tcp_port):
         client = VSSClient('127.0.0.1', unused_tcp_port)
         client.connected = True  # To bypass connection check
@@ -1295,17 +1838,9 @@ class TestVSSClient:
     async def test_set_some_updates_v2(
         self, unused_tcp_port, val_servicer_v2, val_servicer_v1
     ):
-        val_servicer_v1.Get.return_value = val_v1.GetResponse(
-            entries=(
-                types_v1.DataEntry(
-                    path="Vehicle.Speed",
-                    metadata=types_v1.Metadata(data_type=types_v1.DATA_TYPE_FLOAT),
-                ),
-                types_v1.DataEntry(
-                    path="Vehicle.ADAS.ABS.IsActive",
-                    metadata=types_v1.Metadata(data_type=types_v1.DATA_TYPE_BOOLEAN),
-                ),
-            )
+        val_servicer_v2.ListMetadata.side_effect = list_metadata_side_effect(
+            types_v2.Metadata(path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT),
+            types_v2.Metadata(path="Vehicle.ADAS.ABS.IsActive", id=2, data_type=types_v2.DATA_TYPE_BOOLEAN),
         )
         val_servicer_v2.PublishValue.return_value = val_v2.PublishValueResponse()
         _updates = [
@@ -1329,46 +1864,92 @@ class TestVSSClient:
                 updates=_updates,
                 try_v2=True,
             )
-            assert val_servicer_v1.Get.call_count == 1
-            assert (
-                val_servicer_v1.Get.call_args[0][0].entries
-                == val_v1.GetRequest(
-                    entries=(
-                        val_v1.EntryRequest(
-                            path="Vehicle.Speed",
-                            view=View.METADATA,
-                            fields=(Field.METADATA_DATA_TYPE,),
-                        ),
-                        val_v1.EntryRequest(
-                            path="Vehicle.ADAS.ABS.IsActive",
-                            view=View.METADATA,
-                            fields=(Field.METADATA_DATA_TYPE,),
-                        ),
-                    )
-                ).entries
-            )
+            # Data types are taken from the ListMetadata responses, v1 is not needed
+            assert val_servicer_v1.Get.call_count == 0
 
             expected_requests = [
-                val_v2.PublishValueRequest(
-                    signal_id=types_v2.SignalID(path="Vehicle.Speed"),
-                    data_point=types_v2.Datapoint(value=types_v2.Value(float=42.0)),
-                ),
                 val_v2.PublishValueRequest(
                     signal_id=types_v2.SignalID(path="Vehicle.ADAS.ABS.IsActive"),
                     data_point=types_v2.Datapoint(value=types_v2.Value(bool=False)),
                 ),
+                val_v2.PublishValueRequest(
+                    signal_id=types_v2.SignalID(path="Vehicle.Speed"),
+                    data_point=types_v2.Datapoint(value=types_v2.Value(float=42.0)),
+                ),
             ]
 
             assert val_servicer_v2.PublishValue.call_count == len(_updates)
 
-            actual_requests = [
-                call[0][0] for call in val_servicer_v2.PublishValue.call_args_list
-            ]
+            # The calls are pipelined, hence the order in which they arrive may vary
+            actual_requests = sorted(
+                (call[0][0] for call in val_servicer_v2.PublishValue.call_args_list),
+                key=lambda req: req.signal_id.path,
+            )
+            assert actual_requests == expected_requests
 
-            for actual_request, expected_request in zip(
-                actual_requests, expected_requests
-            ):
-                assert actual_request == expected_request
+            await client.set(updates=_updates, try_v2=True)
+            assert val_servicer_v2.PublishValue.call_count == 2 * len(_updates)
+            # Neither ids nor data types are requested again
+            assert val_servicer_v2.ListMetadata.call_count == 2
+            assert val_servicer_v1.Get.call_count == 0
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_set_some_updates_v2_publish_value_error(
+        self, unused_tcp_port, val_servicer_v2, val_servicer_v1
+    ):
+        val_servicer_v2.ListMetadata.side_effect = list_metadata_side_effect(
+            types_v2.Metadata(path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT),
+            types_v2.Metadata(path="Vehicle.ADAS.ABS.IsActive", id=2, data_type=types_v2.DATA_TYPE_BOOLEAN),
+        )
+
+        def publish_value(request, context):
+            if request.signal_id.path == "Vehicle.ADAS.ABS.IsActive":
+                context.set_code(grpc.StatusCode.PERMISSION_DENIED)
+                context.set_details("Not allowed")
+            return val_v2.PublishValueResponse()
+        val_servicer_v2.PublishValue.side_effect = publish_value
+        async with VSSClient(
+            "127.0.0.1", unused_tcp_port, ensure_startup_connection=False
+        ) as client:
+            with pytest.raises(VSSClientError) as exc_info:
+                await client.set_current_values({
+                    "Vehicle.Speed": Datapoint(42.0),
+                    "Vehicle.ADAS.ABS.IsActive": Datapoint(False),
+                })
+
+            assert exc_info.value.error == {
+                "code": grpc.StatusCode.PERMISSION_DENIED.value[0],
+                "reason": grpc.StatusCode.PERMISSION_DENIED.value[1],
+                "message": "Not allowed",
+            }
+            assert val_servicer_v2.PublishValue.call_count == 2
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_set_some_updates_v2_same_path(
+        self, unused_tcp_port, val_servicer_v2, val_servicer_v1
+    ):
+        val_servicer_v2.ListMetadata.side_effect = list_metadata_side_effect(
+            types_v2.Metadata(path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT),
+        )
+        val_servicer_v2.PublishValue.return_value = val_v2.PublishValueResponse()
+        async with VSSClient(
+            "127.0.0.1", unused_tcp_port, ensure_startup_connection=False
+        ) as client:
+            await client.set(
+                updates=[
+                    EntryUpdate(DataEntry("Vehicle.Speed", value=Datapoint(value=41.0)), (Field.VALUE,)),
+                    EntryUpdate(DataEntry("Vehicle.Speed", value=Datapoint(value=42.0)), (Field.VALUE,)),
+                ],
+                try_v2=True,
+            )
+
+            # Only the last update is published, so that it cannot be overtaken by an earlier one
+            assert [call[0][0] for call in val_servicer_v2.PublishValue.call_args_list] == [
+                val_v2.PublishValueRequest(
+                    signal_id=types_v2.SignalID(path="Vehicle.Speed"),
+                    data_point=types_v2.Datapoint(value=types_v2.Value(float=42.0)),
+                ),
+            ]
 
     @pytest.mark.usefixtures("mocked_databroker")
     async def test_set_some_updates_v2_target(
@@ -1412,7 +1993,7 @@ class TestVSSClient:
                     updates=_updates,
                     try_v2=True,
                 )
-            assert val_servicer_v1.Get.call_count == 1
+            assert val_servicer_v1.Get.call_count == 0
             assert val_servicer_v2.PublishValue.call_count == 0
 
     @pytest.mark.usefixtures("mocked_databroker")
@@ -1553,6 +2134,156 @@ class TestVSSClient:
             )  # Get should'nt have been called again
             assert val_servicer_v2.PublishValue.call_count == 1
 
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_set_uses_data_type_cache(
+        self, unused_tcp_port, val_servicer_v1, val_servicer_v2
+    ):
+        val_servicer_v1.Get.return_value = val_v1.GetResponse(
+            entries=(
+                types_v1.DataEntry(
+                    path="Vehicle.Speed",
+                    metadata=types_v1.Metadata(data_type=types_v1.DATA_TYPE_FLOAT),
+                ),
+            )
+        )
+        val_servicer_v2.PublishValue.return_value = val_v2.PublishValueResponse()
+        async with VSSClient(
+            "127.0.0.1", unused_tcp_port, ensure_startup_connection=False
+        ) as client:
+            for value in (42.0, 43.0, 44.0):
+                await client.set_current_values({"Vehicle.Speed": Datapoint(value)})
+
+            assert val_servicer_v1.Get.call_count == 1
+            assert val_servicer_v2.PublishValue.call_count == 3
+            assert client.data_type_cache.get("Vehicle.Speed") is DataType.FLOAT
+            assert client.data_type_cache.misses == 1
+            assert client.data_type_cache.hits == 2
+
+            # Updating metadata invalidates the cached data type
+            val_servicer_v1.Set.return_value = val_v1.SetResponse()
+            await client.set_metadata(
+                {"Vehicle.Speed": Metadata(data_type=DataType.DOUBLE)},
+                field=MetadataField.DATA_TYPE,
+            )
+            assert "Vehicle.Speed" not in client.data_type_cache
+
+            await client.connect()
+            assert len(client.data_type_cache) == 0
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_load_data_types(
+        self, unused_tcp_port, val_servicer_v1, val_servicer_v2
+    ):
+        val_servicer_v2.ListMetadata.side_effect = list_metadata_side_effect(
+            types_v2.Metadata(
+                path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT
+            ),
+            types_v2.Metadata(
+                path="Vehicle.ADAS.ABS.IsActive",
+                id=2,
+                data_type=types_v2.DATA_TYPE_BOOLEAN,
+            ),
+        )
+        val_servicer_v2.PublishValue.return_value = val_v2.PublishValueResponse()
+        async with VSSClient(
+            "127.0.0.1", unused_tcp_port, ensure_startup_connection=False
+        ) as client:
+            assert await client.load_data_types() == 2
+            assert val_servicer_v2.ListMetadata.call_args[0][0] == val_v2.ListMetadataRequest(
+                root="Vehicle"
+            )
+
+            await client.set_current_values({"Vehicle.Speed": Datapoint(42.0)})
+            await client.set_current_values({"Vehicle.ADAS.ABS.IsActive": Datapoint(True)})
+            assert val_servicer_v1.Get.call_count == 0
+            assert [
+                call[0][0] for call in val_servicer_v2.PublishValue.call_args_list
+            ] == [
+                val_v2.PublishValueRequest(
+                    signal_id=types_v2.SignalID(path="Vehicle.Speed"),
+                    data_point=types_v2.Datapoint(value=types_v2.Value(float=42.0)),
+                ),
+                val_v2.PublishValueRequest(
+                    signal_id=types_v2.SignalID(path="Vehicle.ADAS.ABS.IsActive"),
+                    data_point=types_v2.Datapoint(value=types_v2.Value(bool=True)),
+                ),
+            ]
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_ensure_id_mapping(self, unused_tcp_port, val_servicer_v2):
+        val_servicer_v2.ListMetadata.side_effect = list_metadata_side_effect(
+            types_v2.Metadata(path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT),
+            types_v2.Metadata(path="Vehicle.Cabin.Seat.Row1.PassengerSide.Position", id=2,
+                              data_type=types_v2.DATA_TYPE_UINT16),
+            types_v2.Metadata(path="Vehicle.Cabin.Seat.Row1.PassengerSide.Height", id=3,
+                              data_type=types_v2.DATA_TYPE_UINT16),
+            types_v2.Metadata(path="Vehicle.Cabin.Seat.Row1.PassengerSide.Tilt", id=4,
+                              data_type=types_v2.DATA_TYPE_FLOAT),
+        )
+        async with VSSClient('127.0.0.1', unused_tcp_port, ensure_startup_connection=False) as client:
+            await client.ensure_id_mapping([
+                "Vehicle.Speed",
+                "Vehicle.Cabin.Seat.Row1.PassengerSide.Position",
+                "Vehicle.Cabin.Seat.Row1.PassengerSide.Height",
+            ])
+
+            assert sorted(
+                call[0][0].root for call in val_servicer_v2.ListMetadata.call_args_list
+            ) == ["Vehicle.Cabin.Seat.Row1.PassengerSide", "Vehicle.Speed"]
+            assert client.path_to_id_mapping == {
+                "Vehicle.Speed": 1,
+                "Vehicle.Cabin.Seat.Row1.PassengerSide.Position": 2,
+                "Vehicle.Cabin.Seat.Row1.PassengerSide.Height": 3,
+                "Vehicle.Cabin.Seat.Row1.PassengerSide.Tilt": 4,
+            }
+            assert client.id_to_path_mapping[4] == "Vehicle.Cabin.Seat.Row1.PassengerSide.Tilt"
+            assert client.data_type_cache.get("Vehicle.Cabin.Seat.Row1.PassengerSide.Tilt") == DataType.FLOAT
+
+            # Already resolved paths are not queried again
+            await client.ensure_id_mapping(["Vehicle.Cabin.Seat.Row1.PassengerSide.Tilt", "Vehicle.Speed"])
+            assert val_servicer_v2.ListMetadata.call_count == 2
+
+            with pytest.raises(VSSClientError) as exc_info:
+                await client.ensure_id_mapping([
+                    "Vehicle.Cabin.Seat.Row1.PassengerSide.Position",
+                    "Vehicle.Cabin.Seat.Row1.PassengerSide.Recline",
+                ])
+            assert exc_info.value.error["code"] == grpc.StatusCode.NOT_FOUND.value[0]
+            assert "Vehicle.Cabin.Seat.Row1.PassengerSide.Recline" not in client.path_to_id_mapping
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_ensure_id_mapping_max_concurrent_requests(self, mocker, unused_tcp_port):
+        list_metadata = list_metadata_side_effect(
+            types_v2.Metadata(path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT),
+            types_v2.Metadata(path="Vehicle.Cabin.Light.IsDomeOn", id=2, data_type=types_v2.DATA_TYPE_BOOLEAN),
+            types_v2.Metadata(path="Vehicle.ADAS.ABS.IsActive", id=3, data_type=types_v2.DATA_TYPE_BOOLEAN),
+        )
+        in_flight = {"current": 0, "max": 0}
+
+        async def list_metadata_call(request, **kwargs):
+            in_flight["current"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["current"])
+            await asyncio.sleep(0.01)
+            in_flight["current"] -= 1
+            return list_metadata(request, None)
+
+        # A limit below 1 still lets one request at a time through
+        async with VSSClient(
+            '127.0.0.1', unused_tcp_port, ensure_startup_connection=False, max_concurrent_metadata_requests=0,
+        ) as client:
+            mocker.patch.object(client.client_stub_v2, 'ListMetadata', side_effect=list_metadata_call)
+            await client.ensure_id_mapping(
+                ["Vehicle.Speed", "Vehicle.Cabin.Light.IsDomeOn", "Vehicle.ADAS.ABS.IsActive"]
+            )
+
+            assert client.client_stub_v2.ListMetadata.call_count == 3
+            assert in_flight["max"] == 1
+            assert client.path_to_id_mapping == {
+                "Vehicle.Speed": 1,
+                "Vehicle.Cabin.Light.IsDomeOn": 2,
+                "Vehicle.ADAS.ABS.IsActive": 3,
+            }
+
     @pytest.mark.usefixtures("mocked_databroker")
     async def test_authorize_successful(self, unused_tcp_port, val_servicer_v1):
         val_servicer_v1.GetServerInfo.return_value = val_v1.GetServerInfoResponse(
@@ -1895,6 +2626,194 @@ class TestVSSClient:
                 ],
             ]
 
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_subscribe_some_entries_v2_by_id(
+        self, unused_tcp_port, val_servicer_v2
+    ):
+        val_servicer_v2.ListMetadata.side_effect = list_metadata_side_effect(
+            types_v2.Metadata(path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT),
+            types_v2.Metadata(path="Vehicle.ADAS.ABS.IsActive", id=2, data_type=types_v2.DATA_TYPE_BOOLEAN),
+        )
+        responses = (
+            val_v2.SubscribeByIdResponse(entries={
+                1: types_v2.Datapoint(
+                    timestamp=timestamp_pb2.Timestamp(seconds=1667837915, nanos=247307674),
+                    value=types_v2.Value(float=42.0),
+                ),
+                2: types_v2.Datapoint(value=types_v2.Value(bool=True)),
+            }),
+            val_v2.SubscribeByIdResponse(entries={1: types_v2.Datapoint(value=types_v2.Value(float=43.0))}),
+        )
+        val_servicer_v2.SubscribeById.side_effect = lambda request, _context: iter(responses)
+        async with VSSClient(
+            "127.0.0.1", unused_tcp_port, ensure_startup_connection=False
+        ) as client:
+            actual_responses = []
+            async for updates in client.v2_subscribe_by_id(["Vehicle.Speed", "Vehicle.ADAS.ABS.IsActive"]):
+                actual_responses.append(updates)
+
+            assert val_servicer_v2.SubscribeById.call_args[0][0] == val_v2.SubscribeByIdRequest(signal_ids=[1, 2])
+            assert actual_responses == [
+                {
+                    1: Datapoint(42.0, datetime.datetime(
+                        2022, 11, 7, 16, 18, 35, 247307, tzinfo=datetime.timezone.utc,
+                    )),
+                    2: Datapoint(True),
+                },
+                {1: Datapoint(43.0)},
+            ]
+
+            actual_responses = []
+            async for updates in client.subscribe_current_values(
+                ["Vehicle.Speed", "Vehicle.ADAS.ABS.IsActive"], by_id=True,
+            ):
+                actual_responses.append(updates)
+
+            assert actual_responses == [
+                {
+                    "Vehicle.Speed": Datapoint(42.0, datetime.datetime(
+                        2022, 11, 7, 16, 18, 35, 247307, tzinfo=datetime.timezone.utc,
+                    )),
+                    "Vehicle.ADAS.ABS.IsActive": Datapoint(True),
+                },
+                {"Vehicle.Speed": Datapoint(43.0)},
+            ]
+            assert val_servicer_v2.Subscribe.call_count == 0
+            # Ids are resolved once per connection
+            assert val_servicer_v2.ListMetadata.call_count == 2
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_subscribe_current_values_lazy(
+        self, unused_tcp_port, val_servicer_v2
+    ):
+        val_servicer_v2.ListMetadata.side_effect = list_metadata_side_effect(
+            types_v2.Metadata(path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT),
+            types_v2.Metadata(path="Vehicle.ADAS.ABS.IsActive", id=2, data_type=types_v2.DATA_TYPE_BOOLEAN),
+        )
+        entries = {
+            "Vehicle.Speed": types_v2.Datapoint(
+                timestamp=timestamp_pb2.Timestamp(seconds=1667837915, nanos=247307674),
+                value=types_v2.Value(float=42.0),
+            ),
+            "Vehicle.ADAS.ABS.IsActive": types_v2.Datapoint(value=types_v2.Value(bool=True)),
+        }
+        val_servicer_v2.Subscribe.side_effect = lambda request, _context: iter((
+            val_v2.SubscribeResponse(entries=entries),
+        ))
+        val_servicer_v2.SubscribeById.side_effect = lambda request, _context: iter((
+            val_v2.SubscribeByIdResponse(entries={
+                1: entries["Vehicle.Speed"], 2: entries["Vehicle.ADAS.ABS.IsActive"],
+            }),
+        ))
+        expected_updates = {
+            "Vehicle.Speed": Datapoint(42.0, datetime.datetime(
+                2022, 11, 7, 16, 18, 35, 247307, tzinfo=datetime.timezone.utc,
+            )),
+            "Vehicle.ADAS.ABS.IsActive": Datapoint(True),
+        }
+        async with VSSClient(
+            "127.0.0.1", unused_tcp_port, ensure_startup_connection=False
+        ) as client:
+            for by_id in (False, True):
+                async for updates in client.subscribe_current_values(
+                    ["Vehicle.Speed", "Vehicle.ADAS.ABS.IsActive"], by_id=by_id, lazy=True,
+                ):
+                    assert isinstance(updates, LazyDatapoints)
+                    assert len(updates) == 2
+                    assert "Vehicle.Speed" in updates
+                    assert "Vehicle.Chassis.Height" not in updates
+                    assert updates["Vehicle.Speed"].value == 42.0
+                    assert updates.get("Vehicle.Chassis.Height") is None
+                    assert dict(updates) == expected_updates
+
+            async for updates in client.v2_subscribe(["Vehicle.Speed", "Vehicle.ADAS.ABS.IsActive"], lazy=True):
+                # Updates follow the iteration order of the protobuf map, which is not defined
+                assert {update.entry.path: update for update in updates} == {
+                    path: EntryUpdate(DataEntry(path, value=dp), [Field.VALUE]) for path, dp in expected_updates.items()
+                }
+
+            async for updates in client.v2_subscribe_by_id(["Vehicle.Speed", "Vehicle.ADAS.ABS.IsActive"], lazy=True):
+                assert dict(updates) == {
+                    1: expected_updates["Vehicle.Speed"], 2: expected_updates["Vehicle.ADAS.ABS.IsActive"],
+                }
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_subscribe_values_output_modes(
+        self, mocker, unused_tcp_port, val_servicer_v1, val_servicer_v2
+    ):
+        val_servicer_v2.ListMetadata.side_effect = list_metadata_side_effect(
+            types_v2.Metadata(path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT),
+            types_v2.Metadata(path="Vehicle.ADAS.ABS.IsActive", id=2, data_type=types_v2.DATA_TYPE_BOOLEAN),
+        )
+        response = val_v2.SubscribeResponse(entries={
+            "Vehicle.Speed": types_v2.Datapoint(
+                timestamp=timestamp_pb2.Timestamp(seconds=1667837915, nanos=247307674),
+                value=types_v2.Value(float=42.0),
+            ),
+        })
+        val_servicer_v2.Subscribe.side_effect = lambda request, _context: iter((response,))
+        async with VSSClient(
+            "127.0.0.1", unused_tcp_port, ensure_startup_connection=False
+        ) as client:
+            async for updates in client.subscribe_current_values(["Vehicle.Speed"], output_mode=OutputMode.TUPLES):
+                assert updates == [("Vehicle.Speed", 42.0, 1667837915247307674)]
+            async for updates in client.subscribe_current_values(["Vehicle.Speed"], output_mode=OutputMode.RAW):
+                assert updates == response
+
+            async def actuation_requests(requests, **kwargs):
+                yield val_v2.OpenProviderStreamResponse(
+                    batch_actuate_stream_request=val_v2.BatchActuateStreamRequest(actuate_requests=[
+                        val_v2.ActuateRequest(signal_id=types_v2.SignalID(id=2), value=types_v2.Value(bool=True)),
+                    ]),
+                )
+            mocker.patch.object(client.client_stub_v2, 'OpenProviderStream', side_effect=actuation_requests)
+            async for updates in client.subscribe_target_values(
+                ["Vehicle.ADAS.ABS.IsActive"], output_mode=OutputMode.TUPLES,
+            ):
+                assert updates == [("Vehicle.ADAS.ABS.IsActive", True, None)]
+
+            # v1 fallback
+            val_servicer_v2.Subscribe.side_effect = generate_error(grpc.StatusCode.UNIMPLEMENTED, 'Unimplemented')
+            val_servicer_v1.Subscribe.return_value = (response for response in (
+                val_v1.SubscribeResponse(updates=[val_v1.EntryUpdate(entry=types_v1.DataEntry(
+                    path='Vehicle.Speed', value=types_v1.Datapoint(float=43.0),
+                ), fields=[types_v1.FIELD_VALUE])]),
+            ))
+            async for updates in client.subscribe_current_values(["Vehicle.Speed"], output_mode=OutputMode.TUPLES):
+                assert updates == [("Vehicle.Speed", 43.0, None)]
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_columnar_values(self, unused_tcp_port, val_servicer_v2):
+        numpy = pytest.importorskip("numpy")
+        val_servicer_v2.ListMetadata.side_effect = list_metadata_side_effect(
+            types_v2.Metadata(path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT),
+            types_v2.Metadata(path="Vehicle.ADAS.ABS.IsActive", id=2, data_type=types_v2.DATA_TYPE_BOOLEAN),
+        )
+        val_servicer_v2.GetValues.return_value = val_v2.GetValuesResponse(data_points=[
+            types_v2.Datapoint(value=types_v2.Value(float=42.0)),
+            types_v2.Datapoint(value=types_v2.Value(bool=True)),
+        ])
+        val_servicer_v2.Subscribe.side_effect = lambda request, _context: iter([
+            val_v2.SubscribeResponse(entries={"Vehicle.Speed": types_v2.Datapoint(value=types_v2.Value(float=speed))})
+            for speed in (1.0, 2.0, 3.0, 4.0, 5.0)
+        ])
+        async with VSSClient('127.0.0.1', unused_tcp_port, ensure_startup_connection=False) as client:
+            batch = await client.get_current_values_columnar(['Vehicle.Speed', 'Vehicle.ADAS.ABS.IsActive'])
+            assert batch.data_types == {
+                'Vehicle.Speed': DataType.FLOAT, 'Vehicle.ADAS.ABS.IsActive': DataType.BOOLEAN,
+            }
+            assert batch.column('Vehicle.Speed').tolist() == [42.0]
+            assert batch.column('Vehicle.ADAS.ABS.IsActive').tolist() == [True]
+
+            windows = [
+                batch.column('Vehicle.Speed').copy()
+                async for batch in client.subscribe_current_values_columnar(
+                    ['Vehicle.Speed', 'Vehicle.ADAS.ABS.IsActive'], window_size=2, reuse_batch=True,
+                )
+            ]
+            assert [window.tolist() for window in windows] == [[1.0, 2.0], [3.0, 4.0], [5.0]]
+            assert windows[0].dtype == numpy.float32
+
     @pytest.mark.usefixtures("mocked_databroker")
     async def test_subscribe_some_entries_v2_target(
         self, mocker, unused_tcp_port, val_servicer_v2
@@ -1991,6 +2910,246 @@ class TestVSSClient:
                 await client.get_server_info()
 
 
+@pytest.mark.asyncio
+class TestSyncVSSClient:
+    """
+    The sync client blocks, so it is run on a worker thread while the mocked databroker serves on the event loop.
+    """
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_get_and_publish_many(self, unused_tcp_port, val_servicer_v2):
+        metadata = [
+            types_v2.Metadata(path=f"Vehicle.Signal{i}", id=i, data_type=types_v2.DATA_TYPE_FLOAT) for i in range(4)
+        ]
+        val_servicer_v2.ListMetadata.side_effect = list_metadata_side_effect(*metadata)
+        val_servicer_v2.GetValues.side_effect = lambda request, _context: val_v2.GetValuesResponse(data_points=[
+            types_v2.Datapoint(value=types_v2.Value(float=float(signal_id.id))) for signal_id in request.signal_ids
+        ])
+        val_servicer_v2.PublishValue.return_value = val_v2.PublishValueResponse()
+
+        def run():
+            with kuksa_client.grpc.VSSClient(
+                '127.0.0.1', unused_tcp_port, ensure_startup_connection=False, max_concurrent_metadata_requests=2,
+            ) as client:
+                values = client.get_many(
+                    [['Vehicle.Signal0', 'Vehicle.Signal1'], ['Vehicle.Signal2'], ['Vehicle.Signal3']], max_in_flight=2,
+                )
+                client.publish_many(
+                    [(f'Vehicle.Signal{i}', Datapoint(float(i))) for i in range(4)], max_in_flight=2,
+                )
+                assert client.get_many([]) == []
+                return values
+
+        values = await asyncio.get_running_loop().run_in_executor(None, run)
+
+        assert values == [
+            {'Vehicle.Signal0': Datapoint(0.0), 'Vehicle.Signal1': Datapoint(1.0)},
+            {'Vehicle.Signal2': Datapoint(2.0)},
+            {'Vehicle.Signal3': Datapoint(3.0)},
+        ]
+        assert val_servicer_v2.GetValues.call_count == 3
+        assert sorted(
+            (call[0][0].signal_id.path, call[0][0].data_point.value.float)
+            for call in val_servicer_v2.PublishValue.call_args_list
+        ) == [(f'Vehicle.Signal{i}', float(i)) for i in range(4)]
+
+    async def test_subscribe_current_values_rate_limit_burst(self, mocker, unused_tcp_port):
+        client = kuksa_client.grpc.VSSClient('127.0.0.1', unused_tcp_port)
+        client.connected = True  # To bypass connection check
+        done = threading.Event()
+
+        def subscribe_current_values(*args, **kwargs):
+            # The responses are read ahead on a thread, so the burst is timed by the real clock. It ends well
+            # within the interval and no further update arrives.
+            for speed in (1.0, 2.0, 3.0):
+                yield {'Vehicle.Speed': Datapoint(speed)}
+            done.wait(5)
+        mocker.patch.object(client, '_v2_subscribe_current_values', side_effect=subscribe_current_values)
+
+        def run():
+            received_updates = []
+            subscription = client.subscribe_current_values(['Vehicle.Speed'], max_rate_hz=2.0)
+            for updates in subscription:
+                received_updates.append(updates)
+                if len(received_updates) == 2:
+                    break
+            subscription.close()
+            return received_updates
+
+        try:
+            received_updates = await asyncio.get_running_loop().run_in_executor(None, run)
+        finally:
+            done.set()
+
+        assert received_updates == [{'Vehicle.Speed': Datapoint(1.0)}, {'Vehicle.Speed': Datapoint(3.0)}]
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_subscribe_current_values_rate_limit_close(self, mocker, unused_tcp_port, val_servicer_v2):
+        done = threading.Event()
+
+        def subscribe(request, _context):
+            yield val_v2.SubscribeResponse(entries={
+                'Vehicle.Speed': types_v2.Datapoint(value=types_v2.Value(float=42.0)),
+            })
+            done.wait(5)
+        val_servicer_v2.Subscribe.side_effect = subscribe
+        track_call = mocker.spy(kuksa_client.grpc, '_track_call')
+
+        def run():
+            with kuksa_client.grpc.VSSClient('127.0.0.1', unused_tcp_port, ensure_startup_connection=False) as client:
+                subscription = client.subscribe_current_values(['Vehicle.Speed'], max_rate_hz=2.0)
+                updates = next(subscription)
+                subscription.close()
+                readers = [thread for thread in threading.enumerate() if thread.name == 'rate-limited-updates']
+                return updates, readers
+
+        try:
+            updates, readers = await asyncio.get_running_loop().run_in_executor(None, run)
+        finally:
+            done.set()
+
+        assert updates == {'Vehicle.Speed': Datapoint(42.0)}
+        # Closing the subscription cancels the call, which ends the thread reading it
+        assert track_call.call_count == 1
+        assert track_call.call_args[0][0].cancelled()
+        assert readers == []
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_ensure_id_mapping_max_concurrent_requests(self, unused_tcp_port, val_servicer_v2):
+        val_servicer_v2.ListMetadata.side_effect = list_metadata_side_effect(
+            types_v2.Metadata(path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT),
+            types_v2.Metadata(path="Vehicle.Cabin.Light.IsDomeOn", id=2, data_type=types_v2.DATA_TYPE_BOOLEAN),
+        )
+
+        def run():
+            # A limit below 1 still lets one request at a time through
+            with kuksa_client.grpc.VSSClient(
+                '127.0.0.1', unused_tcp_port, ensure_startup_connection=False, max_concurrent_metadata_requests=0,
+            ) as client:
+                client.ensure_id_mapping(["Vehicle.Speed", "Vehicle.Cabin.Light.IsDomeOn"])
+                return dict(client.path_to_id_mapping)
+
+        path_to_id_mapping = await asyncio.get_running_loop().run_in_executor(None, run)
+
+        assert val_servicer_v2.ListMetadata.call_count == 2
+        assert path_to_id_mapping == {"Vehicle.Speed": 1, "Vehicle.Cabin.Light.IsDomeOn": 2}
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_expand_v2_branch_paths(self, unused_tcp_port, val_servicer_v2):
+        val_servicer_v2.ListMetadata.side_effect = list_metadata_side_effect(
+            types_v2.Metadata(path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT),
+            types_v2.Metadata(path="Vehicle.Cabin.Door.Row1.DriverSide.IsOpen", id=2,
+                              data_type=types_v2.DATA_TYPE_BOOLEAN),
+            types_v2.Metadata(path="Vehicle.Cabin.Light.IsDomeOn", id=3, data_type=types_v2.DATA_TYPE_BOOLEAN),
+        )
+
+        def run():
+            with kuksa_client.grpc.VSSClient(
+                '127.0.0.1', unused_tcp_port, ensure_startup_connection=False, max_concurrent_metadata_requests=2,
+            ) as client:
+                expanded = client._expand_v2_branch_paths(['Vehicle.Cabin.*', 'Vehicle.Speed', 'Vehicle.Cabin.Light'])
+                assert val_servicer_v2.ListMetadata.call_count == 3
+                assert client.path_to_id_mapping['Vehicle.Cabin.Light.IsDomeOn'] == 3
+
+                # Expansions are memoized for the current connection
+                assert client._expand_v2_branch_paths(['Vehicle.Cabin']) == [
+                    'Vehicle.Cabin.Door.Row1.DriverSide.IsOpen', 'Vehicle.Cabin.Light.IsDomeOn',
+                ]
+                assert val_servicer_v2.ListMetadata.call_count == 3
+
+                with pytest.raises(VSSClientError) as exc_info:
+                    client._expand_v2_branch_paths(['Vehicle.Trailer'])
+                assert exc_info.value.error["code"] == grpc.StatusCode.NOT_FOUND.value[0]
+            assert client.branch_expansions == {}
+            return expanded
+
+        expanded = await asyncio.get_running_loop().run_in_executor(None, run)
+
+        assert expanded == [
+            'Vehicle.Cabin.Door.Row1.DriverSide.IsOpen',
+            'Vehicle.Cabin.Light.IsDomeOn',
+            'Vehicle.Speed',
+        ]
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_set_some_updates_v2(self, unused_tcp_port, val_servicer_v1, val_servicer_v2):
+        val_servicer_v2.ListMetadata.side_effect = list_metadata_side_effect(
+            types_v2.Metadata(path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT),
+            types_v2.Metadata(path="Vehicle.ADAS.ABS.IsActive", id=2, data_type=types_v2.DATA_TYPE_BOOLEAN),
+        )
+        denied_paths = set()
+
+        def publish_value(request, context):
+            if request.signal_id.path in denied_paths:
+                context.set_code(grpc.StatusCode.PERMISSION_DENIED)
+                context.set_details("Not allowed")
+            return val_v2.PublishValueResponse()
+        val_servicer_v2.PublishValue.side_effect = publish_value
+
+        def run():
+            with kuksa_client.grpc.VSSClient('127.0.0.1', unused_tcp_port, ensure_startup_connection=False) as client:
+                updates = {"Vehicle.Speed": Datapoint(42.0), "Vehicle.ADAS.ABS.IsActive": Datapoint(False)}
+                client.set_current_values(updates)
+                client.set_current_values(updates)
+                denied_paths.add("Vehicle.ADAS.ABS.IsActive")
+                with pytest.raises(VSSClientError) as exc_info:
+                    client.set_current_values(updates)
+                return exc_info.value
+
+        error = await asyncio.get_running_loop().run_in_executor(None, run)
+
+        # Ids and data types are resolved once with ListMetadata, v1 is not needed
+        assert val_servicer_v2.ListMetadata.call_count == 2
+        assert val_servicer_v1.Get.call_count == 0
+        # The calls are pipelined, hence the order in which they arrive may vary
+        assert sorted(
+            (call[0][0] for call in val_servicer_v2.PublishValue.call_args_list),
+            key=lambda req: req.signal_id.path,
+        ) == 3 * [
+            val_v2.PublishValueRequest(
+                signal_id=types_v2.SignalID(path="Vehicle.ADAS.ABS.IsActive"),
+                data_point=types_v2.Datapoint(value=types_v2.Value(bool=False)),
+            ),
+        ] + 3 * [
+            val_v2.PublishValueRequest(
+                signal_id=types_v2.SignalID(path="Vehicle.Speed"),
+                data_point=types_v2.Datapoint(value=types_v2.Value(float=42.0)),
+            ),
+        ]
+        assert error.error["code"] == grpc.StatusCode.PERMISSION_DENIED.value[0]
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_set_v1_fallback(self, unused_tcp_port, val_servicer_v1, val_servicer_v2):
+        val_servicer_v2.PublishValue.side_effect = generate_error(grpc.StatusCode.UNIMPLEMENTED, "Not implemented")
+        invocation_metadata = []
+
+        def set_values(request, context):
+            invocation_metadata.append(dict(context.invocation_metadata()))
+            return val_v1.SetResponse()
+        val_servicer_v1.Set.side_effect = set_values
+
+        def run():
+            with kuksa_client.grpc.VSSClient('127.0.0.1', unused_tcp_port, ensure_startup_connection=False) as client:
+                client.set(
+                    updates=[
+                        EntryUpdate(
+                            DataEntry(
+                                "Vehicle.Speed", value=Datapoint(42.0), metadata=Metadata(data_type=DataType.FLOAT),
+                            ),
+                            (Field.VALUE,),
+                        ),
+                    ],
+                    try_v2=True,
+                    metadata=[('x-request-tag', 'fallback')],
+                )
+
+        await asyncio.get_running_loop().run_in_executor(None, run)
+
+        # v1 is used once, with the metadata of the caller
+        assert val_servicer_v1.Set.call_count == 1
+        assert invocation_metadata[0]['x-request-tag'] == 'fallback'
+
+
 @pytest.mark.asyncio
 class TestSubscriberManager:
 
@@ -2230,3 +3389,611 @@ class TestSubscriberManager:
             assert (
                 exc_info.value.args[0] == f"Could not find subscription {str(sub_uid)}"
             )
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_add_shared_subscriber(self, mocker, unused_tcp_port, val_servicer_v2):
+        release, done = threading.Event(), threading.Event()
+
+        def subscribe(request, _context):
+            paths = list(request.signal_paths)
+            yield val_v2.SubscribeResponse(entries={path: types_v2.Datapoint() for path in paths})
+            release.wait(5)
+            yield val_v2.SubscribeResponse(entries={
+                path: types_v2.Datapoint(value=types_v2.Value(float=43.0)) for path in paths
+            })
+            done.wait(5)
+
+        val_servicer_v2.Subscribe.side_effect = subscribe
+        callback_a, callback_b = mocker.Mock(), mocker.Mock()
+        async with VSSClient('127.0.0.1', unused_tcp_port, ensure_startup_connection=False) as client:
+            subscriber_manager = SubscriberManager(client)
+            try:
+                sub_a = await subscriber_manager.add_shared_subscriber(['Vehicle.Speed'], callback_a)
+                sub_b = await subscriber_manager.add_shared_subscriber(
+                    ['Vehicle.Speed', 'Vehicle.Width'], callback_b,
+                )
+                assert isinstance(sub_a, uuid.UUID) and isinstance(sub_b, uuid.UUID)
+                # The second subscriber only opens a stream for the path not subscribed yet
+                assert [call.args[0].signal_paths for call in val_servicer_v2.Subscribe.call_args_list] == [
+                    ['Vehicle.Speed'], ['Vehicle.Width'],
+                ]
+
+                release.set()
+                while callback_a.call_count < 1 or callback_b.call_count < 2:
+                    await asyncio.sleep(0.01)
+                speed = EntryUpdate(DataEntry('Vehicle.Speed', value=Datapoint(43.0)), [Field.VALUE])
+                width = EntryUpdate(DataEntry('Vehicle.Width', value=Datapoint(43.0)), [Field.VALUE])
+                assert callback_a.call_args_list == [mocker.call([speed])]
+                assert sorted(callback_b.call_args_list, key=lambda call: call.args[0][0].entry.path) == [
+                    mocker.call([speed]), mocker.call([width]),
+                ]
+            finally:
+                done.set()
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_remove_shared_subscriber(self, mocker, unused_tcp_port, val_servicer_v2):
+        done = threading.Event()
+
+        def subscribe(request, _context):
+            yield val_v2.SubscribeResponse(entries={path: types_v2.Datapoint() for path in request.signal_paths})
+            done.wait(5)
+
+        val_servicer_v2.Subscribe.side_effect = subscribe
+        async with VSSClient('127.0.0.1', unused_tcp_port, ensure_startup_connection=False) as client:
+            subscriber_manager = SubscriberManager(client)
+            try:
+                sub_a = await subscriber_manager.add_shared_subscriber(
+                    ['Vehicle.Speed', 'Vehicle.Width'], mocker.Mock(),
+                )
+                sub_b = await subscriber_manager.add_shared_subscriber(['Vehicle.Speed'], mocker.Mock())
+                assert val_servicer_v2.Subscribe.call_count == 1
+                (stream,) = subscriber_manager.shared_subscribers[sub_a]
+
+                # Vehicle.Width is no longer needed, Vehicle.Speed is resubscribed on its own
+                await subscriber_manager.remove_subscriber(sub_a)
+                assert val_servicer_v2.Subscribe.call_count == 2
+                assert val_servicer_v2.Subscribe.call_args[0][0].signal_paths == ['Vehicle.Speed']
+                assert stream.task.done()
+                (stream,) = subscriber_manager.shared_subscribers[sub_b]
+                assert stream.paths == {'Vehicle.Speed'}
+
+                await subscriber_manager.remove_subscriber(sub_b)
+                assert stream.task.done()
+                assert not subscriber_manager.shared_subscribers
+
+                with pytest.raises(ValueError) as exc_info:
+                    await subscriber_manager.remove_subscriber(sub_b)
+                assert exc_info.value.args[0] == f"Could not find subscription {str(sub_b)}"
+            finally:
+                done.set()
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_shared_subscriber_reconnect(self, mocker, unused_tcp_port, val_servicer_v2):
+        done = threading.Event()
+
+        def subscribe(request, context):
+            yield val_v2.SubscribeResponse(entries={
+                path: types_v2.Datapoint(value=types_v2.Value(float=float(val_servicer_v2.Subscribe.call_count)))
+                for path in request.signal_paths
+            })
+            if val_servicer_v2.Subscribe.call_count == 1:
+                context.set_code(grpc.StatusCode.UNAVAILABLE)
+                context.set_details("Databroker restarting")
+                return
+            done.wait(5)
+
+        val_servicer_v2.Subscribe.side_effect = subscribe
+        callback = mocker.Mock()
+        async with VSSClient('127.0.0.1', unused_tcp_port, ensure_startup_connection=False) as client:
+            subscriber_manager = SubscriberManager(client, reconnect=ReconnectPolicy(initial_delay=0.0))
+            try:
+                sub_uid = await subscriber_manager.add_shared_subscriber(['Vehicle.Speed'], callback)
+                while callback.call_count < 1:
+                    await asyncio.sleep(0.01)
+
+                assert val_servicer_v2.Subscribe.call_count == 2
+                # The catch-up update holds the current values of the new stream
+                catch_up = callback.call_args.args[0]
+                assert [update.entry.value.value for update in catch_up] == [2.0]
+                assert subscriber_manager.stats(sub_uid).resyncs == 1
+                await subscriber_manager.remove_subscriber(sub_uid)
+            finally:
+                done.set()
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_add_shared_subscriber_branch(self, mocker, unused_tcp_port, val_servicer_v2):
+        done = threading.Event()
+
+        def subscribe(request, context):
+            if 'Vehicle.Body' in request.signal_paths:
+                context.set_code(grpc.StatusCode.NOT_FOUND)
+                context.set_details("Vehicle.Body is not a signal")
+                return
+            yield val_v2.SubscribeResponse(entries={path: types_v2.Datapoint() for path in request.signal_paths})
+            yield val_v2.SubscribeResponse(entries={
+                path: types_v2.Datapoint(value=types_v2.Value(bool=True)) for path in request.signal_paths
+            })
+            done.wait(5)
+
+        val_servicer_v2.Subscribe.side_effect = subscribe
+        val_servicer_v2.ListMetadata.side_effect = list_metadata_side_effect(
+            types_v2.Metadata(path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT),
+            types_v2.Metadata(path="Vehicle.Body.Trunk.Rear.IsOpen", id=2, data_type=types_v2.DATA_TYPE_BOOLEAN),
+            types_v2.Metadata(path="Vehicle.Body.Hood.IsOpen", id=3, data_type=types_v2.DATA_TYPE_BOOLEAN),
+        )
+        callback = mocker.Mock()
+        async with VSSClient('127.0.0.1', unused_tcp_port, ensure_startup_connection=False) as client:
+            subscriber_manager = SubscriberManager(client)
+            try:
+                await subscriber_manager.add_shared_subscriber(['Vehicle.Body'], callback)
+                while callback.call_count < 1:
+                    await asyncio.sleep(0.01)
+
+                # The branch is subscribed as its leaves, whose updates are delivered for the branch path
+                assert [call.args[0].signal_paths for call in val_servicer_v2.Subscribe.call_args_list] == [
+                    ['Vehicle.Body'], ['Vehicle.Body.Trunk.Rear.IsOpen', 'Vehicle.Body.Hood.IsOpen'],
+                ]
+                assert sorted(callback.call_args.args[0], key=lambda update: update.entry.path) == [
+                    EntryUpdate(DataEntry('Vehicle.Body.Hood.IsOpen', value=Datapoint(True)), [Field.VALUE]),
+                    EntryUpdate(DataEntry('Vehicle.Body.Trunk.Rear.IsOpen', value=Datapoint(True)), [Field.VALUE]),
+                ]
+            finally:
+                done.set()
+
+    @pytest.mark.parametrize("queue_policy, expected_speeds, expected_dropped", [
+        (QueuePolicy.BLOCK, [0.0, 1.0, 2.0, 3.0, 4.0], 0),
+        (QueuePolicy.DROP_OLDEST, [3.0, 4.0], 6),
+        (QueuePolicy.CONFLATE, [4.0], 8),
+    ])
+    async def test_subscriber_queue_policies(self, mocker, queue_policy, expected_speeds, expected_dropped):
+        async def subscribe_response_stream():
+            yield []
+            for value in range(5):
+                yield [
+                    EntryUpdate(DataEntry(path, value=Datapoint(float(value))), [Field.VALUE])
+                    for path in ('Vehicle.Speed', 'Vehicle.Width')
+                ]
+
+        callback = mocker.Mock()
+        subscriber_manager = SubscriberManager(mocker.Mock(), queue_size=2)
+        sub_uid = await subscriber_manager.add_subscriber(
+            subscribe_response_stream(), callback, queue_policy=queue_policy,
+        )
+        while callback.call_count < len(expected_speeds):
+            await asyncio.sleep(0.01)
+
+        speeds = [
+            update.entry.value.value
+            for call in callback.call_args_list for update in call.args[0] if update.entry.path == 'Vehicle.Speed'
+        ]
+        assert speeds == expected_speeds
+        stats = subscriber_manager.stats(sub_uid)
+        assert stats.dropped == expected_dropped
+        assert stats.dispatched == len(expected_speeds)
+        assert stats.queue_depth == 0
+        assert 1 <= stats.max_queue_depth <= 2
+        assert stats.dispatch_lag >= 0.0
+
+        await subscriber_manager.remove_subscriber(sub_uid)
+        with pytest.raises(ValueError):
+            subscriber_manager.stats(sub_uid)
+
+    async def test_subscriber_deadband(self, mocker):
+        async def subscribe_response_stream():
+            yield []
+            for value in (1.0, 1.5, 3.0, 3.2):
+                yield [EntryUpdate(DataEntry('Vehicle.Speed', value=Datapoint(value)), [Field.VALUE])]
+
+        callback = mocker.Mock()
+        subscriber_manager = SubscriberManager(mocker.Mock())
+        sub_uid = await subscriber_manager.add_subscriber(subscribe_response_stream(), callback, deadband=1.0)
+        while callback.call_count < 2:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.01)
+
+        assert [call.args[0][0].entry.value.value for call in callback.call_args_list] == [1.0, 3.0]
+        assert subscriber_manager.stats(sub_uid).filtered == 2
+        await subscriber_manager.remove_subscriber(sub_uid)
+
+    async def test_subscriber_rate_limit_burst(self, mocker):
+        clock = [0.0]
+
+        async def subscribe_response_stream():
+            yield []
+            for now, value in ((0.0, 1.0), (0.01, 2.0), (0.02, 3.0)):
+                clock[0] = now
+                yield [EntryUpdate(DataEntry('Vehicle.Speed', value=Datapoint(value)), [Field.VALUE])]
+            # The burst ends within the interval and no further update arrives
+            clock[0] = 0.2
+            await asyncio.Event().wait()
+
+        mocker.patch('kuksa_client.grpc.time').monotonic.side_effect = lambda: clock[0]
+        callback = mocker.Mock()
+        subscriber_manager = SubscriberManager(mocker.Mock())
+        sub_uid = await subscriber_manager.add_subscriber(subscribe_response_stream(), callback, max_rate_hz=10.0)
+        while callback.call_count < 2:
+            await asyncio.sleep(0.01)
+
+        assert [call.args[0][0].entry.value.value for call in callback.call_args_list] == [1.0, 3.0]
+        assert subscriber_manager.stats(sub_uid).filtered == 2
+        await subscriber_manager.remove_subscriber(sub_uid)
+
+    @pytest.mark.parametrize("use_coroutine", [False, True])
+    async def test_callback_dispatcher(self, mocker, use_coroutine):
+        paths = [f'Vehicle.Cabin.Seat.Row{row}.Heating' for row in range(4)]
+
+        async def subscribe_response_stream():
+            yield []
+            for value in range(20):
+                yield [EntryUpdate(DataEntry(path, value=Datapoint(value)), [Field.VALUE]) for path in paths]
+
+        received = []
+        threads = set()
+
+        def callback(updates):
+            threads.add(threading.current_thread())
+            received.extend((update.entry.path, update.entry.value.value) for update in updates)
+
+        async def coroutine_callback(updates):
+            await asyncio.sleep(0)
+            callback(updates)
+
+        dispatcher = CallbackDispatcher(workers=2)
+        subscriber_manager = SubscriberManager(mocker.Mock(), dispatcher=dispatcher)
+        sub_uid = await subscriber_manager.add_subscriber(
+            subscribe_response_stream(), coroutine_callback if use_coroutine else callback,
+        )
+        while len(received) < 20 * len(paths):
+            await asyncio.sleep(0.01)
+
+        for path in paths:
+            assert [value for update_path, value in received if update_path == path] == list(range(20))
+        if use_coroutine:
+            assert threads == {threading.current_thread()}
+        else:
+            assert threading.current_thread() not in threads
+        worker_stats = dispatcher.stats()
+        assert len(worker_stats) == 2
+        assert sum(stats.calls for stats in worker_stats) >= 20
+        assert all(stats.pending == 0 and 0.0 <= stats.utilization <= 1.0 for stats in worker_stats)
+
+        await subscriber_manager.remove_subscriber(sub_uid)
+        await dispatcher.close()
+
+
+@pytest.mark.asyncio
+class TestProviderSession:
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_publish(self, mocker, unused_tcp_port, val_servicer_v1, val_servicer_v2):
+        val_servicer_v2.ListMetadata.side_effect = list_metadata_side_effect(
+            types_v2.Metadata(
+                path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT
+            ),
+            types_v2.Metadata(
+                path="Vehicle.Body.Trunk.Rear.IsOpen", id=2, data_type=types_v2.DATA_TYPE_BOOLEAN
+            ),
+        )
+        async with VSSClient(
+            "127.0.0.1", unused_tcp_port, ensure_startup_connection=False
+        ) as client:
+            call = ProviderStreamCall()
+            mocker.patch.object(client.client_stub_v2, 'OpenProviderStream', return_value=call)
+            async with ProviderSession(
+                client,
+                ["Vehicle.Speed"],
+                actuator_paths=["Vehicle.Body.Trunk.Rear.IsOpen"],
+            ) as session:
+                speed_id = session.signal_id("Vehicle.Speed")
+                is_open_id = session.signal_id("Vehicle.Body.Trunk.Rear.IsOpen")
+                assert await session.publish({speed_id: Datapoint(42.0)}) == 1
+                assert await session.publish({
+                    speed_id: Datapoint(43.0), is_open_id: Datapoint(True),
+                }) == 2
+
+            # Ids and data types are resolved once, there is no v1 round trip
+            assert val_servicer_v2.ListMetadata.call_count == 2
+            assert val_servicer_v1.Get.call_count == 0
+            assert client.client_stub_v2.OpenProviderStream.call_count == 1
+            assert call.requests == [
+                val_v2.OpenProviderStreamRequest(
+                    provide_signal_request=val_v2.ProvideSignalRequest(
+                        signals_sample_intervals={1: types_v2.SampleInterval(), 2: types_v2.SampleInterval()},
+                    ),
+                ),
+                val_v2.OpenProviderStreamRequest(
+                    provide_actuation_request=val_v2.ProvideActuationRequest(
+                        actuator_identifiers=[
+                            types_v2.SignalID(path="Vehicle.Body.Trunk.Rear.IsOpen"),
+                        ],
+                    ),
+                ),
+                val_v2.OpenProviderStreamRequest(
+                    publish_values_request=val_v2.PublishValuesRequest(
+                        request_id=1,
+                        data_points={1: types_v2.Datapoint(value=types_v2.Value(float=42.0))},
+                    ),
+                ),
+                val_v2.OpenProviderStreamRequest(
+                    publish_values_request=val_v2.PublishValuesRequest(
+                        request_id=2,
+                        data_points={
+                            1: types_v2.Datapoint(value=types_v2.Value(float=43.0)),
+                            2: types_v2.Datapoint(value=types_v2.Value(bool=True)),
+                        },
+                    ),
+                ),
+            ]
+            assert not call.cancelled
+
+            with pytest.raises(ValueError):
+                session.signal_id("Vehicle.Does.Not.Exist")
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_errors_and_actuation_requests(self, mocker, unused_tcp_port, val_servicer_v2):
+        val_servicer_v2.ListMetadata.side_effect = list_metadata_side_effect(
+            types_v2.Metadata(
+                path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT
+            ),
+            types_v2.Metadata(
+                path="Vehicle.Body.Trunk.Rear.IsOpen", id=2, data_type=types_v2.DATA_TYPE_BOOLEAN
+            ),
+        )
+        async with VSSClient(
+            "127.0.0.1", unused_tcp_port, ensure_startup_connection=False
+        ) as client:
+            call = ProviderStreamCall()
+            mocker.patch.object(client.client_stub_v2, 'OpenProviderStream', return_value=call)
+            error_callback = mocker.Mock()
+            actuation_callback = mocker.Mock()
+            session = ProviderSession(
+                client,
+                ["Vehicle.Speed"],
+                actuator_paths=["Vehicle.Body.Trunk.Rear.IsOpen"],
+                error_callback=error_callback,
+                actuation_callback=actuation_callback,
+            )
+            await session.open()
+            await session.publish({1: Datapoint(42.0)})
+            await call.responses.put(val_v2.OpenProviderStreamResponse(
+                publish_values_response=val_v2.PublishValuesResponse(
+                    request_id=1,
+                    status={1: types_v2.Error(code=types_v2.ERROR_CODE_INVALID_ARGUMENT, message="Out of bounds")},
+                ),
+            ))
+            await call.responses.put(val_v2.OpenProviderStreamResponse(
+                batch_actuate_stream_request=val_v2.BatchActuateStreamRequest(
+                    actuate_requests=[
+                        val_v2.ActuateRequest(
+                            signal_id=types_v2.SignalID(id=2), value=types_v2.Value(bool=True),
+                        ),
+                    ],
+                ),
+            ))
+            while actuation_callback.call_count < 1:
+                await asyncio.sleep(0.01)
+
+            request_id, error = error_callback.call_args[0]
+            assert request_id == 1
+            assert error.errors == [{
+                "path": "Vehicle.Speed",
+                "error": {"code": "ERROR_CODE_INVALID_ARGUMENT", "message": "Out of bounds"},
+            }]
+            assert actuation_callback.call_args[0][0] == [
+                EntryUpdate(
+                    DataEntry("Vehicle.Body.Trunk.Rear.IsOpen", actuator_target=Datapoint(True)),
+                    [Field.ACTUATOR_TARGET],
+                ),
+            ]
+
+            # The stream is still usable after a failing request
+            assert await session.publish({1: Datapoint(43.0)}) == 2
+            await session.close()
+            assert len(call.requests) == 4
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_session_during_resubscribe(self, mocker, unused_tcp_port, val_servicer_v2):
+        val_servicer_v2.ListMetadata.side_effect = list_metadata_side_effect(
+            types_v2.Metadata(path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT),
+            types_v2.Metadata(path="Vehicle.Body.Trunk.Rear.IsOpen", id=2, data_type=types_v2.DATA_TYPE_BOOLEAN),
+            types_v2.Metadata(path="Vehicle.Width", id=3, data_type=types_v2.DATA_TYPE_FLOAT),
+        )
+
+        def subscribe_by_id(request, context):
+            value = types_v2.Value(float=float(val_servicer_v2.SubscribeById.call_count))
+            yield val_v2.SubscribeByIdResponse(entries={
+                signal_id: types_v2.Datapoint(value=value) for signal_id in request.signal_ids
+            })
+            if val_servicer_v2.SubscribeById.call_count == 1:
+                context.set_code(grpc.StatusCode.UNAVAILABLE)
+                context.set_details("Databroker restarting")
+
+        val_servicer_v2.SubscribeById.side_effect = subscribe_by_id
+        async with VSSClient(
+            "127.0.0.1", unused_tcp_port, ensure_startup_connection=False
+        ) as client:
+            call = ProviderStreamCall()
+            mocker.patch.object(client.client_stub_v2, 'OpenProviderStream', return_value=call)
+            actuation_callback = mocker.Mock()
+            async with ProviderSession(
+                client,
+                ["Vehicle.Speed"],
+                actuator_paths=["Vehicle.Body.Trunk.Rear.IsOpen"],
+                actuation_callback=actuation_callback,
+            ) as session:
+                received_updates = []
+                async for updates in client.subscribe_current_values(
+                    ['Vehicle.Width'], by_id=True, reconnect=ReconnectPolicy(initial_delay=0.0),
+                ):
+                    received_updates.append(updates)
+                    if len(received_updates) == 3:
+                        break
+                first, gap, catch_up = received_updates
+                assert first == {'Vehicle.Width': Datapoint(1.0)}
+                assert isinstance(gap, SubscriptionGap)
+                assert catch_up == {'Vehicle.Width': Datapoint(2.0)}
+
+                # Only the ids of the resubscribed path were resolved again, the session still uses the others
+                assert [call.args[0].root for call in val_servicer_v2.ListMetadata.call_args_list[-2:]] == [
+                    "Vehicle.Width", "Vehicle.Width",
+                ]
+                assert session.signal_id("Vehicle.Speed") == 1
+                assert await session.publish({session.signal_id("Vehicle.Speed"): Datapoint(42.0)}) == 1
+                await call.responses.put(val_v2.OpenProviderStreamResponse(
+                    batch_actuate_stream_request=val_v2.BatchActuateStreamRequest(
+                        actuate_requests=[
+                            val_v2.ActuateRequest(
+                                signal_id=types_v2.SignalID(id=2), value=types_v2.Value(bool=True),
+                            ),
+                        ],
+                    ),
+                ))
+                while actuation_callback.call_count < 1:
+                    await asyncio.sleep(0.01)
+                assert actuation_callback.call_args[0][0] == [
+                    EntryUpdate(
+                        DataEntry("Vehicle.Body.Trunk.Rear.IsOpen", actuator_target=Datapoint(True)),
+                        [Field.ACTUATOR_TARGET],
+                    ),
+                ]
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_sync_session(self, mocker, unused_tcp_port, val_servicer_v1, val_servicer_v2):
+        val_servicer_v2.ListMetadata.side_effect = list_metadata_side_effect(
+            types_v2.Metadata(
+                path="Vehicle.Speed", id=1, data_type=types_v2.DATA_TYPE_FLOAT
+            ),
+            types_v2.Metadata(
+                path="Vehicle.Body.Trunk.Rear.IsOpen", id=2, data_type=types_v2.DATA_TYPE_BOOLEAN
+            ),
+        )
+        call = SyncProviderStreamCall()
+        error_callback = mocker.Mock()
+        actuations = queue.Queue()
+
+        # The sync client blocks, so it is run on a worker thread while the mocked databroker serves on the event loop
+        def run():
+            with kuksa_client.grpc.VSSClient(
+                "127.0.0.1", unused_tcp_port, ensure_startup_connection=False
+            ) as client:
+                mocker.patch.object(client.client_stub_v2, 'OpenProviderStream', side_effect=call.open)
+                with kuksa_client.grpc.ProviderSession(
+                    client,
+                    ["Vehicle.Speed"],
+                    actuator_paths=["Vehicle.Body.Trunk.Rear.IsOpen"],
+                    error_callback=error_callback,
+                    actuation_callback=actuations.put,
+                ) as session:
+                    speed_id = session.signal_id("Vehicle.Speed")
+                    is_open_id = session.signal_id("Vehicle.Body.Trunk.Rear.IsOpen")
+                    assert session.publish({speed_id: Datapoint(42.0)}) == 1
+                    call.responses.put(val_v2.OpenProviderStreamResponse(
+                        publish_values_response=val_v2.PublishValuesResponse(
+                            request_id=1,
+                            status={
+                                1: types_v2.Error(code=types_v2.ERROR_CODE_INVALID_ARGUMENT, message="Out of bounds"),
+                            },
+                        ),
+                    ))
+                    call.responses.put(val_v2.OpenProviderStreamResponse(
+                        batch_actuate_stream_request=val_v2.BatchActuateStreamRequest(
+                            actuate_requests=[
+                                val_v2.ActuateRequest(
+                                    signal_id=types_v2.SignalID(id=is_open_id), value=types_v2.Value(bool=True),
+                                ),
+                            ],
+                        ),
+                    ))
+                    actuation = actuations.get(timeout=1)
+                    # The stream is still usable after a failing request
+                    assert session.publish({
+                        speed_id: Datapoint(43.0), is_open_id: Datapoint(True),
+                    }) == 2
+                return actuation
+
+        actuation = await asyncio.get_running_loop().run_in_executor(None, run)
+
+        # Ids and data types are resolved once, there is no v1 round trip
+        assert val_servicer_v2.ListMetadata.call_count == 2
+        assert val_servicer_v1.Get.call_count == 0
+        assert call.requests == [
+            val_v2.OpenProviderStreamRequest(
+                provide_signal_request=val_v2.ProvideSignalRequest(
+                    signals_sample_intervals={1: types_v2.SampleInterval(), 2: types_v2.SampleInterval()},
+                ),
+            ),
+            val_v2.OpenProviderStreamRequest(
+                provide_actuation_request=val_v2.ProvideActuationRequest(
+                    actuator_identifiers=[
+                        types_v2.SignalID(path="Vehicle.Body.Trunk.Rear.IsOpen"),
+                    ],
+                ),
+            ),
+            val_v2.OpenProviderStreamRequest(
+                publish_values_request=val_v2.PublishValuesRequest(
+                    request_id=1,
+                    data_points={1: types_v2.Datapoint(value=types_v2.Value(float=42.0))},
+                ),
+            ),
+            val_v2.OpenProviderStreamRequest(
+                publish_values_request=val_v2.PublishValuesRequest(
+                    request_id=2,
+                    data_points={
+                        1: types_v2.Datapoint(value=types_v2.Value(float=43.0)),
+                        2: types_v2.Datapoint(value=types_v2.Value(bool=True)),
+                    },
+                ),
+            ),
+        ]
+        assert not call.cancelled
+        request_id, error = error_callback.call_args[0]
+        assert request_id == 1
+        assert error.errors == [{
+            "path": "Vehicle.Speed",
+            "error": {"code": "ERROR_CODE_INVALID_ARGUMENT", "message": "Out of bounds"},
+        }]
+        assert actuation == [
+            EntryUpdate(
+                DataEntry("Vehicle.Body.Trunk.Rear.IsOpen", actuator_target=Datapoint(True)),
+                [Field.ACTUATOR_TARGET],
+            ),
+        ]
+
+    @pytest.mark.usefixtures("mocked_databroker")
+    async def test_sync_session_failures(self, mocker, unused_tcp_port, val_servicer_v2):
+        val_servicer_v2.ListMetadata.side_effect = list_metadata_side_effect(
+            types_v2.Metadata(
+                path="Vehicle.Body.Trunk.Rear.IsOpen", id=2, data_type=types_v2.DATA_TYPE_BOOLEAN
+            ),
+        )
+        actuate = val_v2.OpenProviderStreamResponse(
+            batch_actuate_stream_request=val_v2.BatchActuateStreamRequest(
+                actuate_requests=[
+                    val_v2.ActuateRequest(signal_id=types_v2.SignalID(id=2), value=types_v2.Value(bool=True)),
+                ],
+            ),
+        )
+        call = SyncProviderStreamCall(actuate, actuate, ValueError("Broken response"))
+        actuation_callback = mocker.Mock(side_effect=RuntimeError("Callback failed"))
+
+        def run():
+            with kuksa_client.grpc.VSSClient(
+                "127.0.0.1", unused_tcp_port, ensure_startup_connection=False
+            ) as client:
+                mocker.patch.object(client.client_stub_v2, 'OpenProviderStream', side_effect=call.open)
+                with kuksa_client.grpc.ProviderSession(
+                    client, [], actuator_paths=["Vehicle.Body.Trunk.Rear.IsOpen"],
+                    actuation_callback=actuation_callback,
+                ) as session:
+                    session._reader.join(1)
+                    with pytest.raises(VSSClientError) as exc_info:
+                        session.publish({2: Datapoint(False)})
+                return exc_info.value
+
+        error = await asyncio.get_running_loop().run_in_executor(None, run)
+
+        # A failing callback does not stop the processing of the following responses
+        assert actuation_callback.call_count == 2
+        # A failing reader is reported to the publisher
+        assert error.error["code"] == grpc.StatusCode.INTERNAL.value[0]
+        assert "Broken response" in error.error["message"]